@@ -0,0 +1,50 @@
+"""
+Shared settings and audio for the performance benchmarks.
+
+The benchmarks use pytest-benchmark and are kept out of the unit test
+run; see ``make bench-save`` and ``make bench-check``.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from voicemidi.backend.core.bench import make_vocal_material
+
+# (sample rate, block size) combinations every detector is timed at
+AUDIO_CASES = (
+    (22050, 512),
+    (44100, 512),
+    (44100, 1024),
+    (44100, 2048),
+    (48000, 1024),
+)
+
+
+def case_id(case):
+    """Test id of an AUDIO_CASES entry, e.g. "44100-1024"."""
+    return "-".join(str(value) for value in case)
+
+
+@pytest.fixture(params=AUDIO_CASES, ids=case_id)
+def audio_case(request):
+    """A (sample rate, block size) pair."""
+    return request.param
+
+
+@pytest.fixture
+def sung_blocks(audio_case):
+    """
+    Endless stream of sung blocks of synthetic vocals at the case's settings.
+
+    Every round gets the next block, so stateful detectors see a
+    realistic signal rather than one block repeated. Blocks from the
+    rests are left out: silent blocks return early, and how many a run
+    happens to hit would make the timings noisy.
+    """
+    sample_rate, block_size = audio_case
+    material = make_vocal_material(sample_rate, 4.0)
+    n_blocks = len(material) // block_size
+    blocks = material[:n_blocks * block_size].reshape(n_blocks, block_size)
+    sung = blocks[np.sqrt(np.mean(np.square(blocks), axis=1)) > 0.05]
+    return itertools.cycle(sung)
@@ -0,0 +1,37 @@
+"""
+Benchmarks of the pitch and onset detectors, per block.
+"""
+import itertools
+
+from voicemidi.backend.onset.onset_detector import OnsetDetector
+from voicemidi.backend.pitch.pitch_detector import PitchDetector
+
+
+def make_pitch_detector(audio_case, **options):
+    """Pitch detector at a case's settings with the default YIN estimator."""
+    sample_rate, block_size = audio_case
+    return PitchDetector(sample_rate, block_size, min_confidence=0.5, **options)
+
+
+def test_detect_pitch_full_search(benchmark, audio_case, sung_blocks):
+    # Without tracking every block searches the whole lag range
+    detector = make_pitch_detector(audio_case, tracking=False)
+    benchmark(lambda: detector.detect_pitch(next(sung_blocks)))
+
+
+def test_detect_pitch_tracking(benchmark, audio_case, sung_blocks):
+    detector = make_pitch_detector(audio_case)
+    benchmark(lambda: detector.detect_pitch(next(sung_blocks)))
+
+
+def test_get_midi_note(benchmark, audio_case, sung_blocks):
+    detector = make_pitch_detector(audio_case)
+    benchmark(lambda: detector.get_midi_note(next(sung_blocks)))
+
+
+def test_detect_onset(benchmark, audio_case, sung_blocks):
+    sample_rate, block_size = audio_case
+    detector = OnsetDetector(sample_rate, block_size)
+    block_time = block_size / sample_rate
+    times = (i * block_time for i in itertools.count())
+    benchmark(lambda: detector.detect_onset(next(sung_blocks), next(times)))
@@ -0,0 +1,44 @@
+"""
+Benchmarks of the audio capture callback and the MIDI send path.
+"""
+import numpy as np
+import pytest
+
+from voicemidi.backend.audio import AudioInput
+from voicemidi.backend.midi import MidiOutput, NullMidiPort
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_audio_callback_and_read(benchmark, audio_case, channels):
+    # One device block written by the callback and read back by the consumer
+    sample_rate, block_size = audio_case
+    audio_input = AudioInput(sample_rate, block_size, channels=channels)
+    indata = np.random.default_rng(0).uniform(-0.5, 0.5, (block_size, channels)).astype(np.float32)
+
+    def capture():
+        audio_input.audio_callback(indata, block_size, None, None)
+        return audio_input.get_audio_block(timeout=0)
+
+    assert benchmark(capture) is not None
+
+
+@pytest.fixture
+def midi_output():
+    """MidiOutput sending to a NullMidiPort."""
+    output = MidiOutput(port=NullMidiPort())
+    output.open_port()
+    yield output
+    output.close_port()
+
+
+def test_midi_note_change(benchmark, midi_output):
+    notes = iter(range(1 << 30))
+    benchmark(lambda: midi_output.send_note_change(60, 60 + next(notes) % 12))
+
+
+def test_midi_note_on_off(benchmark, midi_output):
+    def note():
+        midi_output.send_note_on(60)
+        midi_output.send_note_off(60)
+
+    benchmark(note)
@@ -55,4 +55,13 @@ def temp_config_file(test_config):
     try:
         os.unlink(temp_file_path)
     except OSError:
-        pass 
\ No newline at end of file
+        pass
+
+
+@pytest.fixture
+def app_config_file(tmp_path, test_config):
+    """Write the test configuration, logging into the temporary directory."""
+    test_config["app"] = {"log_file": str(tmp_path / "voicemidi.log")}
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(test_config))
+    return str(config_file)
@@ -0,0 +1,227 @@
+"""
+Unit tests for the shared spectral front-end.
+"""
+import copy
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from voicemidi.backend.analysis import (
+    FftContext,
+    PolyphaseDecimator,
+    SlidingWindow,
+    SpectralFrontEnd,
+    analysis_window,
+    decimated_frame_size,
+    decimation_factor,
+)
+from voicemidi.backend.core.pipeline import AnalysisPipeline
+from voicemidi.backend.onset.onset_detector import OnsetDetector
+from voicemidi.backend.pitch.pitch_detector import PitchDetector
+from voicemidi.backend.utils.config import DEFAULT_CONFIG
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 1024
+
+
+def make_block(frequency=220.0, amplitude=0.3):
+    t = np.arange(BLOCK_SIZE) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def test_frame_matches_reference_computations():
+    block = make_block()
+    frame = SpectralFrontEnd(SAMPLE_RATE, BLOCK_SIZE).analyze(block)
+
+    rms = np.sqrt(np.mean(block.astype(np.float64) ** 2))
+    assert np.isclose(frame.rms, rms, rtol=1e-5)
+    assert np.isclose(frame.db, 20 * np.log10(rms), atol=1e-4)
+
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(BLOCK_SIZE) / BLOCK_SIZE)
+    assert np.allclose(frame.magnitude, np.abs(np.fft.rfft(block * window)), atol=1e-4)
+
+    reference = np.correlate(block, block, mode="full")[BLOCK_SIZE - 1:]
+    assert np.allclose(frame.autocorrelation, reference, atol=1e-3)
+
+
+def test_frame_is_reused_between_blocks():
+    front_end = SpectralFrontEnd(SAMPLE_RATE, BLOCK_SIZE)
+    first = front_end.analyze(make_block(220.0))
+    second = front_end.analyze(make_block(330.0))
+    assert first is second
+    assert second.samples is front_end.frame.samples
+
+
+def test_detectors_accept_shared_frame():
+    front_end = SpectralFrontEnd(SAMPLE_RATE, BLOCK_SIZE)
+    pitch = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.2, min_frequency=86.133)
+    block = make_block(261.63)
+
+    shared = pitch.detect_pitch(block, analysis=front_end.analyze(block))
+    direct = pitch.detect_pitch(block)
+    assert np.isclose(shared[0], direct[0], rtol=1e-4)
+
+    onset = OnsetDetector(SAMPLE_RATE, BLOCK_SIZE, silence=-60)
+    silent = np.zeros(BLOCK_SIZE, dtype=np.float32)
+    assert onset.detect_onset(silent, 0.0, analysis=front_end.analyze(silent)) is False
+
+
+def test_decimation_factor_targets_the_pitch_range():
+    assert decimation_factor(44100, 1024, 1000) == 4
+    assert decimation_factor(48000, 1024, 1000) == 4
+    assert decimation_factor(96000, 1024, 1000) == 8
+    assert decimation_factor(44100, 1024, 4000) == 1
+    assert decimation_factor(44100, 1022, 1000) == 2
+    assert decimated_frame_size(11025, 256, 86.133) == 256
+    assert decimated_frame_size(11025, 128, 50) == 512
+
+
+def test_decimator_passes_the_pitch_band_and_rejects_aliases():
+    decimator = PolyphaseDecimator(4, BLOCK_SIZE)
+    t = np.arange(8 * BLOCK_SIZE) / SAMPLE_RATE
+
+    def output_level(frequency):
+        signal = np.sin(2 * np.pi * frequency * t).astype(np.float32)
+        decimator.reset()
+        for start in range(0, len(signal), BLOCK_SIZE):
+            frame = decimator.process(signal[start:start + BLOCK_SIZE])
+        return np.sqrt(np.mean(frame.astype(np.float64) ** 2)) * np.sqrt(2)
+
+    assert np.isclose(output_level(440.0), 1.0, atol=0.01)
+    # Above the reduced Nyquist frequency of 5512 Hz, folded back otherwise
+    assert output_level(8000.0) < 1e-3
+
+
+def test_decimator_output_is_continuous_across_blocks():
+    rng = np.random.default_rng(0)
+    signal = rng.standard_normal(4 * BLOCK_SIZE)
+    decimator = PolyphaseDecimator(4, BLOCK_SIZE, frame_size=4 * BLOCK_SIZE // 4)
+    for start in range(0, len(signal), BLOCK_SIZE):
+        frame = decimator.process(signal[start:start + BLOCK_SIZE])
+
+    reference = np.convolve(signal, decimator.taps[::-1])[:len(signal)][3::4]
+    assert np.allclose(frame, reference, atol=1e-5)
+
+
+def test_pipeline_detects_pitch_at_a_reduced_rate():
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["audio"]["sample_rate"] = 96000
+    config["pitch"]["min_frequency"] = 86.133
+    pipeline = AnalysisPipeline(config)
+    assert pipeline.decimator.factor == 8
+    assert pipeline.pitch_detector.sample_rate == 12000
+
+    # At 96 kHz a full-rate block is too short for two periods of 110 Hz
+    t = np.arange(8 * BLOCK_SIZE) / 96000
+    signal = (0.3 * np.sin(2 * np.pi * 110.0 * t)).astype(np.float32)
+    for start in range(0, len(signal), BLOCK_SIZE):
+        analysis = pipeline.front_end.analyze(signal[start:start + BLOCK_SIZE])
+        frequency, confidence = pipeline.pitch_detector.detect_pitch(
+            pipeline.decimator.process(analysis.samples)
+        )
+    assert abs(12 * np.log2(frequency / 110.0)) < 0.1
+    assert confidence > 0.9
+
+
+def test_sliding_window_advances_by_one_hop():
+    window = SlidingWindow(frame_length=8, hop_length=2)
+    for start in range(0, 10, 2):
+        frame = window.push(np.arange(start, start + 2, dtype=np.float32))
+    assert np.array_equal(frame, np.arange(2, 10, dtype=np.float32))
+
+    assert analysis_window({"block_size": 512}) == (512, 512)
+    assert analysis_window(
+        {"block_size": 512, "frame_length": 2048, "hop_length": 256}
+    ) == (2048, 256)
+    assert analysis_window(
+        {"block_size": 512, "frame_length": 256, "hop_length": None}
+    ) == (256, 256)
+
+
+def test_pipeline_decides_every_hop_with_a_longer_frame():
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["audio"]["frame_length"] = 2048
+    config["audio"]["hop_length"] = 256
+    config["pitch"]["min_frequency"] = 86.133
+    pipeline = AnalysisPipeline(config)
+    assert pipeline.front_end.frame_size == 2048
+    assert pipeline.onset_detector.engine.frames_per_block == 1
+
+    t = np.arange(SAMPLE_RATE // 4) / SAMPLE_RATE
+    tone = (0.3 * np.sin(2 * np.pi * 110.0 * t)).astype(np.float32)
+    signal = np.concatenate([np.zeros(SAMPLE_RATE // 10, dtype=np.float32), tone])
+    notes = []
+    for start in range(0, len(signal) - 255, 256):
+        _, note_on = pipeline.process(signal[start:start + 256], (start + 256) / SAMPLE_RATE)
+        if note_on is not None:
+            notes.append(((start + 256) / SAMPLE_RATE, note_on))
+
+    # The onset is held until the pitch frame has caught up with the note
+    onset_time, note = notes[0]
+    assert note == 45
+    assert 0.1 < onset_time < 0.1 + 2048 / SAMPLE_RATE
+
+
+@pytest.mark.parametrize("sample_rate,frame_size", [(11025, 256), (44100, 1024)])
+def test_numba_yin_matches_numpy(sample_rate, frame_size):
+    pytest.importorskip("numba")
+    from voicemidi.backend.pitch.yin import YinPitchEstimator
+
+    noise = 0.01 * np.random.default_rng(0).standard_normal(frame_size)
+    frame = make_block(196.0)[:frame_size] + noise
+    numpy_path = YinPitchEstimator(sample_rate, frame_size, 86.133, 1000, use_numba=False)
+    numba_path = YinPitchEstimator(sample_rate, frame_size, 86.133, 1000, use_numba=True)
+    assert np.allclose(numba_path.autocorrelation(frame), numpy_path.autocorrelation(frame),
+                       atol=1e-6)
+    assert np.allclose(numba_path.difference(frame), numpy_path.difference(frame), atol=1e-6)
+    assert np.allclose(numba_path.estimate(frame), numpy_path.estimate(frame), rtol=1e-6)
+
+
+def test_numba_flux_matches_numpy():
+    pytest.importorskip("numba")
+    from voicemidi.backend.onset.functions import SpectralFlux
+
+    rng = np.random.default_rng(1)
+    numpy_path = SpectralFlux(4, 513, use_numba=False)
+    numba_path = SpectralFlux(4, 513, use_numba=True)
+    expected = np.zeros(4)
+    actual = np.zeros(4)
+    for _ in range(3):
+        magnitude = np.abs(rng.standard_normal((4, 513)))
+        numpy_path.compute(None, magnitude, expected)
+        numba_path.compute(None, magnitude, actual)
+        assert np.allclose(actual, expected)
+
+
+@pytest.mark.parametrize("workers", [None, 1])
+def test_fft_context_matches_reference_transforms(workers):
+    rng = np.random.default_rng(2)
+    frames = rng.standard_normal((3, 256)).astype(np.float32)
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(256) / 256)
+
+    batch = FftContext(256, window="hann", n_frames=3, workers=workers)
+    assert np.allclose(batch.rfft(frames), np.fft.rfft(frames * window, axis=1))
+
+    single = FftContext(256, 512, workers=workers)
+    reference = np.correlate(frames[0], frames[0], mode="full")[255:]
+    for _ in range(2):
+        # The zero padding must survive repeated calls
+        assert np.allclose(single.autocorrelation(frames[0])[:256], reference, atol=1e-4)
+
+
+def test_fft_context_does_not_allocate_per_frame():
+    context = FftContext(1024, 2048, window="hann")
+    frame = make_block()
+    context.autocorrelation(frame)
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for _ in range(50):
+            context.autocorrelation(frame)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    # Far below a single 2048-sample float64 buffer
+    assert peak < 4096
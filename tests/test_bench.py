@@ -0,0 +1,35 @@
+"""
+Unit tests for the pipeline benchmark and the ``bench`` command.
+"""
+import json
+
+import numpy as np
+
+from voicemidi.backend.core.bench import BENCH_STAGES, benchmark_pipeline, make_vocal_material
+from voicemidi.backend.core.cli import main
+from voicemidi.backend.utils.config import Config
+
+
+def test_vocal_material_is_deterministic_and_sung():
+    material = make_vocal_material(44100, 2.0)
+    assert len(material) == 88200 and material.dtype == np.float32
+    assert np.array_equal(material, make_vocal_material(44100, 2.0))
+    assert 0.3 < np.abs(material).max() < 1.0
+
+
+def test_benchmark_reports_every_stage(app_config_file):
+    result = benchmark_pipeline(Config(app_config_file).config, seconds=2.0)
+    assert set(result["stages"]) == set(BENCH_STAGES)
+    assert result["blocks"] == 2 * 44100 // result["settings"]["hop_length"]
+    assert result["stages"]["midi_send"]["count"] > 0
+    block = result["stages"]["block"]["mean_us"]
+    assert 0 < result["real_time_factor"] == block / result["block_period_us"]
+    assert result["streams_per_core"] == int(1 / result["real_time_factor"])
+    assert result["allocations"]["blocks_traced"] > 0
+
+
+def test_bench_command_prints_json(app_config_file, capsys):
+    main(["bench", "--config", app_config_file, "--seconds", "1", "--json", "--no-allocations"])
+    result = json.loads(capsys.readouterr().out)
+    assert result["allocations"] is None
+    assert result["stages"]["pitch"]["count"] == result["blocks"]
@@ -0,0 +1,80 @@
+"""
+Import budget tests: light commands must not load the DSP stack.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules that only the detectors may load
+HEAVY_MODULES = ("librosa", "scipy", "numba")
+
+# Generous cumulative import time for the light entry points, in seconds
+IMPORT_BUDGET = 1.5
+
+
+def run_python(code, cwd):
+    """Run code in a fresh interpreter, with the project importable, and return its stdout."""
+    root = Path(__file__).parent.parent
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(root), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_package_import_is_light(tmp_path):
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import voicemidi, voicemidi.backend, voicemidi.backend.core\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules], elapsed)\n"
+    )
+    loaded, elapsed = run_python(code, tmp_path).rsplit(" ", 1)
+    assert loaded == "[]"
+    assert float(elapsed) < IMPORT_BUDGET
+
+
+@pytest.mark.parametrize("module", [
+    "voicemidi.backend.onset.onset_detector",
+    "voicemidi.backend.pitch.pitch_detector",
+])
+def test_detector_modules_load_dsp_only_when_constructed(tmp_path, module):
+    code = (
+        "import sys\n"
+        f"import {module}\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    assert run_python(code, tmp_path).strip() == "[]"
+
+
+def test_list_midi_does_not_load_detectors(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"app": {"log_file": str(tmp_path / "voicemidi.log")}}))
+    code = (
+        "import sys\n"
+        "import mido\n"
+        "mido.get_output_names = lambda: ['Test Port']\n"
+        "from voicemidi.backend.core import cli\n"
+        f"sys.argv = ['voicemidi', '--list-midi', '--config', {str(config_file)!r}]\n"
+        "cli.main()\n"
+        "print('loaded', [m for m in sys.modules if m.split('.')[0] in "
+        f"{HEAVY_MODULES!r} or m.endswith('pitch_detector')])\n"
+    )
+    output = run_python(code, tmp_path)
+    assert output.strip().endswith("loaded []")
+
+
+def test_lazy_exports_resolve():
+    import voicemidi.backend as backend
+    from voicemidi.backend.pitch.pitch_detector import PitchDetector
+
+    assert backend.PitchDetector is PitchDetector
+    assert "VoiceToMidi" in dir(backend)
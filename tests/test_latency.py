@@ -0,0 +1,82 @@
+"""
+Unit tests for the latency histograms and the per-stage pipeline timing.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from voicemidi.backend.audio.audio_input import AudioInput
+from voicemidi.backend.core.voicemidi import VoiceToMidi
+from voicemidi.backend.utils.latency import LATENCY_STAGES, LatencyHistogram, LatencyTracker
+
+
+def test_percentiles_are_within_one_bucket():
+    histogram = LatencyHistogram()
+    values = np.linspace(0.001, 0.100, 1000)
+    for value in values:
+        histogram.record(value)
+
+    bucket_ratio = 10 ** (1 / histogram.buckets_per_decade)
+    for percent in (50, 95, 99):
+        exact = np.percentile(values, percent)
+        estimate = histogram.percentile(percent)
+        assert exact / bucket_ratio <= estimate <= exact * bucket_ratio
+
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert summary["max_ms"] == pytest.approx(100.0)
+    assert summary["mean_ms"] == pytest.approx(50.5)
+
+
+def test_out_of_range_values_are_kept():
+    histogram = LatencyHistogram(min_latency=1e-3, max_latency=1.0)
+    histogram.record(0.0)
+    histogram.record(5.0)
+    assert histogram.counts[0] == 1
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(100) == 5.0
+
+    histogram.reset()
+    assert histogram.percentile(50) == 0.0
+
+
+def test_tracker_summarizes_every_stage():
+    tracker = LatencyTracker()
+    tracker.record("pitch", 0.002)
+    summary = tracker.summary()
+    assert set(summary) == set(LATENCY_STAGES)
+    assert summary["pitch"]["count"] == 1
+    assert summary["onset"]["count"] == 0
+
+
+def test_blocks_carry_the_timing_of_their_callback():
+    audio = AudioInput(sample_rate=44100, block_size=4, channels=1, buffer_blocks=4)
+    block = np.zeros((4, 1), dtype=np.float32)
+    for current_time in (10.003, 10.005):
+        time_info = SimpleNamespace(inputBufferAdcTime=10.0, currentTime=current_time)
+        audio.audio_callback(block, 4, time_info, None)
+
+    audio.get_audio_block(timeout=0)
+    capture, first_callback = audio.get_block_timing()
+    assert capture == pytest.approx(0.003)
+
+    audio.get_audio_block(timeout=0)
+    capture, second_callback = audio.get_block_timing()
+    assert capture == pytest.approx(0.005)
+    assert second_callback >= first_callback
+
+
+def test_pipeline_records_stage_latencies(app_config_file):
+    app = VoiceToMidi(app_config_file)
+
+    t = np.arange(1024) / 44100
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+    for _ in range(4):
+        app._process_audio_block(tone, timing=(0.002, 0.0))
+
+    stats = app.get_stats()["latency"]
+    assert stats["pitch"]["count"] == 4
+    assert stats["onset"]["count"] == 4
+    assert stats["decision"]["count"] == 4
+    assert stats["end_to_end"]["count"] == stats["midi_send"]["count"]
@@ -0,0 +1,120 @@
+"""
+Unit tests for the raw-bytes MIDI output path.
+"""
+import mido
+
+from voicemidi.backend.midi.midi_output import MidiOutput
+
+
+class FakeRtMidi:
+    """Stand-in for rtmidi.MidiOut."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, message):
+        self.sent.append(list(message))
+
+
+class FakeRtMidiPort:
+    """Port shaped like mido's rtmidi backend output."""
+
+    def __init__(self):
+        self._rt = FakeRtMidi()
+
+    def close(self):
+        pass
+
+
+class FakeMidoPort:
+    """Port that only accepts mido messages."""
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, msg):
+        self.messages.append(msg)
+
+    def close(self):
+        pass
+
+
+def make_output(port):
+    midi = MidiOutput()
+    midi.midi_out = port
+    return midi
+
+
+def test_raw_bytes_go_straight_to_rtmidi():
+    port = FakeRtMidiPort()
+    midi = make_output(port)
+    midi.set_channel(2)
+    midi.send_note_on(60)
+    midi.send_note_off(60)
+    midi.send_control_change(7, 100)
+    midi.send_pitch_bend(0.0)
+    assert port._rt.sent == [
+        [0x92, 60, 64],
+        [0x82, 60, 0],
+        [0xB2, 7, 100],
+        [0xE2, 0, 64],
+    ]
+
+
+def test_bytes_match_mido_messages():
+    port = FakeMidoPort()
+    midi = make_output(port)
+    midi.set_velocity(100)
+    midi.send_note_on(62)
+    midi.send_pitch_bend(-1.0)
+    assert port.messages[0] == mido.Message("note_on", note=62, velocity=100)
+    assert port.messages[1] == mido.Message("pitchwheel", pitch=-8192)
+
+
+def test_note_change_sends_off_then_on_in_one_batch():
+    port = FakeRtMidiPort()
+    midi = make_output(port)
+    midi.send_note_on(60)
+    midi.send_note_change(60, 64)
+    assert port._rt.sent[1:] == [[0x80, 60, 0], [0x90, 64, 64]]
+    assert midi.current_note == 64
+
+    midi.send_note_change(64, None)
+    assert port._rt.sent[-1] == [0x80, 64, 0]
+    assert midi.current_note is None
+
+
+def test_all_notes_off_covers_every_channel():
+    port = FakeRtMidiPort()
+    midi = make_output(port)
+    midi.all_notes_off()
+    assert port._rt.sent == [[0xB0 | channel, 123, 0] for channel in range(16)]
+
+
+def test_out_of_range_velocity_is_not_sent():
+    port = FakeRtMidiPort()
+    midi = make_output(port)
+    midi.send_note_on(60, velocity=200)
+    midi.send_note_on(60, velocity=-1)
+    assert port._rt.sent == []
+    assert midi.current_note is None
+
+    midi.send_note_on(60, velocity=127)
+    assert port._rt.sent == [[0x90, 60, 127]]
+
+
+def test_closed_port_is_skipped():
+    port = FakeRtMidiPort()
+    port.closed = True
+    midi = make_output(port)
+    midi.send_note_on(60)
+    assert port._rt.sent == []
+
+
+def test_raw_rtmidi_path_needs_a_known_mido(monkeypatch):
+    monkeypatch.setattr("voicemidi.backend.midi.midi_output.MIDO_RTMIDI_RAW_SEND", False)
+    port = FakeRtMidiPort()
+    port.send = lambda msg: port._rt.send_message(msg.bytes())
+    midi = make_output(port)
+    midi.send_note_on(60)
+    assert port._rt.sent == [[0x90, 60, 64]]
@@ -0,0 +1,121 @@
+"""
+Unit tests for the onset detector and its engines.
+"""
+import numpy as np
+import pytest
+
+from voicemidi.backend.analysis import SpectralFrontEnd
+from voicemidi.backend.onset.onset_detector import OnsetDetector
+from voicemidi.backend.onset.peak_picker import StreamingPeakPicker
+from voicemidi.backend.onset.spectral import SpectralOnsetEngine
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 1024
+
+
+def make_blocks(n_quiet=8, n_tone=4, frequency=330.0):
+    """Low-level noise followed by a tone burst, split into blocks."""
+    rng = np.random.default_rng(0)
+    quiet = 0.001 * rng.standard_normal(n_quiet * BLOCK_SIZE)
+    t = np.arange(n_tone * BLOCK_SIZE) / SAMPLE_RATE
+    tone = 0.5 * np.sin(2 * np.pi * frequency * t)
+    signal = np.concatenate([quiet, tone]).astype(np.float32)
+    return signal.reshape(-1, BLOCK_SIZE)
+
+
+def make_sustained_blocks(seconds=5.0, frequency=220.0):
+    """A steady sung-like note with vibrato, split into blocks."""
+    rng = np.random.default_rng(1)
+    t = np.arange(int(seconds * SAMPLE_RATE) // BLOCK_SIZE * BLOCK_SIZE) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(frequency * (1 + 0.01 * np.sin(2 * np.pi * 5 * t))) / SAMPLE_RATE
+    signal = 0.3 * np.sin(phase) + 0.1 * np.sin(2 * phase) + 0.003 * rng.standard_normal(len(t))
+    return signal.astype(np.float32).reshape(-1, BLOCK_SIZE)
+
+
+@pytest.mark.parametrize("algorithm", ["flux", "hfc", "energy", "complex"])
+def test_spectral_functions_detect_burst_after_quiet(algorithm):
+    detector = OnsetDetector(SAMPLE_RATE, BLOCK_SIZE, threshold=0.3, silence=-80,
+                             algorithm=algorithm)
+    blocks = make_blocks()
+    onsets = [detector.detect_onset(block, i * BLOCK_SIZE / SAMPLE_RATE)
+              for i, block in enumerate(blocks)]
+    assert onsets[8] is True
+    assert not any(onsets[9:])
+
+
+@pytest.mark.parametrize("algorithm", ["flux", "hfc", "energy", "complex"])
+def test_spectral_functions_ignore_sustained_note(algorithm):
+    detector = OnsetDetector(SAMPLE_RATE, BLOCK_SIZE, threshold=0.3, silence=-80,
+                             algorithm=algorithm)
+    onsets = [detector.detect_onset(block, i * BLOCK_SIZE / SAMPLE_RATE)
+              for i, block in enumerate(make_sustained_blocks())]
+    # Only the start of the note
+    assert onsets[0] is True
+    assert not any(onsets[1:])
+
+
+def test_peak_picker_statistics_track_recent_history():
+    picker = StreamingPeakPicker(history=8, pre_max=2)
+    values = np.random.default_rng(0).random(30)
+    for value in values:
+        picker.push(value)
+    assert np.isclose(picker.mean, values[-8:].mean())
+    assert np.isclose(picker.std, values[-8:].std())
+
+
+def test_peak_picker_requires_recent_maximum():
+    picker = StreamingPeakPicker(history=8, pre_max=3)
+    assert picker.push(1.0) == pytest.approx(1.0)
+    # Below the previous value: not a peak, however far above the mean
+    assert picker.push(0.9) == 0.0
+    assert picker.push(0.1) == 0.0
+    assert picker.push(0.1) == 0.0
+    # The 1.0 has left the pre_max window
+    assert picker.push(0.95) > 0.0
+
+
+def test_engine_values_cover_new_frames():
+    engine = SpectralOnsetEngine(SAMPLE_RATE, BLOCK_SIZE, function="flux")
+    for block in make_blocks(n_quiet=3, n_tone=1):
+        engine.process(block)
+    assert engine.values.shape == (engine.frames_per_block,)
+    assert engine.values.max() > 0
+
+
+@pytest.mark.parametrize("function", ["flux", "complex"])
+def test_engine_reuses_the_shared_spectrum(function, monkeypatch):
+    # Overlapping onset frames, the newest matching the front-end's frame
+    standalone = SpectralOnsetEngine(SAMPLE_RATE, BLOCK_SIZE // 2, frame_length=BLOCK_SIZE,
+                                     hop_length=BLOCK_SIZE // 8, function=function)
+    shared = SpectralOnsetEngine(SAMPLE_RATE, BLOCK_SIZE // 2, frame_length=BLOCK_SIZE,
+                                 hop_length=BLOCK_SIZE // 8, function=function)
+    front_end = SpectralFrontEnd(SAMPLE_RATE, BLOCK_SIZE)
+    # Only the frames before the newest are transformed
+    monkeypatch.setattr(shared._fft, "rfft", None)
+    # Lead-in of the silence both engines start from
+    signal = np.concatenate([np.zeros(BLOCK_SIZE, dtype=np.float32),
+                             make_blocks(n_quiet=3, n_tone=2).ravel()])
+    for end in range(BLOCK_SIZE * 3 // 2, len(signal) + 1, BLOCK_SIZE // 2):
+        frame = front_end.analyze(signal[end - BLOCK_SIZE:end])
+        block = signal[end - BLOCK_SIZE // 2:end]
+        assert shared.process(block, frame.spectrum) == standalone.process(block)
+        assert np.array_equal(shared.values, standalone.values)
+
+
+def test_engine_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        SpectralOnsetEngine(SAMPLE_RATE, BLOCK_SIZE, hop_length=300)
+    with pytest.raises(ValueError):
+        SpectralOnsetEngine(SAMPLE_RATE, BLOCK_SIZE, function="nope")
+
+
+def test_aubio_detects_burst_after_quiet():
+    pytest.importorskip("aubio")
+    detector = OnsetDetector(SAMPLE_RATE, BLOCK_SIZE, threshold=0.3, silence=-80,
+                             algorithm="aubio", aubio_method="specflux")
+    blocks = make_blocks()
+    onsets = [detector.detect_onset(block, i * BLOCK_SIZE / SAMPLE_RATE)
+              for i, block in enumerate(blocks)]
+    # aubio flags the very first hop of a stream, then only the burst
+    assert onsets[8] is True
+    assert not any(onsets[1:8])
@@ -0,0 +1,304 @@
+"""
+Unit tests for the pitch detector and its estimators.
+"""
+import numpy as np
+import pytest
+
+from voicemidi.backend.analysis import SpectralFrontEnd
+from voicemidi.backend.pitch import (
+    NoteSmoother,
+    PitchEstimator,
+    available_estimators,
+    create_estimator,
+    register_estimator,
+)
+from voicemidi.backend.pitch.benchmark import benchmark_estimators
+from voicemidi.backend.pitch.pitch_detector import PitchDetector
+from voicemidi.backend.pitch.registry import _ESTIMATORS
+from voicemidi.backend.pitch.tracking import LagTracker
+from voicemidi.backend.pitch.yin import YinPitchEstimator
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 1024
+
+
+def make_tone(frequency, n_samples=BLOCK_SIZE, sample_rate=SAMPLE_RATE, amplitude=0.5):
+    """Generate a voice-like tone with a second harmonic and a little noise."""
+    rng = np.random.default_rng(0)
+    t = np.arange(n_samples) / sample_rate
+    wave = amplitude * np.sin(2 * np.pi * frequency * t)
+    wave += 0.4 * amplitude * np.sin(4 * np.pi * frequency * t)
+    wave += 0.01 * rng.standard_normal(n_samples)
+    return wave.astype(np.float32)
+
+
+@pytest.mark.parametrize("frequency,midi", [(110.0, 45), (261.63, 60), (440.0, 69), (880.0, 81)])
+def test_yin_detects_tone(frequency, midi):
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.2,
+                             min_frequency=86.133, max_frequency=1000, algorithm="yin")
+    pitch, confidence = detector.detect_pitch(make_tone(frequency))
+    assert abs(12 * np.log2(pitch / frequency)) < 0.1
+    assert confidence > 0.9
+    assert detector.get_midi_note(make_tone(frequency), smooth=False)[0] == midi
+
+
+def test_yin_rejects_silence_and_short_blocks():
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, algorithm="yin")
+    assert detector.detect_pitch(np.zeros(BLOCK_SIZE, dtype=np.float32)) == (0, 0)
+    assert detector.detect_pitch(make_tone(440.0, n_samples=BLOCK_SIZE // 2)) == (0, 0)
+
+
+def test_yin_reuses_work_buffers():
+    estimator = YinPitchEstimator(SAMPLE_RATE, BLOCK_SIZE, 86.133, 1000)
+    first = estimator.difference(make_tone(220.0))
+    second = estimator.difference(make_tone(330.0))
+    assert first is second
+
+
+def test_unknown_algorithm_raises():
+    with pytest.raises(ValueError):
+        PitchDetector(algorithm="nope")
+
+
+def test_pyin_decodes_with_fixed_lag():
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.2,
+                             min_frequency=86.133, max_frequency=1000,
+                             algorithm="pyin", pyin_lag=2)
+    results = [detector.detect_pitch(make_tone(261.63)) for _ in range(6)]
+
+    # Nothing is emitted until the decoder has seen `lag` frames
+    assert results[:2] == [(0, 0), (0, 0)]
+    for pitch, confidence in results[2:]:
+        assert abs(12 * np.log2(pitch / 261.63)) < 0.1
+        assert confidence > 0.9
+
+
+def test_pyin_resets_on_silence():
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.2,
+                             min_frequency=86.133, algorithm="pyin", pyin_lag=1)
+    for _ in range(3):
+        detector.detect_pitch(make_tone(440.0))
+    assert detector.detect_pitch(np.zeros(BLOCK_SIZE, dtype=np.float32)) == (0, 0)
+    assert detector.detect_pitch(make_tone(440.0)) == (0, 0)
+
+
+@pytest.mark.parametrize("method", ["yinfast", "yin", "yinfft"])
+def test_aubio_detects_tone(method):
+    pytest.importorskip("aubio")
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.2,
+                             min_frequency=86.133, max_frequency=1000,
+                             algorithm="aubio", aubio_method=method)
+    pitch, confidence = detector.detect_pitch(make_tone(440.0))
+    assert abs(12 * np.log2(pitch / 440.0)) < 0.2
+    assert confidence > 0.5
+
+
+def test_aubio_analyzes_the_newest_samples():
+    pytest.importorskip("aubio")
+    estimator = create_estimator("aubio", sample_rate=SAMPLE_RATE, frame_size=BLOCK_SIZE,
+                                 min_frequency=86.133, max_frequency=1000)
+    frame = np.concatenate([np.zeros(BLOCK_SIZE, dtype=np.float32), make_tone(440.0)])
+    pitch, _ = estimator.estimate(frame)
+    assert abs(12 * np.log2(pitch / 440.0)) < 0.2
+
+
+def test_silence_resets_the_estimator_once(monkeypatch):
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.5)
+    resets = []
+    monkeypatch.setattr(detector.estimator, "reset", lambda: resets.append(1))
+    silence = np.zeros(BLOCK_SIZE, dtype=np.float32)
+    for block in [make_tone(440.0), silence, silence, silence, make_tone(440.0), silence]:
+        detector.detect_pitch(block)
+    assert len(resets) == 2
+
+
+def test_aubio_rejects_unknown_method():
+    pytest.importorskip("aubio")
+    with pytest.raises(ValueError):
+        PitchDetector(SAMPLE_RATE, BLOCK_SIZE, algorithm="aubio", aubio_method="nope")
+
+
+@pytest.mark.parametrize("algorithm", ["mpm", "acf", "hps"])
+@pytest.mark.parametrize("frequency", [220.0, 440.0, 880.0])
+def test_registered_estimators_detect_tone(algorithm, frequency):
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.2,
+                             min_frequency=86.133, max_frequency=1000, algorithm=algorithm)
+    pitch, confidence = detector.detect_pitch(make_tone(frequency))
+    assert abs(12 * np.log2(pitch / frequency)) < 0.2
+    assert confidence > 0.8
+
+
+@pytest.mark.parametrize("algorithm", ["yin", "mpm", "acf"])
+def test_estimators_accept_shared_autocorrelation(algorithm):
+    front_end = SpectralFrontEnd(SAMPLE_RATE, BLOCK_SIZE)
+    estimator = create_estimator(algorithm, SAMPLE_RATE, BLOCK_SIZE, 86.133, 1000)
+    tone = make_tone(261.63)
+    shared = estimator.estimate(tone, front_end.analyze(tone).autocorrelation)
+    assert shared == pytest.approx(estimator.estimate(tone), rel=1e-4)
+
+
+def test_tracking_narrows_the_search_on_a_held_note(monkeypatch):
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.5,
+                             min_frequency=86.133, max_frequency=1000, algorithm="yin")
+    for _ in range(PitchDetector.TRACKING_LOCK_BLOCKS):
+        detector.detect_pitch(make_tone(220.0))
+    assert detector.locked_frequency == pytest.approx(220.0, rel=0.01)
+
+    # While locked, the full search is not run
+    monkeypatch.setattr(detector.estimator, "estimate", lambda *args: pytest.fail("full search"))
+    pitch, confidence = detector.detect_pitch(make_tone(226.0))
+    assert abs(12 * np.log2(pitch / 226.0)) < 0.1
+    assert confidence > 0.9
+
+
+@pytest.mark.parametrize("frequency", [330.0, 440.0, 110.0])
+def test_tracking_falls_back_when_the_note_leaves_the_window(frequency):
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.5,
+                             min_frequency=86.133, max_frequency=1000, algorithm="yin")
+    for _ in range(PitchDetector.TRACKING_LOCK_BLOCKS):
+        detector.detect_pitch(make_tone(220.0))
+    assert detector.locked_frequency > 0
+
+    pitch, _ = detector.detect_pitch(make_tone(frequency))
+    assert abs(12 * np.log2(pitch / frequency)) < 0.1
+
+
+def test_tracking_stops_on_unlock_and_silence():
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_frequency=86.133, max_frequency=1000)
+    for _ in range(PitchDetector.TRACKING_LOCK_BLOCKS):
+        detector.detect_pitch(make_tone(220.0))
+    detector.unlock()
+    assert detector.locked_frequency == 0
+
+    for _ in range(PitchDetector.TRACKING_LOCK_BLOCKS):
+        detector.detect_pitch(make_tone(220.0))
+    detector.detect_pitch(np.zeros(BLOCK_SIZE, dtype=np.float32))
+    assert detector.locked_frequency == 0
+
+
+def test_tracking_only_for_supporting_estimators():
+    assert PitchDetector(SAMPLE_RATE, BLOCK_SIZE, algorithm="hps").tracker is None
+    assert PitchDetector(SAMPLE_RATE, BLOCK_SIZE, algorithm="yin", tracking=False).tracker is None
+
+
+@pytest.mark.parametrize("sample_rate,frame_size", [(44100, 1024), (11025, 256)])
+def test_numba_tracking_matches_numpy(sample_rate, frame_size):
+    pytest.importorskip("numba")
+    numpy_path = LagTracker(sample_rate, frame_size, 86.133, 1000, use_numba=False)
+    numba_path = LagTracker(sample_rate, frame_size, 86.133, 1000, use_numba=True)
+    for frequency in (110.0, 220.0, 440.0):
+        tone = make_tone(frequency, frame_size, sample_rate)
+        assert np.allclose(numba_path.search(tone, frequency * 1.03),
+                           numpy_path.search(tone, frequency * 1.03), rtol=1e-6)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5])
+def test_smoother_matches_mode_and_median_of_the_window(size):
+    rng = np.random.default_rng(size)
+    notes = rng.choice([40, 60, 60, 61, 62, 64, 72], 500)
+    mode = NoteSmoother(size, "mode")
+    median = NoteSmoother(size, "median")
+    for i, note in enumerate(notes):
+        window = notes[max(0, i - size + 1):i + 1]
+        counts = np.bincount(window)
+        assert counts[mode.update(note)] == counts.max()
+        assert median.update(note + 0.3) == np.sort(window)[(len(window) - 1) // 2]
+
+
+def test_smoother_hysteresis_holds_until_a_steady_change():
+    smoother = NoteSmoother(3, "hysteresis", margin=0.3)
+    assert smoother.update(60.0) == 60
+    # Drifting up to 0.8 semitones away stays on the note
+    assert smoother.update(60.75) == 60
+    # One stray block does not move it; two in a row do
+    assert smoother.update(62.0) == 60
+    assert smoother.update(60.2) == 60
+    assert smoother.update(62.0) == 60
+    assert smoother.update(62.1) == 62
+
+
+def test_smoother_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        NoteSmoother(0)
+    with pytest.raises(ValueError):
+        NoteSmoother(3, "mean")
+
+
+def test_detector_honours_buffer_size_and_resets_on_silence():
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.5, min_frequency=86.133,
+                             max_frequency=1000, buffer_size=5, smoothing="mode")
+    assert detector.smoother.size == 5
+    for _ in range(3):
+        detector.get_midi_note(make_tone(220.0))
+    assert detector.get_midi_note(make_tone(330.0))[0] == 57
+
+    # After silence the next note does not inherit the previous one's votes
+    assert detector.get_midi_note(np.zeros(BLOCK_SIZE, dtype=np.float32))[0] == 0
+    assert detector.get_midi_note(make_tone(330.0))[0] == 64
+
+
+@pytest.mark.parametrize("use_numba", [False, None])
+def test_yin_batch_matches_per_frame_estimates(use_numba):
+    estimator = YinPitchEstimator(SAMPLE_RATE, BLOCK_SIZE, 86.133, 1000, use_numba=use_numba)
+    rng = np.random.default_rng(1)
+    frames = np.stack([make_tone(f) for f in rng.uniform(90, 900, 20)]
+                      + [0.1 * rng.standard_normal(BLOCK_SIZE), np.zeros(BLOCK_SIZE)])
+    frequencies, confidences = estimator.estimate_batch(frames)
+    expected = np.array([estimator.estimate(frame) for frame in frames])
+    assert np.allclose(frequencies, expected[:, 0])
+    assert np.allclose(confidences, expected[:, 1])
+
+
+@pytest.mark.parametrize("algorithm", ["yin", "mpm"])
+def test_detector_batch_gates_and_converts_to_midi(algorithm):
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_confidence=0.5, min_frequency=86.133,
+                             max_frequency=1000, algorithm=algorithm)
+    frames = np.stack([make_tone(220.0), np.zeros(BLOCK_SIZE, dtype=np.float32),
+                       make_tone(440.0), make_tone(261.63)])
+    frequencies, confidences, midi_notes = detector.detect_pitch_batch(frames)
+    assert list(midi_notes) == [57, 0, 69, 60]
+    assert frequencies[1] == confidences[1] == 0
+    assert np.all(confidences[[0, 2, 3]] > 0.5)
+    for frame, frequency in zip(frames[[0, 2, 3]], frequencies[[0, 2, 3]]):
+        assert np.isclose(detector.detect_pitch(frame)[0], frequency)
+
+    with pytest.raises(ValueError):
+        detector.detect_pitch_batch(make_tone(220.0))
+
+
+@pytest.mark.parametrize("algorithm", ["pyin", "aubio"])
+def test_detector_batch_rejects_stateful_estimators(algorithm):
+    if algorithm == "aubio":
+        pytest.importorskip("aubio")
+    detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, min_frequency=86.133, max_frequency=1000,
+                             algorithm=algorithm)
+    frames = np.stack([make_tone(220.0), make_tone(440.0)])
+    with pytest.raises(ValueError):
+        detector.detect_pitch_batch(frames)
+    with pytest.raises(ValueError):
+        detector.estimator.estimate_batch(frames)
+
+
+def test_register_custom_estimator():
+    class FixedEstimator(PitchEstimator):
+        def estimate(self, frame, autocorrelation=None):
+            return 440.0, 1.0
+
+    register_estimator("fixed-test", FixedEstimator)
+    try:
+        assert "fixed-test" in available_estimators()
+        with pytest.raises(ValueError):
+            register_estimator("fixed-test", FixedEstimator)
+        detector = PitchDetector(SAMPLE_RATE, BLOCK_SIZE, algorithm="fixed-test")
+        assert detector.get_midi_note(make_tone(220.0), smooth=False)[0] == 69
+    finally:
+        _ESTIMATORS.pop("fixed-test")
+
+
+def test_benchmark_reports_every_estimator():
+    results = benchmark_estimators(["yin", "acf"], notes=(57, 69), blocks=2)
+    assert [result["name"] for result in results] == ["yin", "acf"]
+    for result in results:
+        assert result["us_per_block"] > 0
+        assert result["detection_rate"] == 1.0
+        assert result["median_error_cents"] < 10
@@ -0,0 +1,78 @@
+"""
+Unit tests for the thread and callback processing modes.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from voicemidi.backend.core.voicemidi import VoiceToMidi
+
+
+def make_capture(block_size=1024, n_blocks=3):
+    """Return the blocks of a 440 Hz tone shaped like callback input."""
+    t = np.arange(block_size * n_blocks) / 44100
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    return tone.reshape(n_blocks, block_size, 1)
+
+
+def test_thread_mode_consumes_blocks_from_the_ring(app_config_file):
+    app = VoiceToMidi(app_config_file)
+    assert app.processing_mode == "thread"
+    for block in make_capture():
+        app.audio_input.audio_callback(block, len(block), None, None)
+
+    audio_data = app.audio_input.get_audio_block(timeout=0)
+    while audio_data is not None:
+        app._handle_block(audio_data, app.audio_input.get_block_timing())
+        audio_data = app.audio_input.get_audio_block(timeout=0)
+
+    stats = app.get_stats()
+    assert stats["processing_mode"] == "thread"
+    assert stats["blocks_processed"] == 3
+
+
+def test_callback_mode_processes_on_the_audio_thread(app_config_file):
+    with open(app_config_file) as f:
+        config = json.load(f)
+    config["audio"]["processing_mode"] = "callback"
+    with open(app_config_file, "w") as f:
+        json.dump(config, f)
+
+    app = VoiceToMidi(app_config_file)
+    app.audio_input.set_block_handler(app._handle_block)
+    for block in make_capture():
+        app.audio_input.audio_callback(block, len(block), None, None)
+
+    stats = app.get_stats()
+    assert stats["processing_mode"] == "callback"
+    assert stats["blocks_processed"] == 3
+    assert app.audio_input.get_audio_block(timeout=0) is None
+    assert app.current_time == pytest.approx(3 * 1024 / 44100)
+
+
+def test_callback_mode_hands_over_hops_shorter_than_the_block(app_config_file):
+    with open(app_config_file) as f:
+        config = json.load(f)
+    config["audio"].update(processing_mode="callback", frame_length=2048, hop_length=256)
+    with open(app_config_file, "w") as f:
+        json.dump(config, f)
+
+    app = VoiceToMidi(app_config_file)
+    app.audio_input.set_block_handler(app._handle_block)
+    for block in make_capture():
+        app.audio_input.audio_callback(block, len(block), None, None)
+
+    assert app.get_stats()["blocks_processed"] == 12
+    assert app.current_time == pytest.approx(3 * 1024 / 44100)
+
+
+def test_unknown_processing_mode_is_rejected(app_config_file):
+    with open(app_config_file) as f:
+        config = json.load(f)
+    config["audio"]["processing_mode"] = "interrupt"
+    with open(app_config_file, "w") as f:
+        json.dump(config, f)
+
+    with pytest.raises(ValueError):
+        VoiceToMidi(app_config_file)
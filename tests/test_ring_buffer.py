@@ -0,0 +1,102 @@
+"""
+Unit tests for the audio ring buffer and the AudioInput callback path.
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from voicemidi.backend.audio.audio_input import AudioInput
+from voicemidi.backend.audio.ring_buffer import RingBuffer
+
+
+def test_reads_are_views_in_write_order():
+    ring = RingBuffer(capacity=12, max_read=4)
+    data = np.arange(40, dtype=np.float32)
+    out = []
+    for i in range(0, 40, 4):
+        ring.write(data[i:i + 4])
+        block = ring.read(4)
+        assert block.base is ring._buffer
+        out.append(block.copy())
+    assert np.array_equal(np.concatenate(out), data)
+
+
+def test_wrapping_reads_stay_contiguous():
+    ring = RingBuffer(capacity=10, max_read=4)
+    data = np.arange(30, dtype=np.float32)
+    for i in range(0, 30, 3):
+        ring.write(data[i:i + 3])
+        block = ring.read(3)
+        assert np.array_equal(block, data[i:i + 3])
+
+
+def test_overrun_skips_to_newest_and_counts_drops():
+    ring = RingBuffer(capacity=8, max_read=4)
+    for i in range(5):
+        ring.write(np.full(4, i, dtype=np.float32))
+    block = ring.read(4)
+    assert np.all(block == 4)
+    assert ring.dropped_samples == 16
+    assert ring.read(4) is None
+
+
+def test_wait_times_out_and_wakes_on_write():
+    ring = RingBuffer(capacity=8, max_read=4)
+    assert ring.wait(4, timeout=0.01) is False
+    timer = threading.Timer(0.01, ring.write, args=(np.ones(4, dtype=np.float32),))
+    timer.start()
+    assert ring.wait(4, timeout=1.0) is True
+    timer.join()
+
+
+def test_capacity_must_hold_two_reads():
+    with pytest.raises(ValueError):
+        RingBuffer(capacity=6, max_read=4)
+
+
+def test_callback_downmixes_into_ring():
+    audio = AudioInput(sample_rate=44100, block_size=4, channels=2, buffer_blocks=2)
+    indata = np.array([[1, 3], [2, 4], [0, 0], [-1, 1]], dtype=np.float32)
+    audio.audio_callback(indata, 4, None, None)
+    assert np.array_equal(audio.get_audio_block(timeout=0), [2, 3, 0, 0])
+    assert audio.get_audio_block(timeout=0) is None
+
+
+class FakeStatus:
+    """Stand-in for sounddevice.CallbackFlags."""
+
+    def __init__(self, **flags):
+        self.flags = flags
+
+    def __getattr__(self, name):
+        return self.flags.get(name, False)
+
+    def __bool__(self):
+        return any(self.flags.values())
+
+    def __str__(self):
+        return ", ".join(self.flags)
+
+
+def test_stats_separate_device_flags_from_consumer_drops():
+    audio = AudioInput(sample_rate=44100, block_size=4, channels=1, buffer_blocks=2)
+    block = np.zeros((4, 1), dtype=np.float32)
+    audio.audio_callback(block, 4, None, FakeStatus(input_overflow=True))
+    for _ in range(3):
+        audio.audio_callback(block, 4, None, None)
+
+    stats = audio.get_stats()
+    assert stats["callbacks"] == 4
+    assert stats["input_overflows"] == 1
+    assert stats["status_flags"]["input_underflow"] == 0
+    assert stats["queue_high_water_blocks"] == 4
+    assert stats["consumer_lag_samples"] == 16
+
+    audio.get_audio_block(timeout=0)
+    stats = audio.get_stats()
+    assert stats["blocks_dropped"] == 3
+    assert stats["consumer_lag_samples"] == 0
+
+    audio.reset_stats()
+    assert audio.get_stats()["blocks_dropped"] == 0
@@ -13,6 +13,7 @@
 from voicemidi.backend.pitch.pitch_detector import PitchDetector
 from voicemidi.backend.onset.onset_detector import OnsetDetector
 from voicemidi.backend.midi.midi_output import MidiOutput
+from voicemidi.backend.audio.sources import generate_sine_wave
 
 # Configure logging
 logging.basicConfig(
@@ -21,20 +22,6 @@
 )
 logger = logging.getLogger("TestTone")
 
-def generate_sine_wave(frequency, duration=0.5, sample_rate=44100, amplitude=0.5):
-    """Generate a sine wave at the specified frequency."""
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    wave = amplitude * np.sin(2 * np.pi * frequency * t)
-    
-    # Apply envelope to avoid clicks
-    envelope = np.ones_like(wave)
-    attack_samples = int(0.01 * sample_rate)  # 10ms attack
-    release_samples = int(0.01 * sample_rate)  # 10ms release
-    envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
-    envelope[-release_samples:] = np.linspace(1, 0, release_samples)
-    
-    return (wave * envelope).astype(np.float32)
-
 def main():
     """Run the test tone through the pitch and onset detection."""
     print("\nTest Tone for Voice-to-MIDI")
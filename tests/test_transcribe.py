@@ -0,0 +1,104 @@
+"""
+Unit tests for offline WAV-to-MIDI transcription.
+"""
+import wave
+
+import mido
+import numpy as np
+import pytest
+
+from voicemidi.backend.audio.wav import _pcm_to_float
+from voicemidi.backend.core.cli import main
+from voicemidi.backend.core.transcribe import (
+    plan_segments,
+    stitch_segments,
+    transcribe_file,
+)
+from voicemidi.backend.pitch.benchmark import make_voice_tone
+from voicemidi.backend.utils.config import Config
+
+SAMPLE_RATE = 22050
+
+# (frequency in Hz or 0 for silence, seconds); the 330 Hz note spans a
+# segment boundary in the segmented runs
+MELODY = ((220.0, 0.8), (0, 0.3), (330.0, 2.5), (0, 0.2), (262.0, 0.6), (294.0, 0.6), (0, 0.4))
+
+
+@pytest.fixture
+def melody_wav(tmp_path):
+    """Write the melody as a 16-bit mono WAV file."""
+    parts = [0.5 * make_voice_tone(frequency, int(seconds * SAMPLE_RATE), SAMPLE_RATE) if frequency
+             else np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+             for frequency, seconds in MELODY]
+    samples = (np.concatenate(parts) * 32767).astype("<i2")
+    path = tmp_path / "melody.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+    return str(path)
+
+
+def read_notes(path):
+    """Return the (seconds, type, note) of each note message in a MIDI file."""
+    seconds = 0.0
+    notes = []
+    for message in mido.MidiFile(path):
+        seconds += message.time
+        if message.type in ("note_on", "note_off"):
+            notes.append((round(seconds, 3), message.type, message.note))
+    return notes
+
+
+def test_segments_cover_whole_hops():
+    assert plan_segments(10, 256, 4) == [(0, 1024), (1024, 2048), (2048, 2560)]
+
+
+def test_stitching_closes_notes_across_boundaries():
+    segments = [(0, 100), (100, 200)]
+    results = [(0, [(50, 0, 60)]), (62, [(150, 62, 0)])]
+    assert stitch_segments(segments, results) == [(50, 0, 60), (100, 60, 62), (150, 62, 0)]
+    assert stitch_segments(segments[:1], results[:1]) == [(50, 0, 60), (100, 60, 0)]
+
+
+def test_pcm_conversion_handles_24_bit_stereo():
+    # Left and right of two frames: full scale negative and half scale positive
+    frames = bytes([0x00, 0x00, 0x80, 0x00, 0x00, 0x80, 0x00, 0x00, 0x40, 0x00, 0x00, 0x40])
+    assert np.allclose(_pcm_to_float(frames, 3, 2), [-1.0, 0.5])
+
+
+def test_transcription_finds_the_melody(tmp_path, melody_wav):
+    output = str(tmp_path / "melody.mid")
+    config = Config(str(tmp_path / "missing.json")).config
+    summary = transcribe_file(melody_wav, output, config, jobs=1)
+    assert summary["segments"] == 1
+    notes = read_notes(output)
+    played = [note for _, kind, note in notes if kind == "note_on"]
+    sung = [note for i, note in enumerate(played) if i == 0 or note != played[i - 1]]
+    assert sung == [57, 64, 60, 62]
+    assert summary["notes"] == len(played)
+    assert len(played) == sum(kind == "note_off" for _, kind, _ in notes)
+
+
+def test_segmented_transcription_matches_a_single_pass(tmp_path, melody_wav):
+    config = Config(str(tmp_path / "missing.json")).config
+    transcribe_file(melody_wav, str(tmp_path / "whole.mid"), config, jobs=1)
+    summary = transcribe_file(melody_wav, str(tmp_path / "split.mid"), config, jobs=1,
+                              segment_seconds=1.0)
+    assert summary["segments"] == 6
+    assert read_notes(str(tmp_path / "split.mid")) == read_notes(str(tmp_path / "whole.mid"))
+
+
+def test_process_pool_output_is_deterministic(tmp_path, melody_wav):
+    config = Config(str(tmp_path / "missing.json")).config
+    transcribe_file(melody_wav, str(tmp_path / "inline.mid"), config, jobs=1, segment_seconds=2.0)
+    transcribe_file(melody_wav, str(tmp_path / "pool.mid"), config, jobs=2, segment_seconds=2.0)
+    assert read_notes(str(tmp_path / "pool.mid")) == read_notes(str(tmp_path / "inline.mid"))
+
+
+def test_transcribe_command(tmp_path, app_config_file, melody_wav, capsys):
+    output = str(tmp_path / "cli.mid")
+    main(["transcribe", melody_wav, output, "--jobs", "1", "--config", app_config_file])
+    notes = read_notes(output)
+    assert f"{len(notes) // 2} notes: {output}" in capsys.readouterr().out
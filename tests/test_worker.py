@@ -0,0 +1,52 @@
+"""
+Unit tests for the shared-memory ring and the out-of-process analysis worker.
+"""
+import numpy as np
+
+from voicemidi.backend.audio.shared_ring_buffer import SharedRingBuffer
+from voicemidi.backend.core.worker import AnalysisWorker
+from voicemidi.backend.utils.config import Config
+
+
+def test_attached_ring_shares_samples_and_counters():
+    ring = SharedRingBuffer(capacity=8, max_read=4)
+    reader = SharedRingBuffer(capacity=8, max_read=4, name=ring.name, event=ring.event)
+    try:
+        ring.write(np.arange(4, dtype=np.float32))
+        assert reader.available() == 4
+        assert np.array_equal(reader.read(4), np.arange(4))
+        assert ring.read_position == 4
+
+        for i in range(3):
+            ring.write(np.full(4, i, dtype=np.float32))
+        assert np.all(reader.read(4) == 2)
+        assert ring.dropped_samples == 8
+    finally:
+        reader.close()
+        ring.close()
+    # Counters stay readable after the block is freed
+    assert ring.read_position == 16
+
+
+def test_worker_analyzes_blocks_from_shared_memory(tmp_path):
+    config = Config(str(tmp_path / "missing.json")).config
+    block_size = config["audio"]["block_size"]
+    t = np.arange(block_size * 8) / config["audio"]["sample_rate"]
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+    worker = AnalysisWorker(config)
+    worker.start()
+    try:
+        results = []
+        for block in tone.reshape(-1, block_size):
+            worker.ring_buffer.write(block)
+            assert worker.poll(timeout=30)
+            results.append(worker.receive())
+    finally:
+        worker.stop()
+
+    positions = [result[0] for result in results]
+    assert positions == list(range(0, len(tone), block_size))
+    notes_on = [result[2] for result in results if result[2]]
+    assert notes_on and all(note == 69 for note in notes_on)
+    assert not worker.is_alive()
@@ -7,8 +7,21 @@
 Version: 0.1.0
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 
-from voicemidi.backend import VoiceToMidi
+if TYPE_CHECKING:
+    from voicemidi.backend.core.voicemidi import VoiceToMidi
+
+__all__ = ["VoiceToMidi"]
+
 
-__all__ = ["VoiceToMidi"] 
\ No newline at end of file
+def __getattr__(name):
+    # VoiceToMidi pulls in the DSP stack, so it is imported on first use
+    if name == "VoiceToMidi":
+        value = importlib.import_module("voicemidi.backend.core.voicemidi").VoiceToMidi
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,13 +2,30 @@
 
 This package contains all the core logic for the Voice-to-MIDI converter,
 including audio processing, pitch detection, onset detection, and MIDI output.
+
+The exported classes are imported on first access, so that importing the
+package (for example to list devices) does not load librosa, scipy or
+numba.
 """
 
-from voicemidi.backend.core import VoiceToMidi
-from voicemidi.backend.audio import AudioInput
-from voicemidi.backend.pitch import PitchDetector
-from voicemidi.backend.onset import OnsetDetector
-from voicemidi.backend.midi import MidiOutput
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from voicemidi.backend.core import VoiceToMidi
+    from voicemidi.backend.audio import AudioInput
+    from voicemidi.backend.pitch import PitchDetector
+    from voicemidi.backend.onset import OnsetDetector
+    from voicemidi.backend.midi import MidiOutput
+
+# Exported name -> module that defines it
+_EXPORTS = {
+    "VoiceToMidi": "voicemidi.backend.core.voicemidi",
+    "AudioInput": "voicemidi.backend.audio.audio_input",
+    "PitchDetector": "voicemidi.backend.pitch.pitch_detector",
+    "OnsetDetector": "voicemidi.backend.onset.onset_detector",
+    "MidiOutput": "voicemidi.backend.midi.midi_output",
+}
 
 __all__ = [
     "VoiceToMidi",
@@ -16,4 +33,17 @@
     "PitchDetector", 
     "OnsetDetector",
     "MidiOutput",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,22 @@
+"""Shared signal analysis for Voice-to-MIDI application."""
+
+from voicemidi.backend.analysis.decimator import (
+    PolyphaseDecimator,
+    decimated_frame_size,
+    decimation_factor,
+)
+from voicemidi.backend.analysis.fft import FftContext, hann_window
+from voicemidi.backend.analysis.frontend import AnalysisFrame, SpectralFrontEnd
+from voicemidi.backend.analysis.window import SlidingWindow, analysis_window
+
+__all__ = [
+    "AnalysisFrame",
+    "FftContext",
+    "PolyphaseDecimator",
+    "SlidingWindow",
+    "SpectralFrontEnd",
+    "analysis_window",
+    "decimated_frame_size",
+    "decimation_factor",
+    "hann_window",
+]
@@ -0,0 +1,179 @@
+"""
+Cost of the NumPy and Numba paths of the hot DSP kernels.
+
+Run with ``python -m voicemidi.backend.analysis.benchmark``.
+"""
+import argparse
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from voicemidi.backend.analysis import kernels
+from voicemidi.backend.onset.functions import SpectralFlux
+from voicemidi.backend.pitch.benchmark import make_voice_tone
+from voicemidi.backend.pitch.yin import YinPitchEstimator
+
+# (label, sample rate, frame size): decimated pitch analysis at 44.1 kHz, then
+# full-rate analysis of a 1024 and a 2048-sample frame
+YIN_CASES = (
+    ("yin 11025/256", 11025, 256),
+    ("yin 44100/1024", 44100, 1024),
+    ("yin 44100/2048", 44100, 2048),
+)
+
+# (label, frames per call, rFFT bins)
+FLUX_CASES = (
+    ("flux 1x513", 1, 513),
+    ("flux 4x513", 4, 513),
+    ("flux 1x1025", 1, 1025),
+)
+
+
+def time_call(function: Callable[[], Any], calls: int = 2000, repeats: int = 5) -> float:
+    """
+    Time a function, taking the best of several runs to reduce scheduling noise.
+
+    Args:
+        function (Callable[[], Any]): Function to call
+        calls (int): Calls per run
+        repeats (int): Number of runs
+
+    Returns:
+        float: Microseconds per call in the fastest run
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, time.perf_counter() - started)
+    return best / calls * 1e6
+
+
+def yin_case(use_numba: bool, sample_rate: int, frame_size: int) -> Callable[[], Any]:
+    """Return a function estimating the pitch of one voice-like frame."""
+    estimator = YinPitchEstimator(sample_rate, frame_size, min_frequency=86.133,
+                                  max_frequency=1000, use_numba=use_numba)
+    frame = make_voice_tone(220.0, frame_size, sample_rate)
+    return lambda: estimator.estimate(frame)
+
+
+def flux_case(use_numba: bool, frames_per_block: int, n_bins: int) -> Callable[[], Any]:
+    """Return a function computing the spectral flux of one block of frames."""
+    function = SpectralFlux(frames_per_block, n_bins, use_numba=use_numba)
+    magnitude = np.abs(np.random.default_rng(0).standard_normal((frames_per_block, n_bins)))
+    out = np.zeros(frames_per_block, dtype=np.float64)
+    return lambda: function.compute(None, magnitude, out)
+
+
+def parallel_speedup(make_case: Callable[[], Callable[[], Any]], threads: int = 2,
+                     calls: int = 2000) -> float:
+    """
+    Measure how well a workload scales across threads.
+
+    Args:
+        make_case (Callable): Builds one independent workload per thread
+        threads (int): Number of threads
+        calls (int): Calls per thread
+
+    Returns:
+        float: Throughput with ``threads`` threads over single-thread
+            throughput; near 1 when the work holds the GIL
+    """
+    cases = [make_case() for _ in range(threads)]
+
+    def run(case):
+        for _ in range(calls):
+            case()
+
+    started = time.perf_counter()
+    run(cases[0])
+    single = time.perf_counter() - started
+
+    workers = [threading.Thread(target=run, args=(case,)) for case in cases]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    parallel = time.perf_counter() - started
+    return threads * single / parallel
+
+
+def benchmark_kernels(calls: int = 2000, threads: int = 2) -> List[Dict[str, Any]]:
+    """
+    Time every benchmark case on the NumPy path and, if available, the Numba path.
+
+    Args:
+        calls (int): Calls per timing run
+        threads (int): Threads for the parallel scaling measurement
+
+    Returns:
+        list: One dict per case with its label, microseconds per call for
+            each path (None when Numba is missing) and the parallel speedup
+            of each path
+    """
+    cases = [(label, yin_case, (rate, size)) for label, rate, size in YIN_CASES]
+    cases += [(label, flux_case, (frames, bins)) for label, frames, bins in FLUX_CASES]
+    paths = [False, True] if kernels.NUMBA_AVAILABLE else [False]
+
+    results = []
+    for label, make, args in cases:
+        result = {"case": label, "numpy_us": None, "numba_us": None,
+                  "numpy_parallel": None, "numba_parallel": None}
+        for use_numba in paths:
+            path = "numba" if use_numba else "numpy"
+            result[f"{path}_us"] = time_call(make(use_numba, *args), calls)
+            result[f"{path}_parallel"] = parallel_speedup(lambda: make(use_numba, *args),
+                                                          threads, calls)
+        results.append(result)
+    return results
+
+
+def format_results(results: Sequence[Dict[str, Any]], threads: int = 2) -> str:
+    """
+    Format kernel benchmark results as a text table.
+
+    Args:
+        results (Sequence[Dict[str, Any]]): Results from benchmark_kernels
+        threads (int): Thread count used for the parallel columns
+
+    Returns:
+        str: The table
+    """
+    def number(value, spec):
+        if value is None:
+            return "-".rjust(int(spec.split(".")[0]))
+        return format(value, spec)
+
+    lines = [f"{'case':<16} {'numpy us':>9} {'numba us':>9} {'speedup':>8} "
+             f"{f'numpy x{threads}t':>10} {f'numba x{threads}t':>10}"]
+    for result in results:
+        speedup = None
+        if result["numba_us"]:
+            speedup = result["numpy_us"] / result["numba_us"]
+        lines.append(
+            f"{result['case']:<16} {number(result['numpy_us'], '9.1f')} "
+            f"{number(result['numba_us'], '9.1f')} {number(speedup, '8.2f')} "
+            f"{number(result['numpy_parallel'], '10.2f')} "
+            f"{number(result['numba_parallel'], '10.2f')}"
+        )
+    if not kernels.NUMBA_AVAILABLE:
+        lines.append("numba is not installed; only the NumPy path was measured")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point of the kernel benchmark."""
+    parser = argparse.ArgumentParser(description="Compare the NumPy and Numba DSP kernels")
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per timing run")
+    parser.add_argument("--threads", type=int, default=2, help="Threads for the scaling columns")
+    args = parser.parse_args(argv)
+
+    print(format_results(benchmark_kernels(args.calls, args.threads), args.threads))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Polyphase decimation for running pitch analysis at a reduced sample rate.
+"""
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def decimation_factor(sample_rate, block_size, max_frequency, min_ratio=8.0, max_factor=16):
+    """
+    Pick the decimation factor for a pitch range.
+
+    The factor is the largest power of two that divides the block size,
+    does not exceed ``max_factor`` and keeps the reduced rate at least
+    ``min_ratio`` times ``max_frequency``. Below about 8 samples per
+    period of the highest note, the lag-domain estimators start to pick
+    the octave below. At 44.1 or 48 kHz with notes up to 1 kHz the factor
+    is 4; at 96 kHz it is 8, giving an analysis rate of 11-12 kHz
+    whatever the device runs at.
+
+    Args:
+        sample_rate (float): Device sample rate in Hz
+        block_size (int): Number of samples per block
+        max_frequency (float): Highest frequency to analyze in Hz
+        min_ratio (float): Minimum reduced rate as a multiple of max_frequency
+        max_factor (int): Largest factor to use
+
+    Returns:
+        int: Decimation factor, 1 when the rate cannot be reduced
+    """
+    factor = 1
+    while (factor * 2 <= max_factor and block_size % (factor * 2) == 0
+           and sample_rate / (factor * 2) >= min_ratio * max_frequency):
+        factor *= 2
+    return factor
+
+
+def decimated_frame_size(analysis_rate, output_size, min_frequency):
+    """
+    Frame length at the reduced rate that still fits two periods of the lowest note.
+
+    The length is rounded up to a power of two, which the FFT-based
+    estimators (and aubio's) need or run fastest with.
+
+    Args:
+        analysis_rate (float): Reduced sample rate in Hz
+        output_size (int): Decimated samples per block
+        min_frequency (float): Lowest frequency to analyze in Hz
+
+    Returns:
+        int: Frame length in decimated samples, at least one block
+    """
+    length = max(output_size, math.ceil(2 * analysis_rate / min_frequency - 1e-9))
+    return 1 << (length - 1).bit_length()
+
+
+class PolyphaseDecimator:
+    """
+    Streaming anti-aliased decimator with a sliding output frame.
+
+    A Kaiser-windowed sinc low-pass with its cutoff at the reduced
+    Nyquist frequency is evaluated only at the kept output positions,
+    i.e. as ``factor`` polyphase branches, so the cost is the filter
+    length per output sample rather than per input sample. The last
+    ``num_taps - 1`` input samples are kept between blocks, so the output
+    is continuous across block boundaries. The newest ``frame_size``
+    decimated samples are kept as the analysis frame, letting the pitch
+    frame span more than one block at the reduced rate.
+    """
+
+    def __init__(self, factor, block_size, frame_size=None, taps_per_phase=16, beta=8.0):
+        """
+        Initialize the decimator.
+
+        Args:
+            factor (int): Decimation factor; must divide block_size
+            block_size (int): Number of input samples per block
+            frame_size (int, optional): Number of decimated samples in the
+                output frame; defaults to one block's worth
+            taps_per_phase (int): Filter taps per polyphase branch
+            beta (float): Kaiser window shape (8 gives about 80 dB of
+                stopband attenuation)
+        """
+        if factor < 1 or block_size % factor != 0:
+            raise ValueError(f"Decimation factor {factor} must divide block_size {block_size}")
+
+        self.factor = factor
+        self.block_size = block_size
+        self.output_size = block_size // factor
+        self.frame_size = frame_size or self.output_size
+        if self.frame_size < self.output_size:
+            raise ValueError(
+                f"frame_size {self.frame_size} is shorter than one block ({self.output_size})"
+            )
+
+        # Low-pass at the reduced Nyquist frequency, reversed for the dot product
+        self.num_taps = factor * taps_per_phase
+        n = np.arange(self.num_taps) - (self.num_taps - 1) / 2
+        taps = np.sinc(n / factor) / factor * np.kaiser(self.num_taps, beta)
+        taps /= taps.sum()
+        self.taps = taps[::-1].copy()
+
+        # Input history followed by the new block; output positions are the
+        # ends of every factor-th window
+        self._carry = self.num_taps - 1
+        self._signal = np.zeros(self._carry + block_size, dtype=np.float64)
+        windows = sliding_window_view(self._signal, self.num_taps)
+        self._windows = windows[factor - 1::factor]
+        self._frame = np.zeros(self.frame_size, dtype=np.float32)
+        self._output = np.zeros(self.output_size, dtype=np.float64)
+
+    @property
+    def delay(self):
+        """Group delay of the filter in input samples."""
+        return (self.num_taps - 1) / 2
+
+    def reset(self):
+        """Clear the filter state and the output frame."""
+        self._signal.fill(0.0)
+        self._frame.fill(0.0)
+
+    def process(self, block):
+        """
+        Filter and decimate one block.
+
+        Args:
+            block (ndarray): The new block of ``block_size`` input samples
+
+        Returns:
+            ndarray: The newest ``frame_size`` decimated samples as float32
+                (an internal buffer that is overwritten by the next call)
+        """
+        signal = self._signal
+        signal[:self._carry] = signal[self.block_size:]
+        signal[self._carry:] = block[-self.block_size:]
+        np.dot(self._windows, self.taps, out=self._output)
+
+        frame = self._frame
+        frame[:-self.output_size] = frame[self.output_size:]
+        frame[-self.output_size:] = self._output
+        return frame
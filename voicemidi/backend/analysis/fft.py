@@ -0,0 +1,167 @@
+"""
+Cached FFT setup for the Voice-to-MIDI analysis code.
+"""
+import numpy as np
+
+
+def _numpy_fft_has_out():
+    """Check whether numpy.fft accepts ``out`` (NumPy 2.0 and later)."""
+    try:
+        np.fft.rfft(np.zeros(2), out=np.zeros(2, dtype=np.complex128))
+    except TypeError:
+        return False
+    return True
+
+
+# NumPy's FFT can write into a preallocated array; otherwise scipy.fft is used
+NUMPY_FFT_OUT = _numpy_fft_has_out()
+
+
+def hann_window(frame_size):
+    """
+    Periodic Hann window, as used by the front-end and onset engines.
+
+    Args:
+        frame_size (int): Window length in samples
+
+    Returns:
+        ndarray: The window as float64
+    """
+    n = np.arange(frame_size)
+    return 0.5 - 0.5 * np.cos(2 * np.pi * n / frame_size)
+
+
+class FftContext:
+    """
+    Real FFTs of a fixed size into preallocated buffers.
+
+    Built once per detector for its frame size, the context holds the
+    analysis window, the zero-padded input and the spectrum and inverse
+    buffers, so a steady stream of frames is transformed without
+    rebuilding windows or allocating arrays. By default the transforms
+    go through NumPy's FFT with ``out=``, which allocates nothing. With
+    ``workers`` set, or with NumPy older than 2.0, they go through
+    ``scipy.fft`` instead, with ``overwrite_x`` since the input buffer is
+    scratch space; its results are copied into the same buffers.
+    """
+
+    def __init__(self, frame_size, n_fft=None, window=None, n_frames=None, workers=None):
+        """
+        Initialize the FFT context.
+
+        Args:
+            frame_size (int): Number of samples per frame
+            n_fft (int, optional): Transform size, at least frame_size; the
+                input is zero-padded. Defaults to frame_size
+            window (str or ndarray, optional): "hann" for a periodic Hann
+                window, an array of frame_size weights, or None for none
+            n_frames (int, optional): Number of frames per batch; None for
+                single 1-D frames
+            workers (int, optional): scipy.fft worker threads across a batch
+                (-1 for all cores). Starting the threads costs more than a
+                few frames of a few thousand samples take to transform, so
+                by default NumPy transforms them on the calling thread
+        """
+        self.frame_size = frame_size
+        self.n_fft = n_fft or frame_size
+        if self.n_fft < frame_size:
+            raise ValueError(f"n_fft {self.n_fft} is shorter than frame_size {frame_size}")
+        self.n_bins = self.n_fft // 2 + 1
+        self.n_frames = n_frames
+        self.workers = workers
+
+        if isinstance(window, str):
+            if window != "hann":
+                raise ValueError(f"Unknown window '{window}'")
+            window = hann_window(frame_size)
+        self.window = None if window is None else np.asarray(window, dtype=np.float64)
+
+        batch = () if n_frames is None else (n_frames,)
+        self.input = np.zeros(batch + (self.n_fft,), dtype=np.float64)
+        self.spectrum = np.zeros(batch + (self.n_bins,), dtype=np.complex128)
+        self.power = np.zeros(batch + (self.n_bins,), dtype=np.float64)
+        self.inverse = np.zeros(batch + (self.n_fft,), dtype=np.float64)
+
+        self._scipy_fft = None
+        if workers is not None or not NUMPY_FFT_OUT:
+            import scipy.fft
+            self._scipy_fft = scipy.fft
+
+    def _load(self, frames):
+        """Copy (and window) frames into the head of the zero-padded input."""
+        if self.n_frames is None:
+            self._load_frame(self.input, frames)
+        else:
+            # Row by row: a batch of overlapping frames (a sliding window view)
+            # would otherwise be copied to a temporary first
+            for row, frame in zip(self.input, frames):
+                self._load_frame(row, frame)
+
+    def _load_frame(self, row, frame):
+        """Copy (and window) one frame into one row of the input."""
+        # Cast first: multiplying float32 samples straight into the float64
+        # input would make NumPy allocate a conversion buffer
+        head = row[:self.frame_size]
+        np.copyto(head, frame[-self.frame_size:], casting="unsafe")
+        if self.window is not None:
+            head *= self.window
+
+    def rfft(self, frames):
+        """
+        Transform frames into ``spectrum``.
+
+        Args:
+            frames (ndarray): A frame (or a batch of frames, one per row) of
+                at least frame_size samples; the newest frame_size are used
+
+        Returns:
+            ndarray: The spectrum buffer (overwritten by the next call)
+        """
+        self._load(frames)
+        if self._scipy_fft is None:
+            np.fft.rfft(self.input, axis=-1, out=self.spectrum)
+        else:
+            self.spectrum[...] = self._scipy_fft.rfft(self.input, axis=-1, workers=self.workers,
+                                                      overwrite_x=True)
+            # overwrite_x may have clobbered the zero padding
+            self.input[..., self.frame_size:] = 0.0
+        return self.spectrum
+
+    def irfft(self, spectrum):
+        """
+        Inverse transform a spectrum into ``inverse``.
+
+        Args:
+            spectrum (ndarray): Spectrum of n_bins bins (or a batch of them)
+
+        Returns:
+            ndarray: The inverse buffer of n_fft samples (overwritten by the next call)
+        """
+        if self._scipy_fft is None:
+            np.fft.irfft(spectrum, self.n_fft, axis=-1, out=self.inverse)
+        else:
+            self.inverse[...] = self._scipy_fft.irfft(spectrum, self.n_fft, axis=-1,
+                                                      workers=self.workers)
+        return self.inverse
+
+    def autocorrelation(self, frames):
+        """
+        Autocorrelation of frames via their power spectrum.
+
+        With ``n_fft`` at least twice the frame size, the result is the
+        linear autocorrelation; the window, if any, is applied first.
+
+        Args:
+            frames (ndarray): A frame (or batch) of at least frame_size samples
+
+        Returns:
+            ndarray: The inverse buffer holding lags 0..n_fft-1 (overwritten
+                by the next call)
+        """
+        spectrum = self.rfft(frames)
+        power = self.power
+        np.multiply(spectrum.real, spectrum.real, out=power)
+        power += np.square(spectrum.imag, out=self.inverse[..., :self.n_bins])
+        self.spectrum.real = power
+        self.spectrum.imag = 0.0
+        return self.irfft(self.spectrum)
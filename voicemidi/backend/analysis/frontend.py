@@ -0,0 +1,105 @@
+"""
+Shared spectral front-end for the Voice-to-MIDI application.
+"""
+import numpy as np
+
+from voicemidi.backend.analysis.fft import FftContext
+
+
+class AnalysisFrame:
+    """
+    Analysis results for one audio block, shared by all detectors.
+
+    Attributes:
+        samples (ndarray): Block samples as float32
+        spectrum (ndarray): rFFT of the Hann-windowed block
+        magnitude (ndarray): Magnitude of ``spectrum``
+        autocorrelation (ndarray): Linear autocorrelation of the block for
+            lags 0..frame_size-1
+        rms (float): Root mean square level of the block
+        db (float): RMS level in dB (-100 for digital silence)
+        mean_square (float): Mean square level of the block
+    """
+
+    def __init__(self, frame_size):
+        """
+        Initialize an empty analysis frame.
+
+        Args:
+            frame_size (int): Number of samples per block
+        """
+        self.samples = np.zeros(frame_size, dtype=np.float32)
+        self.spectrum = np.zeros(frame_size // 2 + 1, dtype=np.complex128)
+        self.magnitude = np.zeros(frame_size // 2 + 1, dtype=np.float64)
+        self.autocorrelation = np.zeros(frame_size, dtype=np.float64)
+        self.rms = 0.0
+        self.db = -100.0
+        self.mean_square = 0.0
+
+
+class SpectralFrontEnd:
+    """
+    Computes the per-block analysis that pitch and onset detection share.
+
+    Each block is cast, measured, windowed and transformed exactly once;
+    the detectors then read the results from the returned AnalysisFrame
+    instead of repeating the work. The frame and its arrays are reused,
+    so results are only valid until the next call to ``analyze``.
+    """
+
+    def __init__(self, sample_rate=44100, frame_size=1024, autocorrelation=True):
+        """
+        Initialize the front-end.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Number of samples per block
+            autocorrelation (bool): Whether to compute the block's
+                autocorrelation; not needed when pitch runs on a decimated
+                signal, and then left at zero
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+
+        # Periodic Hann window for the magnitude spectrum
+        self._spectrum_fft = FftContext(frame_size, window="hann")
+        self.window = self._spectrum_fft.window
+
+        # Zero-padded FFT size for a linear (non-circular) autocorrelation
+        self.n_fft = 1 << int(np.ceil(np.log2(2 * frame_size)))
+        self._autocorrelation_fft = FftContext(frame_size, self.n_fft) if autocorrelation else None
+
+        # The frame's spectrum and autocorrelation are the FFT buffers themselves
+        self.frame = AnalysisFrame(frame_size)
+        self.frame.spectrum = self._spectrum_fft.spectrum
+        if autocorrelation:
+            self.frame.autocorrelation = self._autocorrelation_fft.inverse[:frame_size]
+
+    def analyze(self, audio_data):
+        """
+        Analyze one block of audio.
+
+        Args:
+            audio_data (ndarray): Audio block of at least ``frame_size`` samples;
+                only the most recent ``frame_size`` samples are used
+
+        Returns:
+            AnalysisFrame: The shared analysis of the block
+        """
+        frame = self.frame
+        samples = frame.samples
+        np.copyto(samples, audio_data[-self.frame_size:], casting="unsafe")
+
+        # Level
+        frame.mean_square = float(np.dot(samples, samples)) / self.frame_size
+        frame.rms = float(np.sqrt(frame.mean_square))
+        frame.db = 20 * np.log10(frame.rms) if frame.rms > 0 else -100.0
+
+        # Windowed spectrum
+        self._spectrum_fft.rfft(samples)
+        np.abs(frame.spectrum, out=frame.magnitude)
+
+        # Autocorrelation from the zero-padded power spectrum
+        if self._autocorrelation_fft is not None:
+            self._autocorrelation_fft.autocorrelation(samples)
+        return frame
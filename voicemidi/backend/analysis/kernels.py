@@ -0,0 +1,223 @@
+"""
+Optional Numba-compiled DSP kernels for the Voice-to-MIDI application.
+
+The hot loops of the YIN difference function, the short-lag
+autocorrelation, the narrowed difference of pitch tracking and the
+rectified spectral flux are written here as plain loops. When Numba is
+installed they are compiled to machine code that runs without the GIL,
+so analysis on one thread does not hold up the audio callback or MIDI
+threads; the estimators and onset functions that use them keep their
+NumPy implementations as the fallback.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function as Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+
+
+def resolve_numba(use_numba=None):
+    """
+    Decide whether to use the compiled kernels.
+
+    Args:
+        use_numba (bool, optional): True to require them, False for the
+            NumPy path, None to use them whenever Numba is installed
+
+    Returns:
+        bool: Whether the compiled kernels should be used
+    """
+    if use_numba is None:
+        return NUMBA_AVAILABLE
+    if use_numba and not NUMBA_AVAILABLE:
+        raise ValueError("Numba kernels requested but numba is not installed")
+    return bool(use_numba)
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def autocorrelation(x, out):
+    """
+    Linear autocorrelation of ``x`` for lags 0..len(out)-1, computed directly.
+
+    Faster than the zero-padded FFT for the short frames and lag ranges of
+    decimated pitch analysis.
+
+    Args:
+        x (ndarray): Frame samples
+        out (ndarray): Receives the autocorrelation
+    """
+    n = x.shape[0]
+    for tau in range(out.shape[0]):
+        acc = 0.0
+        for j in range(n - tau):
+            acc += x[j] * x[j + tau]
+        out[tau] = acc
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def yin_difference(x, autocorrelation, diff, cmndf):
+    """
+    YIN difference and cumulative mean normalized difference in one pass.
+
+    Args:
+        x (ndarray): Frame samples
+        autocorrelation (ndarray): Linear autocorrelation of ``x`` for at
+            least len(diff) lags
+        diff (ndarray): Receives the difference function, normalized per sample
+        cmndf (ndarray): Receives the CMNDF
+    """
+    n = x.shape[0]
+    total = 0.0
+    for j in range(n):
+        total += x[j] * x[j]
+
+    # Energies of the windows before and after the lag
+    head = total
+    tail = total
+    running = 0.0
+    for tau in range(diff.shape[0]):
+        if tau > 0:
+            head -= x[n - tau] * x[n - tau]
+            tail -= x[tau - 1] * x[tau - 1]
+        d = (head + tail - 2.0 * autocorrelation[tau]) / (n - tau)
+        if d < 0.0:
+            d = 0.0
+        diff[tau] = d
+        if tau == 0:
+            cmndf[0] = 1.0
+        else:
+            running += d
+            cmndf[tau] = d * tau / running if running > 0.0 else 1.0
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def normalized_difference(x, n, first_lag, out):
+    """
+    Difference function over a fixed window, normalized by the energies compared.
+
+    Args:
+        x (ndarray): Frame samples, at least first_lag + len(out) - 1 + n
+        n (int): Integration window in samples
+        first_lag (int): Lag of ``out[0]``
+        out (ndarray): Receives ``d(tau) / (e_0 + e_tau)`` for consecutive lags
+    """
+    e0 = 0.0
+    energy = 0.0
+    for j in range(n):
+        e0 += x[j] * x[j]
+        energy += x[j + first_lag] * x[j + first_lag]
+    for k in range(out.shape[0]):
+        tau = first_lag + k
+        if k > 0:
+            energy += x[tau + n - 1] * x[tau + n - 1] - x[tau - 1] * x[tau - 1]
+        acc = 0.0
+        for j in range(n):
+            acc += x[j] * x[j + tau]
+        total = e0 + energy
+        out[k] = 1.0 - 2.0 * acc / total if total > 0.0 else 1.0
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def tracked_period(x, n, lo, hi, tau_min, octave_threshold, difference):
+    """
+    Narrowed period search of pitch tracking in one pass.
+
+    Args:
+        x (ndarray): Frame samples
+        n (int): Integration window in samples
+        lo (int): First lag of the search window
+        hi (int): Last lag of the search window
+        tau_min (int): Smallest detectable lag
+        octave_threshold (float): Normalized difference at half the lag below
+            which the pitch counts as an octave higher
+        difference (ndarray): Scratch buffer of at least hi - lo + 3 values
+
+    Returns:
+        tuple: (lag with sub-sample precision, normalized difference at it),
+            or (0, 1) when the caller should fall back to a full search
+    """
+    width = hi - lo + 3
+    normalized_difference(x, n, lo - 1, difference[:width])
+
+    best = 1
+    for k in range(2, width - 1):
+        if difference[k] < difference[best]:
+            best = k
+    if best == 1 or best == width - 2:
+        return 0.0, 1.0
+
+    # An octave jump up is as periodic at half the lag
+    half = (lo - 1 + best) // 2
+    if half >= tau_min:
+        e0 = 0.0
+        energy = 0.0
+        acc = 0.0
+        for j in range(n):
+            e0 += x[j] * x[j]
+            energy += x[j + half] * x[j + half]
+            acc += x[j] * x[j + half]
+        if e0 + energy > 0.0 and 1.0 - 2.0 * acc / (e0 + energy) < octave_threshold:
+            return 0.0, 1.0
+
+    a = difference[best - 1]
+    b = difference[best]
+    c = difference[best + 1]
+    denominator = a - 2.0 * b + c
+    shift = 0.5 * (a - c) / denominator if denominator > 0.0 else 0.0
+    if abs(shift) > 1.0:
+        shift = 0.0
+    return lo - 1 + best + shift, b
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def rectified_flux(log_spectra, out):
+    """
+    Half-wave rectified rise of each frame's log magnitudes over the frame before.
+
+    Args:
+        log_spectra (ndarray): Log-compressed magnitudes, the previous
+            call's last frame in row 0 followed by the new frames; row 0 is
+            updated to the last new frame
+        out (ndarray): Receives one flux value per new frame
+    """
+    n_rows, n_bins = log_spectra.shape
+    for f in range(1, n_rows):
+        acc = 0.0
+        for k in range(n_bins):
+            rise = log_spectra[f, k] - log_spectra[f - 1, k]
+            if rise > 0.0:
+                acc += rise
+        out[f - 1] = acc
+    for k in range(n_bins):
+        log_spectra[0, k] = log_spectra[n_rows - 1, k]
+
+
+_compiled = False
+
+
+def warm_up():
+    """
+    Compile (or load from the cache) every kernel.
+
+    Called when an estimator or onset function that uses the kernels is
+    built, so the first audio block does not pay for compilation.
+    """
+    global _compiled
+    if not NUMBA_AVAILABLE or _compiled:
+        return
+    x = np.zeros(8, dtype=np.float64)
+    lags = np.zeros(4, dtype=np.float64)
+    autocorrelation(x, lags)
+    yin_difference(x, lags, np.zeros(4, dtype=np.float64), np.zeros(4, dtype=np.float64))
+    normalized_difference(x, 4, 1, np.zeros(3, dtype=np.float64))
+    tracked_period(x, 2, 2, 4, 2, 0.2, np.zeros(8, dtype=np.float64))
+    rectified_flux(np.zeros((2, 5), dtype=np.float64), np.zeros(1, dtype=np.float64))
+    _compiled = True
@@ -0,0 +1,79 @@
+"""
+Sliding analysis window for the Voice-to-MIDI application.
+"""
+import numpy as np
+
+
+class SlidingWindow:
+    """
+    Fixed-length analysis frame advanced by a fixed hop.
+
+    Decouples the analysis frame from the device block size: each call to
+    ``push`` shifts the newest ``hop_length`` samples into a frame of
+    ``frame_length`` samples, so a long frame (enough periods of a low
+    note) can still be analyzed every few milliseconds. The frame is
+    preallocated and shifted in place.
+    """
+
+    def __init__(self, frame_length=1024, hop_length=1024):
+        """
+        Initialize the window.
+
+        Args:
+            frame_length (int): Number of samples in the analysis frame
+            hop_length (int): Number of new samples per frame; at most frame_length
+        """
+        if not 0 < hop_length <= frame_length:
+            raise ValueError(
+                f"hop_length {hop_length} must be between 1 and frame_length {frame_length}"
+            )
+
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self._frame = np.zeros(frame_length, dtype=np.float32)
+
+    def reset(self):
+        """Clear the frame."""
+        self._frame.fill(0.0)
+
+    def push(self, hop):
+        """
+        Shift one hop of new samples into the frame.
+
+        Args:
+            hop (ndarray): At least ``hop_length`` samples; the newest
+                ``hop_length`` are used
+
+        Returns:
+            ndarray: The frame as float32 (an internal buffer that is
+                overwritten by the next call)
+        """
+        frame = self._frame
+        n = self.hop_length
+        if n < self.frame_length:
+            frame[:-n] = frame[n:]
+        frame[-n:] = hop[-n:]
+        return frame
+
+
+def analysis_window(audio_config):
+    """
+    Resolve the analysis frame and hop lengths from the audio settings.
+
+    ``frame_length`` and ``hop_length`` default to the device block size,
+    which analyzes each block once, as before they existed.
+
+    Args:
+        audio_config (dict): The ``audio`` configuration section
+
+    Returns:
+        tuple: (frame_length, hop_length) in samples
+    """
+    block_size = audio_config["block_size"]
+    frame_length = audio_config.get("frame_length") or block_size
+    hop_length = audio_config.get("hop_length") or min(block_size, frame_length)
+    if not 0 < hop_length <= frame_length:
+        raise ValueError(
+            f"hop_length {hop_length} must be between 1 and frame_length {frame_length}"
+        )
+    return frame_length, hop_length
@@ -1,5 +1,23 @@
 """Audio input handling for Voice-to-MIDI application."""
 
 from voicemidi.backend.audio.audio_input import AudioInput
+from voicemidi.backend.audio.ring_buffer import RingBuffer
+from voicemidi.backend.audio.shared_ring_buffer import SharedRingBuffer
+from voicemidi.backend.audio.sources import (
+    AudioSource,
+    FileSource,
+    ReplaySource,
+    SoundDeviceSource,
+    SyntheticSource,
+)
 
-__all__ = ["AudioInput"] 
\ No newline at end of file
+__all__ = [
+    "AudioInput",
+    "AudioSource",
+    "FileSource",
+    "ReplaySource",
+    "RingBuffer",
+    "SharedRingBuffer",
+    "SoundDeviceSource",
+    "SyntheticSource",
+] 
\ No newline at end of file
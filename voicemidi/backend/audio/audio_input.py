@@ -1,19 +1,42 @@
 import numpy as np
-import sounddevice as sd
 import threading
-import queue
 import logging
-from typing import List, Dict, Any, Optional
+from time import perf_counter
+from typing import Callable, List, Dict, Any, Optional, Tuple
+
+from voicemidi.backend.audio.ring_buffer import RingBuffer
+from voicemidi.backend.audio.sources import AudioSource, SoundDeviceSource
+
+# PortAudio callback status flags counted by AudioInput
+CALLBACK_STATUS_FLAGS = (
+    "input_underflow",
+    "input_overflow",
+    "output_underflow",
+    "output_overflow",
+    "priming_output",
+)
+
+# Consumer of a complete block and its timing, as returned by AudioInput.lookup_timing
+BlockHandler = Callable[[np.ndarray, Optional[Tuple[float, float]]], None]
 
 class AudioInput:
     """
     Handles real-time audio input from the microphone.
     
     This class initializes an audio stream with the specified parameters
-    and provides methods to access the audio data in real-time.
+    and provides methods to access the audio data in real-time. Captured
+    samples go into a preallocated lock-free ring buffer, so the audio
+    callback never allocates and at most ``buffer_blocks`` blocks of audio
+    are ever buffered.
+    
+    The stream comes from an AudioSource: the sound card by default, or a
+    file or synthetic source (see ``voicemidi.backend.audio.sources``)
+    that replays audio through the same callback without hardware.
     """
     
-    def __init__(self, sample_rate: int = 44100, block_size: int = 1024, channels: int = 1, device: Optional[int] = None):
+    def __init__(self, sample_rate: int = 44100, block_size: int = 1024, channels: int = 1,
+                 device: Optional[int] = None, buffer_blocks: int = 4,
+                 hop_length: Optional[int] = None, source: Optional[AudioSource] = None):
         """
         Initialize the audio input handler.
         
@@ -22,17 +45,65 @@ def __init__(self, sample_rate: int = 44100, block_size: int = 1024, channels: i
             block_size (int): Number of frames per block
             channels (int): Number of audio channels (1 for mono, 2 for stereo)
             device (int, optional): Audio device index. If None, uses default.
+            buffer_blocks (int): Ring buffer capacity in blocks; bounds the
+                buffering latency when processing falls behind
+            hop_length (int, optional): Number of samples handed to consumers
+                at a time, independent of the device block; defaults to
+                block_size
+            source (AudioSource, optional): Where the audio comes from; the
+                sound card selected by ``device`` by default
         """
         self.sample_rate = sample_rate
         self.block_size = block_size
         self.channels = channels
         self.device = device
-        self.audio_queue = queue.Queue()
+        self.source = source or SoundDeviceSource(device)
+        self.hop_length = hop_length or block_size
+        read_size = max(block_size, self.hop_length)
+        self.ring_buffer = RingBuffer(max(2, buffer_blocks) * read_size, read_size)
+        self._mono = np.zeros(block_size, dtype=np.float32)  # Downmix scratch for the callback
+        
+        self._init_timing_slots()
+        self.last_block_timing: Optional[Tuple[float, float]] = None
+        
+        # Optional consumer run on the audio thread for every complete block
+        self.block_handler: Optional[BlockHandler] = None
         self.stream = None
         self.is_running = False
         self.thread = None
         self.logger = logging.getLogger("VoiceMIDI.Audio")
         
+        # Callback accounting, updated from the audio thread
+        self.callback_count = 0
+        self.status_counts = {flag: 0 for flag in CALLBACK_STATUS_FLAGS}
+        
+    def _init_timing_slots(self) -> None:
+        """Allocate per-callback timestamps for every block the ring can hold."""
+        # Indexed by callback number modulo the slot count
+        n_slots = self.ring_buffer.capacity // self.block_size + 2
+        self._slot_start = np.full(n_slots, -1, dtype=np.int64)  # First sample position
+        self._slot_frames = np.zeros(n_slots, dtype=np.int64)
+        self._slot_capture = np.zeros(n_slots, dtype=np.float64)  # ADC-to-callback latency (s)
+        self._slot_callback = np.zeros(n_slots, dtype=np.float64)  # perf_counter() at callback
+    
+    def set_ring_buffer(self, ring_buffer: RingBuffer) -> None:
+        """
+        Capture into a different ring, e.g. a SharedRingBuffer read by another process.
+        
+        Must be called while the stream is stopped.
+        
+        Args:
+            ring_buffer (RingBuffer): Ring holding at least two blocks and
+                allowing reads of a whole block or hop
+        """
+        read_size = max(self.block_size, self.hop_length)
+        if ring_buffer.max_read < read_size:
+            raise ValueError(
+                f"Ring reads of {ring_buffer.max_read} samples cannot hold a block of {read_size}"
+            )
+        self.ring_buffer = ring_buffer
+        self._init_timing_slots()
+    
     def audio_callback(self, indata, frames, time, status):
         """
         Callback function for the audio stream.
@@ -46,25 +117,58 @@ def audio_callback(self, indata, frames, time, status):
             time (CData): Timestamps
             status (CallbackFlags): Status flags
         """
+        # Timestamp the block before publishing it; inputBufferAdcTime and
+        # currentTime share the stream clock, perf_counter() is our clock
+        slot = self.callback_count % len(self._slot_start)
+        self._slot_callback[slot] = perf_counter()
+        self._slot_start[slot] = self.ring_buffer.write_position
+        self._slot_frames[slot] = frames
+        capture = 0.0
+        if time is not None and time.inputBufferAdcTime > 0:
+            capture = max(0.0, time.currentTime - time.inputBufferAdcTime)
+        self._slot_capture[slot] = capture
+        
+        self.callback_count += 1
         if status:
+            for flag in CALLBACK_STATUS_FLAGS:
+                if getattr(status, flag, False):
+                    self.status_counts[flag] += 1
             self.logger.warning(f"Audio callback status: {status}")
         
-        # Convert to mono if needed
+        # Write straight into the ring, downmixing in place if needed
         if self.channels > 1:
-            audio_data = np.mean(indata, axis=1)
+            if frames > len(self._mono):
+                self._mono = np.zeros(frames, dtype=np.float32)
+            mono = self._mono[:frames]
+            np.mean(indata[:frames], axis=1, out=mono)
+            self.ring_buffer.write(mono)
         else:
-            audio_data = indata.copy().flatten()
-        
-        # Put the audio data in the queue
-        try:
-            self.audio_queue.put(audio_data, block=False)
-        except queue.Full:
-            # Queue is full, discard oldest data
-            try:
-                self.audio_queue.get_nowait()
-                self.audio_queue.put(audio_data, block=False)
-            except queue.Empty:
-                pass
+            self.ring_buffer.write(indata[:frames, 0])
+        
+        # Process-in-callback mode: hand complete hops over right away
+        if self.block_handler is not None:
+            block = self._next_block()
+            while block is not None:
+                try:
+                    self.block_handler(block, self.last_block_timing)
+                except Exception as e:
+                    self.logger.error(f"Error in block handler: {e}")
+                block = self._next_block()
+    
+    def set_block_handler(self, handler: Optional[BlockHandler]) -> None:
+        """
+        Process blocks directly on the audio thread.
+        
+        When a handler is set, the audio callback passes every complete hop
+        and its timing (see get_block_timing()) to it as soon as the hop is
+        captured, instead of leaving it for get_audio_block(). The handler must
+        finish well within one block period or the stream will overflow.
+        
+        Args:
+            handler (callable, optional): Function taking (block, timing), or
+                None to hand blocks to get_audio_block() again
+        """
+        self.block_handler = handler
     
     def start(self) -> None:
         """Start the audio input stream."""
@@ -72,15 +176,10 @@ def start(self) -> None:
             return
             
         self.is_running = True
+        self.ring_buffer.clear()
         
         # Create and start the audio stream
-        self.stream = sd.InputStream(
-            samplerate=self.sample_rate,
-            blocksize=self.block_size,
-            channels=self.channels,
-            callback=self.audio_callback,
-            device=self.device
-        )
+        self.stream = self.source.open(self)
         self.stream.start()
         
         self.logger.info(f"Audio input started: {self.sample_rate}Hz, {self.block_size} frames per block")
@@ -101,18 +200,90 @@ def stop(self) -> None:
     
     def get_audio_block(self, timeout: float = 0.1):
         """
-        Get the next block of audio data from the queue.
+        Get the next hop of audio data from the ring buffer.
+        
+        Sleeps on the ring's wake-up event, so the caller wakes as soon as
+        the audio callback has completed a hop rather than polling. A hop is
+        ``hop_length`` samples, one device block unless configured otherwise.
         
         Args:
-            timeout (float): Timeout in seconds for queue.get()
+            timeout (float): Maximum time in seconds to wait for a hop
             
         Returns:
-            ndarray: Audio data block or None if timeout occurs
+            ndarray: Zero-copy view of the next hop (valid until the next
+                block has been captured), or None if timeout occurs
         """
-        try:
-            return self.audio_queue.get(timeout=timeout)
-        except queue.Empty:
+        if not self.ring_buffer.wait(self.hop_length, timeout):
             return None
+        return self._next_block()
+    
+    def _next_block(self) -> Optional[np.ndarray]:
+        """Read the next complete hop from the ring and look up its timing."""
+        block = self.ring_buffer.read(self.hop_length)
+        if block is not None:
+            # The callback that wrote the hop's last sample completed it
+            self.last_block_timing = self.lookup_timing(self.ring_buffer.read_position - 1)
+        return block
+    
+    def lookup_timing(self, position: int) -> Optional[Tuple[float, float]]:
+        """
+        Find the capture timing of the callback that wrote a sample.
+        
+        Args:
+            position (int): Absolute sample position in the ring
+            
+        Returns:
+            tuple: (ADC-to-callback latency in seconds, perf_counter() time of
+                the callback), or None if the callback is no longer tracked
+        """
+        starts = self._slot_start
+        slot = (position // self.block_size) % len(starts)
+        if not (starts[slot] <= position < starts[slot] + self._slot_frames[slot]):
+            # Callbacks with irregular frame counts: search all slots
+            matches = np.flatnonzero((starts <= position) & (position < starts + self._slot_frames))
+            if len(matches) == 0:
+                return None
+            slot = matches[0]
+        return float(self._slot_capture[slot]), float(self._slot_callback[slot])
+    
+    def get_block_timing(self) -> Optional[Tuple[float, float]]:
+        """
+        Get the capture timing of the hop last returned by get_audio_block().
+        
+        Returns:
+            tuple: (ADC-to-callback latency in seconds, perf_counter() time of
+                the callback that completed the hop), or None if unknown
+        """
+        return self.last_block_timing
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get capture accounting statistics.
+        
+        Device-side problems show up as callback status flags (for example
+        ``input_overflow``), while a consumer that cannot keep up shows up as
+        dropped blocks, a high queue depth and a growing consumer lag.
+        
+        Returns:
+            Dict[str, Any]: Capture statistics
+        """
+        ring = self.ring_buffer
+        return {
+            "callbacks": self.callback_count,
+            "input_overflows": self.status_counts["input_overflow"],
+            "status_flags": dict(self.status_counts),
+            "queue_depth_blocks": ring.available() / self.block_size,
+            "queue_high_water_blocks": ring.high_water / self.block_size,
+            "queue_capacity_blocks": ring.capacity / self.block_size,
+            "blocks_dropped": ring.dropped_samples / self.block_size,
+            "consumer_lag_samples": ring.available(),
+        }
+    
+    def reset_stats(self) -> None:
+        """Reset the capture accounting statistics."""
+        self.callback_count = 0
+        self.status_counts = {flag: 0 for flag in CALLBACK_STATUS_FLAGS}
+        self.ring_buffer.reset_stats()
     
     def get_devices(self) -> List[Dict[str, Any]]:
         """
@@ -121,6 +292,7 @@ def get_devices(self) -> List[Dict[str, Any]]:
         Returns:
             List[Dict[str, Any]]: Audio devices information
         """
+        import sounddevice as sd
         return sd.query_devices()
     
     def __del__(self) -> None:
@@ -0,0 +1,181 @@
+"""
+Lock-free single-producer/single-consumer sample ring for the Voice-to-MIDI application.
+"""
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring buffer of float32 samples.
+
+    One producer thread (the audio callback) writes samples in place and
+    one consumer thread reads them back as zero-copy views. The producer
+    only ever advances the write counter and the consumer only the read
+    counter, so the data path needs no lock. The first ``max_read``
+    samples are mirrored past the end of the storage, which keeps every
+    read contiguous even when it wraps around.
+
+    The producer never blocks: when the consumer falls more than
+    ``capacity`` samples behind, the oldest samples are overwritten and
+    the consumer skips ahead to the newest data on its next read, so
+    ``capacity`` bounds the buffering latency and memory never grows.
+    """
+
+    def __init__(self, capacity: int, max_read: int):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity (int): Number of samples the ring holds
+            max_read (int): Largest number of samples returned by one read
+        """
+        if max_read <= 0 or capacity < 2 * max_read:
+            raise ValueError(f"capacity ({capacity}) must be at least twice max_read ({max_read})")
+
+        self.capacity = capacity
+        self.max_read = max_read
+        self._buffer = self._allocate(capacity + max_read)
+        self._init_counters()
+
+        # Wake-up signal for a waiting consumer (not part of the data path)
+        self._data_ready = self._create_event()
+
+    def _allocate(self, size: int) -> np.ndarray:
+        """Allocate the sample storage, including the mirror region."""
+        return np.zeros(size, dtype=np.float32)
+
+    def _init_counters(self) -> None:
+        """Start the counters and statistics at zero."""
+        # Monotonic sample counters; each is written by one side only
+        self._write_count = 0
+        self._read_count = 0
+
+        # Samples the consumer had to skip because they were overwritten
+        self.dropped_samples = 0
+
+        # Largest number of pending samples seen right after a write
+        self.high_water = 0
+
+    def _create_event(self):
+        """Create the consumer wake-up event."""
+        return threading.Event()
+
+    @property
+    def write_position(self) -> int:
+        """Total number of samples written since creation."""
+        return self._write_count
+
+    @property
+    def read_position(self) -> int:
+        """Total number of samples consumed (read or skipped) since creation."""
+        return self._read_count
+
+    def available(self) -> int:
+        """
+        Get the number of samples written but not yet read.
+
+        Returns:
+            int: Pending sample count (may exceed capacity if data was overwritten)
+        """
+        return self._write_count - self._read_count
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        Write samples into the ring (producer side).
+
+        Args:
+            samples (ndarray): 1-D samples; converted to float32 while copying
+        """
+        n = len(samples)
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            self._write_count += n - self.capacity
+            n = self.capacity
+
+        start = self._write_count % self.capacity
+        first = min(n, self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        if first < n:
+            self._buffer[:n - first] = samples[first:]
+
+        # Keep the mirror of the head in sync for wrap-free reads
+        self._mirror(start, start + first)
+        if first < n:
+            self._mirror(0, n - first)
+
+        # Publish only after the data is in place
+        self._write_count += n
+        pending = self._write_count - self._read_count
+        if pending > self.high_water:
+            self.high_water = pending
+        self._data_ready.set()
+
+    def _mirror(self, start: int, end: int) -> None:
+        """Copy the written range's overlap with the head into the mirror region."""
+        end = min(end, self.max_read)
+        if start < end:
+            self._buffer[self.capacity + start:self.capacity + end] = self._buffer[start:end]
+
+    def read(self, n: int) -> Optional[np.ndarray]:
+        """
+        Read the next ``n`` samples (consumer side).
+
+        Args:
+            n (int): Number of samples, at most ``max_read``
+
+        Returns:
+            ndarray: A view into the ring, valid until the producer has written
+                at least another ``n`` samples, or None if not enough data is pending
+        """
+        if n > self.max_read:
+            raise ValueError(f"Cannot read {n} samples, max_read is {self.max_read}")
+
+        write_count = self._write_count
+        pending = write_count - self._read_count
+        if pending > self.capacity - n:
+            # Fallen behind: skip the samples that are (about to be) overwritten
+            skip = pending - (self.capacity - n)
+            self._read_count += skip
+            self.dropped_samples += skip
+            pending -= skip
+        if pending < n:
+            return None
+
+        start = self._read_count % self.capacity
+        self._read_count += n
+        return self._buffer[start:start + n]
+
+    def wait(self, n: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until at least ``n`` samples are pending.
+
+        Args:
+            n (int): Number of samples to wait for
+            timeout (float, optional): Maximum time to wait in seconds
+
+        Returns:
+            bool: True if the samples are available, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.available() < n:
+            self._data_ready.clear()
+            if self.available() >= n:
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._data_ready.wait(remaining)
+        return True
+
+    def reset_stats(self) -> None:
+        """Reset the drop counter and the high-water mark."""
+        self.dropped_samples = 0
+        self.high_water = self.available()
+
+    def clear(self) -> None:
+        """Discard all pending samples (consumer side)."""
+        self._read_count = self._write_count
@@ -0,0 +1,127 @@
+"""
+Shared-memory sample ring for handing audio to another process.
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from voicemidi.backend.audio.ring_buffer import RingBuffer
+
+# Counter slots at the start of the shared block
+_WRITE, _READ, _DROPPED, _HIGH_WATER = range(4)
+
+# Bytes reserved for the counters; keeps the samples on their own cache lines
+_HEADER_BYTES = 64
+
+
+class SharedRingBuffer(RingBuffer):
+    """
+    RingBuffer whose samples and counters live in shared memory.
+
+    The creating process (the audio callback side) writes and another
+    process attaches by name and reads, with the same lock-free
+    single-producer/single-consumer protocol as RingBuffer: the producer
+    only advances the write counter and the consumer only the read
+    counter. The wake-up event must be a ``multiprocessing`` event shared
+    by both processes.
+    """
+
+    def __init__(self, capacity: int, max_read: int, name: Optional[str] = None, event=None,
+                 context=None):
+        """
+        Create a shared ring, or attach to an existing one.
+
+        Args:
+            capacity (int): Number of samples the ring holds
+            max_read (int): Largest number of samples returned by one read
+            name (str, optional): Shared memory block to attach to; a new
+                block is created when None
+            event (multiprocessing.Event, optional): Wake-up event shared with
+                the other process; required when attaching
+            context (multiprocessing context, optional): Context used to create
+                the wake-up event of a new ring; must match the one that starts
+                the attaching process
+        """
+        if name is not None and event is None:
+            raise ValueError("Attaching to a shared ring requires its wake-up event")
+
+        size = _HEADER_BYTES + (capacity + max_read) * np.dtype(np.float32).itemsize
+        self.owner = name is None
+        if self.owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._counters = np.ndarray(4, dtype=np.int64, buffer=self._shm.buf)
+        self._event = event
+        self._context = context or multiprocessing
+        super().__init__(capacity, max_read)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block, used to attach from another process."""
+        return self._shm.name
+
+    @property
+    def event(self):
+        """The wake-up event to pass to the attaching process."""
+        return self._data_ready
+
+    def _allocate(self, size: int) -> np.ndarray:
+        """Map the sample storage onto the shared block after the counters."""
+        return np.ndarray(size, dtype=np.float32, buffer=self._shm.buf, offset=_HEADER_BYTES)
+
+    def _init_counters(self) -> None:
+        """Zero the shared counters when creating; keep them when attaching."""
+        if self.owner:
+            self._counters.fill(0)
+
+    def _create_event(self):
+        """Use the shared event, creating one for a new ring."""
+        if self._event is None:
+            self._event = self._context.Event()
+        return self._event
+
+    @property
+    def _write_count(self) -> int:
+        return int(self._counters[_WRITE])
+
+    @_write_count.setter
+    def _write_count(self, value: int) -> None:
+        self._counters[_WRITE] = value
+
+    @property
+    def _read_count(self) -> int:
+        return int(self._counters[_READ])
+
+    @_read_count.setter
+    def _read_count(self, value: int) -> None:
+        self._counters[_READ] = value
+
+    @property
+    def dropped_samples(self) -> int:
+        """Samples the consumer had to skip because they were overwritten."""
+        return int(self._counters[_DROPPED])
+
+    @dropped_samples.setter
+    def dropped_samples(self, value: int) -> None:
+        self._counters[_DROPPED] = value
+
+    @property
+    def high_water(self) -> int:
+        """Largest number of pending samples seen right after a write."""
+        return int(self._counters[_HIGH_WATER])
+
+    @high_water.setter
+    def high_water(self, value: int) -> None:
+        self._counters[_HIGH_WATER] = value
+
+    def close(self) -> None:
+        """Detach from the shared block, and free it if this process created it."""
+        # Keep the final counters readable, then drop the views of the mapping
+        self._counters = self._counters.copy()
+        self._buffer = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
@@ -0,0 +1,327 @@
+"""
+Audio sources feeding AudioInput for the Voice-to-MIDI application.
+"""
+import logging
+import threading
+import time
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from voicemidi.backend.audio.wav import read_wav, wav_info
+
+# How a replayed source delivers its blocks: at the pace of a live device,
+# or as fast as the consumer drains the ring
+PACING_MODES = ("realtime", "fast")
+
+
+def generate_sine_wave(frequency, duration=0.5, sample_rate=44100, amplitude=0.5):
+    """
+    Generate a sine wave with a 10 ms attack and release.
+
+    Args:
+        frequency (float): Frequency in Hz
+        duration (float): Length in seconds
+        sample_rate (int): Sample rate in Hz
+        amplitude (float): Peak amplitude
+
+    Returns:
+        ndarray: The tone as float32
+    """
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    wave = amplitude * np.sin(2 * np.pi * frequency * t)
+
+    # Apply envelope to avoid clicks
+    envelope = np.ones_like(wave)
+    attack_samples = int(0.01 * sample_rate)  # 10ms attack
+    release_samples = int(0.01 * sample_rate)  # 10ms release
+    envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
+    envelope[-release_samples:] = np.linspace(1, 0, release_samples)
+
+    return (wave * envelope).astype(np.float32)
+
+
+class AudioSource:
+    """
+    Where AudioInput gets its audio from.
+
+    ``open`` returns a stream with ``start``, ``stop`` and ``close`` that
+    calls ``audio_input.audio_callback`` with every captured block, like
+    a sounddevice.InputStream. The default source is the sound card;
+    the replayed sources below feed recorded or generated audio through
+    the same callback, so the whole application runs without hardware.
+    """
+
+    def open(self, audio_input):
+        """
+        Create a stream for an AudioInput.
+
+        Args:
+            audio_input (AudioInput): Input whose sample rate, block size,
+                channels and callback the stream uses
+
+        Returns:
+            A stream object with start(), stop() and close()
+        """
+        raise NotImplementedError
+
+
+class SoundDeviceSource(AudioSource):
+    """Live capture from a sound card through sounddevice (PortAudio)."""
+
+    def __init__(self, device: Optional[int] = None):
+        """
+        Initialize the source.
+
+        Args:
+            device (int, optional): Audio device index. If None, uses default.
+        """
+        self.device = device
+
+    def open(self, audio_input):
+        # PortAudio is only needed, and only loaded, for live capture
+        import sounddevice as sd
+        return sd.InputStream(
+            samplerate=audio_input.sample_rate,
+            blocksize=audio_input.block_size,
+            channels=audio_input.channels,
+            callback=audio_input.audio_callback,
+            device=self.device
+        )
+
+
+class ReplayStream:
+    """
+    Stream delivering a replayed source's blocks from a thread.
+
+    With "realtime" pacing each block is delivered when a device would
+    have captured it. With "fast" pacing blocks are delivered back to
+    back, waiting only while the ring has no room for the next one, so
+    nothing is dropped and the run takes as long as the consumer needs.
+    """
+
+    def __init__(self, source: "ReplaySource", audio_input):
+        """
+        Initialize the stream.
+
+        Args:
+            source (ReplaySource): Source providing the blocks
+            audio_input (AudioInput): Input receiving them
+        """
+        self.source = source
+        self.audio_input = audio_input
+        self.thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        """Whether blocks are still being delivered."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self) -> None:
+        """Start delivering blocks."""
+        self._stopping.clear()
+        self.source.finished.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop delivering blocks."""
+        self._stopping.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def close(self) -> None:
+        """Release the stream; nothing to release for a replay."""
+
+    def _run(self) -> None:
+        """Deliver the source's blocks until it runs out or the stream stops."""
+        audio_input = self.audio_input
+        block_size = audio_input.block_size
+        sample_rate = audio_input.sample_rate
+        realtime = self.source.pacing == "realtime"
+
+        # Blocks shaped like callback input, reused for every delivery
+        indata = np.zeros((block_size, audio_input.channels), dtype=np.float32)
+        started = time.perf_counter()
+        delivered = 0  # Samples
+        try:
+            for block in self.source.blocks(sample_rate, block_size):
+                if self._stopping.is_set():
+                    break
+                frames = len(block)
+                if realtime:
+                    # A device hands a block over once its last sample is captured
+                    delay = started + (delivered + frames) / sample_rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                else:
+                    self._wait_for_room(frames)
+                indata[:frames] = block[:, None]
+                audio_input.audio_callback(indata, frames, None, None)
+                delivered += frames
+        except Exception as e:
+            self.source.logger.error(f"Error replaying audio: {e}")
+        finally:
+            self.source.finished.set()
+
+    def _wait_for_room(self, frames: int) -> None:
+        """Wait until the ring can take another block without dropping audio."""
+        while not self._stopping.is_set():
+            # The consumer skips ahead once fewer than max_read samples are free
+            ring = self.audio_input.ring_buffer
+            if ring.available() + frames <= ring.capacity - ring.max_read:
+                return
+            time.sleep(0.0005)
+
+
+class ReplaySource(AudioSource):
+    """
+    Base for sources replaying audio that is not captured live.
+
+    Subclasses provide the audio as mono float32 blocks through
+    ``blocks``; the stream copies them to every input channel. After the
+    last block ``finished`` is set, so a caller can wait for a finite
+    source with ``wait``.
+    """
+
+    def __init__(self, pacing: str = "realtime"):
+        """
+        Initialize the source.
+
+        Args:
+            pacing (str): "realtime" to deliver blocks at the device rate, or
+                "fast" to deliver them as fast as the consumer keeps up
+        """
+        if pacing not in PACING_MODES:
+            raise ValueError(f"Unknown pacing '{pacing}', expected one of {PACING_MODES}")
+        self.pacing = pacing
+        self.finished = threading.Event()
+        self.logger = logging.getLogger("VoiceMIDI.Audio")
+
+    def open(self, audio_input):
+        return ReplayStream(self, audio_input)
+
+    def blocks(self, sample_rate: int, block_size: int) -> Iterator[np.ndarray]:
+        """
+        Yield the audio in blocks.
+
+        Args:
+            sample_rate (int): Sample rate the input runs at
+            block_size (int): Samples per block; the last block may be shorter
+
+        Yields:
+            ndarray: Mono float32 blocks
+        """
+        raise NotImplementedError
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the source to run out.
+
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds
+
+        Returns:
+            bool: True if every block has been delivered
+        """
+        return self.finished.wait(timeout)
+
+
+class FileSource(ReplaySource):
+    """
+    Replays a WAV file, a NumPy ``.npy`` file or an array of samples.
+
+    WAV files are streamed from disk and ``.npy`` files memory-mapped, so
+    long recordings are not loaded at once. Multi-channel audio is mixed
+    down to mono. The audio must have the input's sample rate.
+    """
+
+    def __init__(self, audio: Union[str, np.ndarray], sample_rate: Optional[int] = None,
+                 pacing: str = "realtime", loop: bool = False):
+        """
+        Initialize the source.
+
+        Args:
+            audio (str or ndarray): Path to a PCM WAV or .npy file, or the
+                samples, shaped (n,) or (n, channels)
+            sample_rate (int, optional): Sample rate of a .npy file or array;
+                if None it is assumed to match the input. WAV files carry theirs
+            pacing (str): "realtime" or "fast" (see PACING_MODES)
+            loop (bool): Start over at the end instead of finishing
+        """
+        super().__init__(pacing)
+        self.path = audio if isinstance(audio, str) else None
+        self.loop = loop
+        self.sample_rate = sample_rate
+        self.samples = None
+        if self.path is None:
+            self.samples = np.asarray(audio)
+        elif self.path.endswith(".npy"):
+            self.samples = np.load(self.path, mmap_mode="r")
+        else:
+            self.sample_rate, _ = wav_info(self.path)
+
+    def blocks(self, sample_rate: int, block_size: int) -> Iterator[np.ndarray]:
+        if self.sample_rate is not None and self.sample_rate != sample_rate:
+            raise ValueError(
+                f"Audio at {self.sample_rate} Hz cannot feed an input running at {sample_rate} Hz"
+            )
+        while True:
+            if self.samples is None:
+                yield from read_wav(self.path, chunk_size=block_size)
+            else:
+                for start in range(0, len(self.samples), block_size):
+                    block = np.asarray(self.samples[start:start + block_size], dtype=np.float32)
+                    yield block.mean(axis=1, dtype=np.float32) if block.ndim > 1 else block
+            if not self.loop:
+                return
+
+
+class SyntheticSource(ReplaySource):
+    """
+    Generates a melody of enveloped sine tones (see generate_sine_wave).
+
+    Each note is a (frequency in Hz, duration in seconds) pair; a
+    frequency of 0 is a rest. A little noise is added after the first
+    block of each note, as tests/test_tone.py does, from a seeded
+    generator so every run produces the same audio.
+    """
+
+    def __init__(self, notes: Sequence[Tuple[float, float]], amplitude: float = 0.5,
+                 noise: float = 0.01, pacing: str = "realtime", loop: bool = False, seed: int = 0):
+        """
+        Initialize the source.
+
+        Args:
+            notes (Sequence[Tuple[float, float]]): (frequency, duration) of each note
+            amplitude (float): Peak amplitude of the tones
+            noise (float): Standard deviation of the added noise
+            pacing (str): "realtime" or "fast" (see PACING_MODES)
+            loop (bool): Start the melody over at the end instead of finishing
+            seed (int): Seed of the noise generator
+        """
+        super().__init__(pacing)
+        self.notes = list(notes)
+        self.amplitude = amplitude
+        self.noise = noise
+        self.loop = loop
+        self.seed = seed
+
+    def blocks(self, sample_rate: int, block_size: int) -> Iterator[np.ndarray]:
+        rng = np.random.default_rng(self.seed)
+        while True:
+            for frequency, duration in self.notes:
+                if frequency > 0:
+                    tone = generate_sine_wave(frequency, duration, sample_rate, self.amplitude)
+                else:
+                    tone = np.zeros(int(sample_rate * duration), dtype=np.float32)
+                for start in range(0, len(tone), block_size):
+                    block = tone[start:start + block_size]
+                    if start > 0 and self.noise > 0:
+                        # Keep the first block clean for onset detection
+                        block = block + rng.normal(0, self.noise, len(block)).astype(np.float32)
+                    yield block
+            if not self.loop:
+                return
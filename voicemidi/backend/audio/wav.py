@@ -0,0 +1,68 @@
+"""
+PCM WAV file reading for the Voice-to-MIDI application.
+"""
+import wave
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+
+def wav_info(path: str) -> Tuple[int, int]:
+    """
+    Read the sample rate and length of a WAV file.
+
+    Args:
+        path (str): Path to a PCM WAV file
+
+    Returns:
+        tuple: (sample rate in Hz, number of sample frames)
+    """
+    with wave.open(path, "rb") as wav:
+        return wav.getframerate(), wav.getnframes()
+
+
+def _pcm_to_float(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """Convert interleaved PCM bytes to mono float32 samples in [-1, 1]."""
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        # Widen 24-bit samples into the top bytes of 32-bit ones
+        padded = np.zeros((len(data) // 3, 4), dtype=np.uint8)
+        padded[:, 1:] = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        samples = padded.view("<i4").ravel().astype(np.float32) / 2147483648.0
+    elif sample_width == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width of {sample_width} bytes")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def read_wav(path: str, start: int = 0, stop: Optional[int] = None,
+             chunk_size: int = 65536) -> Iterator[np.ndarray]:
+    """
+    Stream part of a WAV file as mono float32 chunks.
+
+    Args:
+        path (str): Path to a PCM WAV file
+        start (int): First sample frame to read
+        stop (int, optional): Sample frame to stop before; the end of the file by default
+        chunk_size (int): Sample frames per chunk
+
+    Yields:
+        ndarray: Consecutive chunks of at most chunk_size samples
+    """
+    with wave.open(path, "rb") as wav:
+        stop = wav.getnframes() if stop is None else min(stop, wav.getnframes())
+        wav.setpos(start)
+        position = start
+        while position < stop:
+            count = min(chunk_size, stop - position)
+            data = wav.readframes(count)
+            if not data:
+                break
+            position += count
+            yield _pcm_to_float(data, wav.getsampwidth(), wav.getnchannels())
@@ -1,6 +1,34 @@
 """Core functionality for Voice-to-MIDI application."""
 
-from voicemidi.backend.core.voicemidi import VoiceToMidi
+import importlib
+from typing import TYPE_CHECKING
+
 from voicemidi.backend.core.cli import main
 
-__all__ = ["VoiceToMidi", "main"] 
\ No newline at end of file
+if TYPE_CHECKING:
+    from voicemidi.backend.core.voicemidi import VoiceToMidi
+    from voicemidi.backend.core.pipeline import AnalysisPipeline
+    from voicemidi.backend.core.worker import AnalysisWorker
+
+# Exported name -> module that defines it; these load the detectors, so they
+# are imported on first access
+_EXPORTS = {
+    "VoiceToMidi": "voicemidi.backend.core.voicemidi",
+    "AnalysisPipeline": "voicemidi.backend.core.pipeline",
+    "AnalysisWorker": "voicemidi.backend.core.worker",
+}
+
+__all__ = ["VoiceToMidi", "AnalysisPipeline", "AnalysisWorker", "main"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
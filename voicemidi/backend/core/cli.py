@@ -1,13 +1,21 @@
 import sys
 import time
+import json
 import argparse
+import contextlib
 import signal
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from voicemidi.backend.core.voicemidi import VoiceToMidi
+from voicemidi.backend.audio import AudioInput
+from voicemidi.backend.core.devices import list_audio_devices, list_midi_ports
+from voicemidi.backend.midi import MidiOutput
+from voicemidi.backend.utils import Config, Logger
+
+if TYPE_CHECKING:
+    from voicemidi.backend.core.voicemidi import VoiceToMidi
 
 # Global application instance used by signal handler
-app: Optional[VoiceToMidi] = None
+app: Optional["VoiceToMidi"] = None
 
 def signal_handler(sig, frame) -> None:
     """
@@ -23,17 +31,102 @@ def signal_handler(sig, frame) -> None:
         app.stop()
     sys.exit(0)
 
-def main() -> None:
-    """Main entry point for the Voice-to-MIDI application."""
-    parser = argparse.ArgumentParser(description="Voice-to-MIDI Converter")
-    parser.add_argument("--config", default="config.json", help="Path to configuration file")
+
+def transcribe(args: argparse.Namespace) -> None:
+    """
+    Run the ``transcribe`` command: convert a WAV recording to a MIDI file.
+    
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+    """
+    from voicemidi.backend.core.transcribe import transcribe_file
+    
+    config = Config(args.config)
+    Logger(config.get("app", "log_file"), args.debug or config.get("app", "debug"))
+    summary = transcribe_file(args.input, args.output, config.config, jobs=args.jobs,
+                              segment_seconds=args.segment_seconds)
+    print(f"Transcribed {summary['seconds']:.1f} s of audio into {summary['notes']} notes: "
+          f"{args.output}")
+
+
+def bench(args: argparse.Namespace) -> None:
+    """
+    Run the ``bench`` command: time the configured pipeline on synthetic vocals.
+    
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+    """
+    from voicemidi.backend.core.bench import benchmark_pipeline, format_results
+    
+    # Keep stdout for the report, so scripts can parse the JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        config = Config(args.config)
+        Logger(config.get("app", "log_file"), args.debug or config.get("app", "debug"))
+        result = benchmark_pipeline(config.config, seconds=args.seconds,
+                                    allocations=not args.no_allocations)
+    print(json.dumps(result, indent=2) if args.json else format_results(result))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Main entry point for the Voice-to-MIDI application.
+    
+    Args:
+        argv (List[str], optional): Command line arguments; sys.argv by default
+    """
+    # Options shared by the live converter and the subcommands
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default="config.json", help="Path to configuration file")
+    common.add_argument("--debug", action="store_true", help="Enable debug logging")
+    
+    parser = argparse.ArgumentParser(description="Voice-to-MIDI Converter", parents=[common])
     parser.add_argument("--list-audio", action="store_true", help="List available audio devices")
     parser.add_argument("--list-midi", action="store_true", help="List available MIDI ports")
-    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     
-    args = parser.parse_args()
+    # Subcommands take the shared options after their name too; SUPPRESS
+    # keeps the defaults from overriding options given before it
+    subcommon = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    subcommon.add_argument("--config", help="Path to configuration file")
+    subcommon.add_argument("--debug", action="store_true", help="Enable debug logging")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    transcriber = commands.add_parser("transcribe", parents=[subcommon],
+                                      help="Convert a WAV recording to a MIDI file")
+    transcriber.add_argument("input", help="PCM WAV file to transcribe")
+    transcriber.add_argument("output", help="MIDI file to write")
+    transcriber.add_argument("--jobs", type=int, default=None,
+                             help="Number of processes (default: one per CPU)")
+    transcriber.add_argument("--segment-seconds", type=float, default=30.0,
+                             help="Length of the segments analyzed in parallel")
+    bencher = commands.add_parser("bench", parents=[subcommon],
+                                  help="Time the configured pipeline on synthetic vocals")
+    bencher.add_argument("--seconds", type=float, default=20.0,
+                         help="Length of the synthetic material")
+    bencher.add_argument("--json", action="store_true", help="Print the results as JSON")
+    bencher.add_argument("--no-allocations", action="store_true",
+                         help="Skip the allocation tracing pass")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "transcribe":
+        transcribe(args)
+        return
+    if args.command == "bench":
+        bench(args)
+        return
+    
+    # List devices if requested; this needs neither the detectors nor
+    # their DSP dependencies, so the application is not created
+    if args.list_audio or args.list_midi:
+        config = Config(args.config)
+        logger = Logger(config.get("app", "log_file"), args.debug or config.get("app", "debug"))
+        if args.list_audio:
+            list_audio_devices(AudioInput(), logger)
+        else:
+            list_midi_ports(MidiOutput(), logger)
+        return
     
     # Create the application
+    from voicemidi.backend.core.voicemidi import VoiceToMidi
     global app
     app = VoiceToMidi(args.config)
     
@@ -44,15 +137,6 @@ def main() -> None:
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     
-    # List devices if requested
-    if args.list_audio:
-        app.list_audio_devices()
-        return
-    
-    if args.list_midi:
-        app.list_midi_ports()
-        return
-    
     # Start the application
     if app.start():
         print("\nVoice-to-MIDI converter is running. Press Ctrl+C to stop.")
@@ -0,0 +1,43 @@
+"""
+Audio device and MIDI port listing for the Voice-to-MIDI application.
+"""
+from typing import Any, Dict, List
+
+from voicemidi.backend.audio import AudioInput
+from voicemidi.backend.midi import MidiOutput
+
+
+def list_audio_devices(audio_input: AudioInput, logger) -> List[Dict[str, Any]]:
+    """
+    Log the available audio devices.
+
+    Args:
+        audio_input (AudioInput): Audio input used to query the devices
+        logger (Logger): Logger to report to
+
+    Returns:
+        List[Dict[str, Any]]: List of available audio devices
+    """
+    devices = audio_input.get_devices()
+    logger.info("Available audio devices:")
+    for i, device in enumerate(devices):
+        logger.info(f"  {i}: {device['name']}")
+    return devices
+
+
+def list_midi_ports(midi_output: MidiOutput, logger) -> List[str]:
+    """
+    Log the available MIDI output ports.
+
+    Args:
+        midi_output (MidiOutput): MIDI output used to query the ports
+        logger (Logger): Logger to report to
+
+    Returns:
+        List[str]: List of available MIDI ports
+    """
+    ports = midi_output.list_output_ports()
+    logger.info("Available MIDI output ports:")
+    for i, port in enumerate(ports):
+        logger.info(f"  {i}: {port}")
+    return ports
@@ -0,0 +1,203 @@
+"""
+Block analysis and note decisions for the Voice-to-MIDI application.
+"""
+import logging
+import math
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from voicemidi.backend.analysis import (
+    PolyphaseDecimator,
+    SlidingWindow,
+    SpectralFrontEnd,
+    analysis_window,
+    decimated_frame_size,
+    decimation_factor,
+)
+from voicemidi.backend.onset import OnsetDetector
+from voicemidi.backend.pitch import PitchDetector
+
+
+class AnalysisPipeline:
+    """
+    Turns audio hops into note on/off decisions.
+
+    The pipeline owns the sliding analysis window, the shared spectral
+    front-end, the pitch and onset detectors and the current note state,
+    so the same code drives the in-process processing loop and the
+    out-of-process analysis worker. Each call takes ``hop_length`` new
+    samples and analyzes the newest ``frame_length`` (the
+    ``audio.hop_length`` and ``audio.frame_length`` settings, both the
+    device block size by default), so decisions can be made more often
+    than the device delivers blocks.
+    Unless ``pitch.decimation`` is 1, pitch runs on a decimated copy of
+    the signal at a rate derived from ``pitch.max_frequency``, while onset
+    detection keeps the full device rate.
+    """
+
+    def __init__(self, config: Dict[str, Dict[str, Any]]):
+        """
+        Initialize the detectors from configuration.
+
+        Args:
+            config (Dict[str, Dict[str, Any]]): Configuration sections, as in
+                Config.config
+        """
+        audio_config = config["audio"]
+        pitch_config = config["pitch"]
+        onset_config = config["onset"]
+
+        # Analysis frames of frame_length samples, one per hop_length new samples
+        sample_rate = audio_config["sample_rate"]
+        self.frame_length, self.hop_length = analysis_window(audio_config)
+        self.window = SlidingWindow(self.frame_length, self.hop_length)
+
+        # Decimation ahead of pitch detection
+        factor = pitch_config["decimation"]
+        if factor == "auto":
+            factor = decimation_factor(sample_rate, self.hop_length, pitch_config["max_frequency"])
+        self.decimator = None
+        pitch_rate = sample_rate
+        pitch_frame_size = self.frame_length
+        if factor > 1:
+            pitch_rate = sample_rate / factor
+            pitch_frame_size = decimated_frame_size(pitch_rate, self.frame_length // factor,
+                                                    pitch_config["min_frequency"])
+            self.decimator = PolyphaseDecimator(factor, self.hop_length, pitch_frame_size)
+
+        # Shared spectral front-end, computed once per frame for all detectors;
+        # the full-rate autocorrelation is only used by undecimated pitch
+        self.front_end = SpectralFrontEnd(
+            sample_rate=sample_rate,
+            frame_size=self.frame_length,
+            autocorrelation=self.decimator is None
+        )
+
+        # Pitch detector
+        self.pitch_detector = PitchDetector(
+            sample_rate=pitch_rate,
+            block_size=pitch_frame_size,
+            min_confidence=pitch_config["min_confidence"],
+            min_frequency=pitch_config["min_frequency"],
+            max_frequency=pitch_config["max_frequency"],
+            algorithm=pitch_config["algorithm"],
+            pyin_lag=pitch_config["pyin_lag"],
+            aubio_method=pitch_config["aubio_method"],
+            tracking=pitch_config["tracking"],
+            tracking_semitones=pitch_config["tracking_semitones"],
+            buffer_size=pitch_config["buffer_size"],
+            smoothing=pitch_config["smoothing"]
+        )
+
+        # Onset detector; its frames overlap by at least three quarters, so
+        # a frame as long as the hop is still split into four
+        onset_hop = min(self.hop_length, self.frame_length // 4)
+        if self.hop_length % onset_hop != 0:
+            onset_hop = self.hop_length
+        self.onset_detector = OnsetDetector(
+            sample_rate=sample_rate,
+            block_size=self.hop_length,
+            threshold=onset_config["threshold"],
+            silence=onset_config["silence"],
+            minimum_inter_onset_interval_ms=onset_config["minimum_inter_onset_interval_ms"],
+            algorithm=onset_config["algorithm"],
+            aubio_method=onset_config["aubio_method"],
+            frame_length=self.frame_length,
+            hop_length=onset_hop
+        )
+
+        # Note state
+        self.last_note = 0
+        self.note_on = False
+
+        # An onset is usually detected before the pitch frame holds enough of
+        # the new note; it stays pending for as many hops as that frame spans
+        pitch_span = pitch_frame_size * sample_rate / pitch_rate
+        self.onset_hold = math.ceil(pitch_span / self.hop_length - 1e-9)
+        self.onset_pending = 0
+
+        # Seconds spent in pitch detection (with the shared analysis), onset
+        # detection and the decision for the last processed hop
+        self.stage_times = (0.0, 0.0, 0.0)
+
+        self.logger = logging.getLogger("VoiceMIDI.Pipeline")
+
+    def process(self, audio_data, current_time: float) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Analyze one hop and decide which MIDI notes to send.
+
+        Args:
+            audio_data (ndarray): The newest ``hop_length`` samples (longer
+                input is trimmed to its last ``hop_length``)
+            current_time (float): Stream time of the hop in seconds
+
+        Returns:
+            tuple: (note to turn off or None, note to turn on or None)
+        """
+        if audio_data is None or len(audio_data) < self.hop_length:
+            return None, None
+
+        started = time.perf_counter()
+
+        # Analyze the frame once for both detectors
+        analysis = self.front_end.analyze(self.window.push(audio_data))
+        analysis_done = time.perf_counter()
+
+        # Detect onset first: a new note ends pitch tracking before this hop's search
+        is_onset = self.onset_detector.detect_onset(analysis.samples, current_time,
+                                                    analysis=analysis)
+        if is_onset:
+            self.pitch_detector.unlock()
+        onset_done = time.perf_counter()
+
+        # Detect pitch, at the reduced rate when decimating
+        if self.decimator is not None:
+            midi_note, confidence, note_name = self.pitch_detector.get_midi_note(
+                self.decimator.process(analysis.samples)
+            )
+        else:
+            midi_note, confidence, note_name = self.pitch_detector.get_midi_note(
+                analysis.samples, analysis=analysis
+            )
+        pitch_done = time.perf_counter()
+
+        # Decide which MIDI messages to send based on onset and pitch
+        note_off = None
+        note_on = None
+        if self.onset_pending > 0:
+            self.onset_pending -= 1
+        if is_onset and not self.note_on:
+            self.onset_pending = self.onset_hold + 1
+        if self.onset_pending > 0 and midi_note > 0 and not self.note_on:
+            # New note onset detected
+            note_on = midi_note
+            self.last_note = midi_note
+            self.note_on = True
+            self.onset_pending = 0
+            self.logger.debug(f"Note ON: {midi_note} ({note_name}), confidence: {confidence:.2f}")
+        elif midi_note != self.last_note and midi_note > 0 and self.note_on:
+            # Pitch changed while holding a note
+            note_off = self.last_note
+            note_on = midi_note
+            self.last_note = midi_note
+            self.logger.debug(f"Note change: {midi_note} ({note_name}), "
+                              f"confidence: {confidence:.2f}")
+        elif is_onset and self.note_on:
+            # New onset while a note is on - retrigger the same note
+            note_off = self.last_note
+            note_on = midi_note if midi_note > 0 else self.last_note
+            self.logger.debug(f"Note retrigger: {self.last_note}")
+        elif midi_note == 0 and self.note_on:
+            # No pitch detected, turn off the current note
+            note_off = self.last_note
+            self.note_on = False
+            self.logger.debug(f"Note OFF: {self.last_note}")
+        decision_done = time.perf_counter()
+
+        # The shared analysis is counted as pitch time
+        self.stage_times = (
+            pitch_done - onset_done + analysis_done - started,
+            onset_done - analysis_done,
+            decision_done - pitch_done,
+        )
+        return note_off, note_on
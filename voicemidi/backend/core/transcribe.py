@@ -0,0 +1,219 @@
+"""
+Offline WAV-to-MIDI transcription for the Voice-to-MIDI application.
+"""
+import copy
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import mido
+
+from voicemidi.backend.analysis import analysis_window
+from voicemidi.backend.audio.wav import read_wav, wav_info
+from voicemidi.backend.core.pipeline import AnalysisPipeline
+from voicemidi.backend.core.worker import WORKER_START_METHOD
+
+# A note decision: sample position at which it is made (the end of the
+# analyzed hop), note to turn off, note to turn on (0 for none)
+NoteEvent = Tuple[int, int, int]
+
+# MIDI file timing: 120 BPM, so a beat is half a second
+TICKS_PER_BEAT = 480
+TEMPO = 500000
+
+# Hops read from the file at a time
+READ_HOPS = 64
+
+
+def plan_segments(n_hops: int, hop_length: int, segment_hops: int) -> List[Tuple[int, int]]:
+    """
+    Split a file's hops into consecutive segments.
+
+    The split depends only on the file length and the segment size, so
+    the transcription does not depend on the number of processes.
+
+    Args:
+        n_hops (int): Number of whole hops in the file
+        hop_length (int): Samples per hop
+        segment_hops (int): Hops per segment
+
+    Returns:
+        list: (first sample, end sample) of each segment, on hop boundaries
+    """
+    return [(first * hop_length, min(first + segment_hops, n_hops) * hop_length)
+            for first in range(0, n_hops, max(1, segment_hops))]
+
+
+def transcribe_segment(config: Dict[str, Dict[str, Any]], path: str, start: int, end: int,
+                       warmup: int) -> Tuple[int, List[NoteEvent]]:
+    """
+    Run the analysis pipeline over one segment of a WAV file.
+
+    The pipeline starts ``warmup`` samples early, so its windows, filters
+    and smoothing have settled by ``start``. The start of that run counts
+    as an onset, so a note already sounding there is picked up as it
+    would be by a run from the beginning of the file.
+
+    Args:
+        config (Dict[str, Dict[str, Any]]): Configuration sections, with the
+            file's sample rate
+        path (str): Path to the WAV file
+        start (int): First sample of the segment, on a hop boundary
+        end (int): Sample the segment ends before, on a hop boundary
+        warmup (int): Samples to analyze before ``start``; rounded down to
+            whole hops
+
+    Returns:
+        tuple: (note sounding at ``start``, 0 for none; the note events
+            decided within the segment)
+    """
+    pipeline = AnalysisPipeline(config)
+    hop_length = pipeline.hop_length
+    position = max(0, start - warmup // hop_length * hop_length)
+    if position < start:
+        pipeline.onset_pending = pipeline.onset_hold + 1
+    sample_rate = config["audio"]["sample_rate"]
+
+    entry_note = 0
+    events: List[NoteEvent] = []
+    for chunk in read_wav(path, position, end, READ_HOPS * hop_length):
+        for offset in range(0, len(chunk) - hop_length + 1, hop_length):
+            if position == start:
+                entry_note = pipeline.last_note if pipeline.note_on else 0
+            position += hop_length
+            note_off, note_on = pipeline.process(chunk[offset:offset + hop_length],
+                                                 position / sample_rate)
+            if position > start and (note_off or note_on):
+                events.append((position, note_off or 0, note_on or 0))
+    return entry_note, events
+
+
+def stitch_segments(segments: Sequence[Tuple[int, int]],
+                    results: Sequence[Tuple[int, List[NoteEvent]]]) -> List[NoteEvent]:
+    """
+    Join the note events of consecutive segments.
+
+    Where a segment starts with a different note sounding than the one
+    the previous segment left on, a note change is inserted at the
+    boundary, so every note on is matched by exactly one note off. The
+    last note is turned off at the end.
+
+    Args:
+        segments (Sequence[Tuple[int, int]]): (start, end) of each segment
+        results (Sequence[Tuple[int, List[NoteEvent]]]): transcribe_segment
+            result of each segment
+
+    Returns:
+        list: Note events in order
+    """
+    sounding = 0
+    events: List[NoteEvent] = []
+    for (start, _), (entry_note, segment_events) in zip(segments, results):
+        if entry_note != sounding:
+            events.append((start, sounding, entry_note))
+            sounding = entry_note
+        for position, note_off, note_on in segment_events:
+            events.append((position, note_off, note_on))
+            if note_off and note_off == sounding:
+                sounding = 0
+            if note_on:
+                sounding = note_on
+    if sounding and segments:
+        events.append((segments[-1][1], sounding, 0))
+    return events
+
+
+def write_midi(events: Sequence[NoteEvent], path: str, sample_rate: int,
+               velocity: int = 64, channel: int = 0) -> int:
+    """
+    Write note events to a standard MIDI file.
+
+    Args:
+        events (Sequence[NoteEvent]): Note events in order
+        path (str): Output path
+        sample_rate (int): Sample rate the event positions are counted in
+        velocity (int): Note on velocity
+        channel (int): MIDI channel (0-15)
+
+    Returns:
+        int: Number of notes written
+    """
+    midi_file = mido.MidiFile(ticks_per_beat=TICKS_PER_BEAT)
+    track = mido.MidiTrack()
+    midi_file.tracks.append(track)
+    track.append(mido.MetaMessage("set_tempo", tempo=TEMPO, time=0))
+
+    notes = 0
+    last_tick = 0
+    for position, note_off, note_on in events:
+        tick = round(mido.second2tick(position / sample_rate, TICKS_PER_BEAT, TEMPO))
+        if note_off:
+            track.append(mido.Message("note_off", note=note_off, velocity=0, channel=channel,
+                                      time=tick - last_tick))
+            last_tick = tick
+        if note_on:
+            track.append(mido.Message("note_on", note=note_on, velocity=velocity, channel=channel,
+                                      time=tick - last_tick))
+            last_tick = tick
+            notes += 1
+    track.append(mido.MetaMessage("end_of_track", time=0))
+    midi_file.save(path)
+    return notes
+
+
+def transcribe_file(input_path: str, output_path: str, config: Dict[str, Dict[str, Any]],
+                    jobs: Optional[int] = None, segment_seconds: float = 30.0,
+                    warmup_seconds: float = 3.0) -> Dict[str, Any]:
+    """
+    Transcribe a WAV recording to a MIDI file.
+
+    The file is split into segments of ``segment_seconds`` that are
+    analyzed in parallel by a pool of ``jobs`` processes, each streaming
+    its segment from the file with the same AnalysisPipeline as the live
+    application, and the results are stitched in order. The output only
+    depends on the file, the configuration and the segment length, not
+    on the number of processes.
+
+    Args:
+        input_path (str): PCM WAV file to transcribe
+        output_path (str): MIDI file to write
+        config (Dict[str, Dict[str, Any]]): Configuration sections, as in
+            Config.config; the file's sample rate replaces the configured one
+        jobs (int, optional): Number of processes; one per CPU by default,
+            and 1 analyzes in this process
+        segment_seconds (float): Length of each segment
+        warmup_seconds (float): Audio analyzed ahead of each segment and
+            discarded, so the detectors have settled at its start; the
+            onset peak envelope takes a few seconds
+
+    Returns:
+        dict: Summary with the duration in seconds, number of segments and notes
+    """
+    logger = logging.getLogger("VoiceMIDI.Transcribe")
+    sample_rate, n_samples = wav_info(input_path)
+    config = copy.deepcopy(config)
+    config["audio"]["sample_rate"] = sample_rate
+    _, hop_length = analysis_window(config["audio"])
+
+    segment_hops = max(1, int(segment_seconds * sample_rate) // hop_length)
+    segments = plan_segments(n_samples // hop_length, hop_length, segment_hops)
+    warmup = int(warmup_seconds * sample_rate)
+    jobs = min(jobs or os.cpu_count() or 1, max(1, len(segments)))
+    logger.info(f"Transcribing {input_path}: {n_samples / sample_rate:.1f} s in "
+                f"{len(segments)} segments on {jobs} processes")
+
+    arguments = [(config, input_path, start, end, warmup) for start, end in segments]
+    if jobs == 1:
+        results = [transcribe_segment(*args) for args in arguments]
+    else:
+        context = multiprocessing.get_context(WORKER_START_METHOD)
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+            results = list(pool.map(transcribe_segment, *zip(*arguments)))
+
+    events = stitch_segments(segments, results)
+    notes = write_midi(events, output_path, sample_rate,
+                       velocity=config["midi"]["velocity"], channel=config["midi"]["channel"])
+    logger.info(f"Wrote {notes} notes to {output_path}")
+    return {"seconds": n_samples / sample_rate, "segments": len(segments), "notes": notes}
@@ -2,11 +2,17 @@
 import threading
 from typing import Optional, List, Dict, Any
 
-from voicemidi.backend.audio import AudioInput
-from voicemidi.backend.pitch import PitchDetector
-from voicemidi.backend.onset import OnsetDetector
+from voicemidi.backend.audio import AudioInput, AudioSource
+from voicemidi.backend.core.devices import list_audio_devices, list_midi_ports
+from voicemidi.backend.core.pipeline import AnalysisPipeline
+from voicemidi.backend.core.worker import AnalysisWorker
 from voicemidi.backend.midi import MidiOutput
-from voicemidi.backend.utils import Config, Logger
+from voicemidi.backend.utils import Config, Logger, LatencyTracker
+
+# Where blocks are analyzed: on a consumer thread woken by the ring buffer,
+# directly on the audio callback thread for the lowest latency, or in a
+# worker process so analysis never holds this process's GIL
+PROCESSING_MODES = ("thread", "callback", "process")
 
 class VoiceToMidi:
     """
@@ -14,15 +20,27 @@ class VoiceToMidi:
     
     This class coordinates all components and handles the real-time
     processing of audio input to MIDI output.
+    
+    The audio source and MIDI port can be replaced, e.g. by a FileSource
+    or SyntheticSource and a NullMidiPort, to run the whole application
+    on a machine without audio or MIDI hardware.
     """
     
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", audio_source: Optional[AudioSource] = None,
+                 midi_port: Optional[Any] = None):
         """
         Initialize the Voice-to-MIDI application.
         
         Args:
             config_file (str): Path to the configuration file
+            audio_source (AudioSource, optional): Where the audio comes from;
+                the configured sound card by default
+            midi_port (optional): Output port object to send to, such as a
+                NullMidiPort; by default the configured port is opened
         """
+        self.audio_source = audio_source
+        self.midi_port = midi_port
+        
         # Load configuration
         self.config = Config(config_file)
         
@@ -34,49 +52,49 @@ def __init__(self, config_file: str = "config.json"):
         # Initialize components
         self._init_components()
         
+        self.processing_mode = self.config.get("audio", "processing_mode")
+        if self.processing_mode not in PROCESSING_MODES:
+            raise ValueError(
+                f"Unknown processing mode '{self.processing_mode}', "
+                f"expected one of {PROCESSING_MODES}"
+            )
+        
         # Processing state
         self.is_running = False
         self.thread: Optional[threading.Thread] = None
-        self.last_note = 0
-        self.note_on = False
+        self.worker: Optional[AnalysisWorker] = None
         self.current_time = 0
+        self.blocks_processed = 0
+        self.latency = LatencyTracker()
         
     def _init_components(self) -> None:
         """Initialize all components based on configuration."""
-        # Audio input
+        # Front-end, detectors and note state
+        self.pipeline = AnalysisPipeline(self.config.config)
+        self.front_end = self.pipeline.front_end
+        self.pitch_detector = self.pipeline.pitch_detector
+        self.onset_detector = self.pipeline.onset_detector
+        
+        # Audio input, handing over one analysis hop at a time
         audio_config = self.config.get("audio")
         self.audio_input = AudioInput(
             sample_rate=audio_config["sample_rate"],
             block_size=audio_config["block_size"],
             channels=audio_config["channels"],
-            device=audio_config["device"]
+            device=audio_config["device"],
+            buffer_blocks=audio_config["buffer_blocks"],
+            hop_length=self.pipeline.hop_length,
+            source=self.audio_source
         )
         
-        # Pitch detector
-        pitch_config = self.config.get("pitch")
-        self.pitch_detector = PitchDetector(
-            sample_rate=audio_config["sample_rate"],
-            block_size=audio_config["block_size"],
-            min_confidence=pitch_config["min_confidence"],
-            min_frequency=pitch_config["min_frequency"],
-            max_frequency=pitch_config["max_frequency"]
-        )
-        
-        # Onset detector
-        onset_config = self.config.get("onset")
-        self.onset_detector = OnsetDetector(
-            sample_rate=audio_config["sample_rate"],
-            block_size=audio_config["block_size"],
-            threshold=onset_config["threshold"],
-            silence=onset_config["silence"],
-            minimum_inter_onset_interval_ms=onset_config["minimum_inter_onset_interval_ms"]
-        )
+        self.block_time = self.pipeline.hop_length / audio_config["sample_rate"]
         
         # MIDI output
         midi_config = self.config.get("midi")
         self.midi_output = MidiOutput(
             virtual_port_name=midi_config["virtual_port_name"],
-            port_name=midi_config["port_name"]
+            port_name=midi_config["port_name"],
+            port=self.midi_port
         )
         
         self.logger.info("All components initialized")
@@ -99,20 +117,42 @@ def start(self) -> bool:
             self.logger.error("Failed to open MIDI port")
             return False
             
+        # In callback mode the audio thread processes each block itself; in
+        # process mode the audio goes to the worker through shared memory
+        self.is_running = True
+        if self.processing_mode == "callback":
+            self.audio_input.set_block_handler(self._handle_block)
+        elif self.processing_mode == "process":
+            try:
+                self.worker = AnalysisWorker(self.config.config)
+                self.audio_input.set_ring_buffer(self.worker.ring_buffer)
+                started = self.worker.start()
+            except Exception as e:
+                self.logger.error(f"Failed to start analysis worker: {e}")
+                started = False
+            if not started:
+                self._stop_worker()
+                self.is_running = False
+                return False
+            
         # Start audio input
         try:
             self.audio_input.start()
         except Exception as e:
             self.logger.error(f"Failed to start audio input: {e}")
+            self.is_running = False
+            self.audio_input.set_block_handler(None)
+            self._stop_worker()
             return False
             
         # Start processing thread
-        self.is_running = True
-        self.thread = threading.Thread(target=self._process_loop)
-        self.thread.daemon = True
-        self.thread.start()
+        if self.processing_mode != "callback":
+            target = self._result_loop if self.processing_mode == "process" else self._process_loop
+            self.thread = threading.Thread(target=target)
+            self.thread.daemon = True
+            self.thread.start()
         
-        self.logger.info("Voice-to-MIDI conversion started")
+        self.logger.info(f"Voice-to-MIDI conversion started ({self.processing_mode} processing)")
         return True
     
     def stop(self) -> None:
@@ -130,6 +170,9 @@ def stop(self) -> None:
         
         # Stop audio input
         self.audio_input.stop()
+        self.audio_input.set_block_handler(None)
+        self._stop_worker()
+        self.logger.info(f"Processing stats: {self.get_stats()}")
         
         # Close MIDI output
         self.midi_output.close_port()
@@ -138,57 +181,137 @@ def stop(self) -> None:
     
     def _process_loop(self) -> None:
         """Main processing loop for audio to MIDI conversion."""
-        block_time = self.config.get("audio", "block_size") / self.config.get("audio", "sample_rate")
-        
         while self.is_running:
-            # Get audio block
-            audio_data = self.audio_input.get_audio_block()
+            # Sleeps until the audio callback completes a hop (or times out
+            # so that a stop request is noticed)
+            audio_data = self.audio_input.get_audio_block(timeout=0.1)
             if audio_data is None:
-                time.sleep(0.001)  # Small sleep to prevent CPU usage
                 continue
-                
-            # Update current time
-            self.current_time += block_time
+            self._handle_block(audio_data, self.audio_input.get_block_timing())
+    
+    def _result_loop(self) -> None:
+        """Send the MIDI decided by the analysis worker."""
+        while self.is_running:
+            if not self.worker.poll(timeout=0.1):
+                continue
+            result = self.worker.receive()
+            if result is None:
+                self.logger.error("Analysis worker exited")
+                break
+            position, note_off, note_on, stage_times = result
+            
+            timing = self.audio_input.lookup_timing(position)
+            if timing is not None:
+                self.latency.record("capture", timing[0])
+            self.current_time = (position + self.pipeline.hop_length) / self.audio_input.sample_rate
+            self._send_notes(note_off or None, note_on or None, stage_times, timing)
+            self.blocks_processed += 1
+    
+    def _stop_worker(self) -> None:
+        """Stop the analysis worker, if one is running."""
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+    
+    def _handle_block(self, audio_data, timing=None) -> None:
+        """
+        Account for and process one captured hop.
+        
+        Called from the processing thread, or from the audio thread in
+        callback mode.
+        
+        Args:
+            audio_data (ndarray): Audio data block
+            timing (tuple, optional): (ADC-to-callback latency, perf_counter()
+                time of the capture callback)
+        """
+        dequeued = time.perf_counter()
+        
+        # Time spent before processing: ADC to callback, then waiting in the ring
+        if timing is not None:
+            capture_latency, callback_time = timing
+            self.latency.record("capture", capture_latency)
+            self.latency.record("queue_wait", dequeued - callback_time)
             
-            # Process audio block
-            self._process_audio_block(audio_data)
+        # Update current time
+        self.current_time += self.block_time
+        
+        # Process audio block
+        self._process_audio_block(audio_data, timing)
+        self.blocks_processed += 1
     
-    def _process_audio_block(self, audio_data) -> None:
+    def _process_audio_block(self, audio_data, timing=None) -> None:
         """
         Process a single block of audio data.
         
         Args:
             audio_data (ndarray): Audio data block
+            timing (tuple, optional): (ADC-to-callback latency, perf_counter()
+                time of the capture callback) used for end-to-end latency
+        """
+        if audio_data is None or len(audio_data) < self.pipeline.hop_length:
+            return
+        
+        note_off, note_on = self.pipeline.process(audio_data, self.current_time)
+        self._send_notes(note_off, note_on, self.pipeline.stage_times, timing)
+    
+    def _send_notes(self, note_off, note_on, stage_times, timing=None) -> None:
+        """
+        Send the MIDI decided for one block and record its latencies.
+        
+        Args:
+            note_off (int, optional): Note to turn off
+            note_on (int, optional): Note to turn on
+            stage_times (tuple): Seconds spent in pitch, onset and decision
+            timing (tuple, optional): (ADC-to-callback latency, perf_counter()
+                time of the capture callback)
+        """
+        decision_done = time.perf_counter()
+        
+        # Send MIDI, off before on, in one batch
+        if note_off is not None or note_on is not None:
+            self.midi_output.send_note_change(note_off, note_on)
+        sent = time.perf_counter()
+        
+        pitch_time, onset_time, decision_time = stage_times
+        self.latency.record("pitch", pitch_time)
+        self.latency.record("onset", onset_time)
+        self.latency.record("decision", decision_time)
+        if note_off is not None or note_on is not None:
+            self.latency.record("midi_send", sent - decision_done)
+            if timing is not None:
+                capture_latency, callback_time = timing
+                self.latency.record("end_to_end", capture_latency + sent - callback_time)
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get latency percentiles for each pipeline stage.
+        
+        Stages are capture (ADC to callback), queue_wait (callback to
+        processing), pitch (including the shared analysis), onset, decision,
+        midi_send and end_to_end (ADC of the block's first sample to the
+        MIDI message going out).
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Per-stage count, mean, p50, p95, p99
+                and max in milliseconds
+        """
+        return self.latency.summary()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get runtime statistics for monitoring.
+        
+        Returns:
+            Dict[str, Any]: Processing mode and counters, the audio capture
+                statistics from AudioInput.get_stats() and the latency percentiles
         """
-        # Detect pitch
-        midi_note, confidence, note_name = self.pitch_detector.get_midi_note(audio_data)
-        
-        # Detect onset
-        is_onset = self.onset_detector.detect_onset(audio_data, self.current_time)
-        
-        # Handle MIDI output based on onset and pitch
-        if is_onset and midi_note > 0 and not self.note_on:
-            # New note onset detected
-            self.midi_output.send_note_on(midi_note)
-            self.last_note = midi_note
-            self.note_on = True
-            self.logger.debug(f"Note ON: {midi_note} ({note_name}), confidence: {confidence:.2f}")
-        elif midi_note != self.last_note and midi_note > 0 and self.note_on:
-            # Pitch changed while holding a note
-            self.midi_output.send_note_off(self.last_note)
-            self.midi_output.send_note_on(midi_note)
-            self.last_note = midi_note
-            self.logger.debug(f"Note change: {midi_note} ({note_name}), confidence: {confidence:.2f}")
-        elif is_onset and self.note_on:
-            # New onset while a note is on - retrigger the same note
-            self.midi_output.send_note_off(self.last_note)
-            self.midi_output.send_note_on(midi_note if midi_note > 0 else self.last_note)
-            self.logger.debug(f"Note retrigger: {self.last_note}")
-        elif midi_note == 0 and self.note_on:
-            # No pitch detected, turn off the current note
-            self.midi_output.send_note_off(self.last_note)
-            self.note_on = False
-            self.logger.debug(f"Note OFF: {self.last_note}")
+        return {
+            "processing_mode": self.processing_mode,
+            "blocks_processed": self.blocks_processed,
+            "audio": self.audio_input.get_stats(),
+            "latency": self.get_latency_stats(),
+        }
     
     def list_audio_devices(self) -> List[Dict[str, Any]]:
         """
@@ -197,11 +320,7 @@ def list_audio_devices(self) -> List[Dict[str, Any]]:
         Returns:
             List[Dict[str, Any]]: List of available audio devices
         """
-        devices = self.audio_input.get_devices()
-        self.logger.info("Available audio devices:")
-        for i, device in enumerate(devices):
-            self.logger.info(f"  {i}: {device['name']}")
-        return devices
+        return list_audio_devices(self.audio_input, self.logger)
         
     def list_midi_ports(self) -> List[str]:
         """
@@ -210,11 +329,7 @@ def list_midi_ports(self) -> List[str]:
         Returns:
             List[str]: List of available MIDI ports
         """
-        ports = self.midi_output.list_output_ports()
-        self.logger.info("Available MIDI output ports:")
-        for i, port in enumerate(ports):
-            self.logger.info(f"  {i}: {port}")
-        return ports
+        return list_midi_ports(self.midi_output, self.logger)
         
     def set_debug(self, enabled: bool) -> None:
         """
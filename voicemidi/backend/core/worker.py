@@ -0,0 +1,188 @@
+"""
+Out-of-process analysis worker for the Voice-to-MIDI application.
+"""
+import copy
+import logging
+import multiprocessing
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from voicemidi.backend.analysis import analysis_window
+from voicemidi.backend.audio.shared_ring_buffer import SharedRingBuffer
+from voicemidi.backend.core.pipeline import AnalysisPipeline
+
+# One message per analyzed hop: position of its first sample, note to turn
+# off, note to turn on (0 for none), then seconds spent in pitch, onset and
+# decision
+BLOCK_RESULT = struct.Struct("<qhhfff")
+
+# Start the worker from a fresh interpreter; forking would copy the audio
+# and MIDI threads' state into the child
+WORKER_START_METHOD = "spawn"
+
+
+def run_worker(config: Dict[str, Dict[str, Any]], ring_name: str, capacity: int, max_read: int,
+               data_ready, ready, stop, connection) -> None:
+    """
+    Worker process entry point: analyze hops from the shared ring until stopped.
+
+    Args:
+        config (Dict[str, Dict[str, Any]]): Configuration sections
+        ring_name (str): Name of the shared ring's memory block
+        capacity (int): Ring capacity in samples
+        max_read (int): Largest read from the ring in samples
+        data_ready (multiprocessing.Event): Ring wake-up event
+        ready (multiprocessing.Event): Set once the detectors are initialized
+        stop (multiprocessing.Event): Set by the parent to end the worker
+        connection (Connection): Write end of the result pipe
+    """
+    ring = SharedRingBuffer(capacity, max_read, name=ring_name, event=data_ready)
+    pipeline = AnalysisPipeline(config)
+    hop_length = pipeline.hop_length
+    sample_rate = config["audio"]["sample_rate"]
+    ready.set()
+
+    try:
+        while not stop.is_set():
+            if not ring.wait(hop_length, 0.1):
+                continue
+            block = ring.read(hop_length)
+            if block is None:
+                continue
+            position = ring.read_position - hop_length
+
+            note_off, note_on = pipeline.process(block, (position + hop_length) / sample_rate)
+            pitch_time, onset_time, decision_time = pipeline.stage_times
+            connection.send_bytes(BLOCK_RESULT.pack(
+                position, note_off or 0, note_on or 0, pitch_time, onset_time, decision_time
+            ))
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        block = None
+        ring.close()
+        connection.close()
+
+
+class AnalysisWorker:
+    """
+    Runs pitch and onset analysis in a separate process.
+
+    Audio reaches the worker through a SharedRingBuffer, which it reads
+    one analysis hop at a time, and the note decisions come back as
+    fixed-size BLOCK_RESULT messages over a pipe, so the audio callback
+    and MIDI output never wait on analysis code holding this process's
+    GIL.
+    """
+
+    def __init__(self, config: Dict[str, Dict[str, Any]]):
+        """
+        Initialize the worker and its shared ring.
+
+        Args:
+            config (Dict[str, Dict[str, Any]]): Configuration sections, as in
+                Config.config
+        """
+        self.config = copy.deepcopy(config)
+        audio_config = self.config["audio"]
+        self.block_size = audio_config["block_size"]
+        _, self.hop_length = analysis_window(audio_config)
+
+        # Sized like AudioInput's own ring
+        self.context = multiprocessing.get_context(WORKER_START_METHOD)
+        read_size = max(self.block_size, self.hop_length)
+        self.ring_buffer = SharedRingBuffer(
+            max(2, audio_config["buffer_blocks"]) * read_size,
+            read_size,
+            context=self.context
+        )
+        self._ready = self.context.Event()
+        self._stop = self.context.Event()
+        self._receiver, self._sender = self.context.Pipe(duplex=False)
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.logger = logging.getLogger("VoiceMIDI.Worker")
+
+    def start(self, timeout: float = 30.0) -> bool:
+        """
+        Start the worker process and wait until it can take audio.
+
+        Args:
+            timeout (float): Seconds to wait for the worker to initialize
+
+        Returns:
+            bool: True if the worker is ready, False if it did not report in time
+        """
+        ring = self.ring_buffer
+        self.process = self.context.Process(
+            target=run_worker,
+            args=(self.config, ring.name, ring.capacity, ring.max_read,
+                  ring.event, self._ready, self._stop, self._sender),
+            name="VoiceMIDI-analysis",
+            daemon=True
+        )
+        self.process.start()
+        # The child holds its own copy of the write end
+        self._sender.close()
+
+        # Importing and setting up the detectors takes a while in a fresh
+        # interpreter; audio captured meanwhile would overflow the ring
+        if not self._ready.wait(timeout):
+            self.logger.error("Analysis worker did not start in time")
+            return False
+        self.logger.info(f"Analysis worker started (pid {self.process.pid})")
+        return True
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Stop the worker process and free the shared ring.
+
+        Args:
+            timeout (float): Seconds to wait before terminating the worker
+        """
+        if self.process is not None:
+            self._stop.set()
+            self.ring_buffer.event.set()
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.logger.warning("Analysis worker did not stop, terminating it")
+                self.process.terminate()
+                self.process.join()
+            self.process = None
+        self._receiver.close()
+        self.ring_buffer.close()
+        self.logger.info("Analysis worker stopped")
+
+    def poll(self, timeout: float = 0.1) -> bool:
+        """
+        Wait for the next hop's result.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            bool: True if a result can be received without blocking
+        """
+        try:
+            return self._receiver.poll(timeout)
+        except (EOFError, OSError):
+            return False
+
+    def receive(self) -> Optional[Tuple[int, int, int, Tuple[float, float, float]]]:
+        """
+        Receive one hop's result.
+
+        Returns:
+            tuple: (position of the hop's first sample, note to turn off,
+                note to turn on, (pitch, onset, decision) seconds), with 0 for
+                no note, or None if the worker has exited
+        """
+        try:
+            data = self._receiver.recv_bytes()
+        except (EOFError, OSError):
+            return None
+        position, note_off, note_on, *stage_times = BLOCK_RESULT.unpack(data)
+        return position, note_off, note_on, tuple(stage_times)
+
+    def is_alive(self) -> bool:
+        """Check whether the worker process is running."""
+        return self.process is not None and self.process.is_alive()
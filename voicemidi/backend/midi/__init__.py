@@ -1,5 +1,6 @@
 """MIDI output for Voice-to-MIDI application."""
 
 from voicemidi.backend.midi.midi_output import MidiOutput
+from voicemidi.backend.midi.null_port import NullMidiPort
 
-__all__ = ["MidiOutput"] 
\ No newline at end of file
+__all__ = ["MidiOutput", "NullMidiPort"] 
\ No newline at end of file
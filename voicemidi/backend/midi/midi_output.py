@@ -3,7 +3,31 @@
 import threading
 import queue
 import logging
-from typing import List, Optional, Any
+from importlib.metadata import PackageNotFoundError, version
+from typing import List, Optional, Any, Sequence
+
+# MIDI status bytes (upper nibble; the channel goes in the lower nibble)
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+CONTROL_CHANGE = 0xB0
+PITCH_BEND = 0xE0
+
+# Controller number of the "all notes off" channel mode message
+ALL_NOTES_OFF = 123
+
+
+def _mido_keeps_rtmidi_out() -> bool:
+    """Check that mido's rtmidi ports hold their python-rtmidi MidiOut in ``_rt``."""
+    try:
+        major, minor = (int(part) for part in version("mido").split(".")[:2])
+    except (PackageNotFoundError, ValueError):
+        return False
+    return (1, 2) <= (major, minor) < (2, 0)
+
+
+# Whether raw bytes may go to the private python-rtmidi object of a mido
+# port; only the mido releases known to lay their ports out that way
+MIDO_RTMIDI_RAW_SEND = _mido_keeps_rtmidi_out()
 
 class MidiOutput:
     """
@@ -11,9 +35,15 @@ class MidiOutput:
     
     This class manages MIDI connections and sends MIDI messages
     to external devices such as DAWs or hardware synthesizers.
+    Messages are sent as raw byte lists: the note on/off messages for
+    the active channel and velocity are built once, and with the rtmidi
+    backend of mido 1.x the bytes go straight to python-rtmidi without
+    creating and validating a mido.Message per event. Sends are
+    serialized by a lock of this class rather than the port's.
     """
     
-    def __init__(self, virtual_port_name: str = "VoiceToMIDI", port_name: Optional[str] = None):
+    def __init__(self, virtual_port_name: str = "VoiceToMIDI", port_name: Optional[str] = None,
+                 port: Optional[Any] = None):
         """
         Initialize the MIDI output manager.
         
@@ -21,9 +51,12 @@ def __init__(self, virtual_port_name: str = "VoiceToMIDI", port_name: Optional[s
             virtual_port_name (str): Name for the virtual MIDI port
             port_name (str, optional): Name of the MIDI output port to use.
                 If None, will try to use IAC Driver or create a virtual port.
+            port (optional): An output port object to use instead of opening
+                one, such as a NullMidiPort
         """
         self.virtual_port_name = virtual_port_name
         self.port_name = port_name
+        self.port = port
         self.midi_out = None
         self.message_queue = queue.Queue()
         self.is_running = False
@@ -33,16 +66,79 @@ def __init__(self, virtual_port_name: str = "VoiceToMIDI", port_name: Optional[s
         self.channel = 0    # MIDI channel (0-15)
         self.logger = logging.getLogger("VoiceMIDI.MIDI")
         
+        # Raw sender bound to the port it was resolved for
+        self._raw_port = None
+        self._send_bytes = None
+        # Serializes sends from the processing thread and from stop()
+        self._send_lock = threading.Lock()
+        
+        # Prebuilt messages, indexed by note number
+        self._note_on_messages: List[List[int]] = []
+        self._note_off_messages: List[List[int]] = []
+        self._all_notes_off_messages = [
+            [CONTROL_CHANGE | channel, ALL_NOTES_OFF, 0] for channel in range(16)
+        ]
+        self._build_messages()
+    
+    def _build_messages(self) -> None:
+        """Prebuild the note on/off messages for the active channel and velocity."""
+        status = NOTE_ON | self.channel
+        self._note_on_messages = [[status, note, self.velocity] for note in range(128)]
+        self._note_off_messages = [[NOTE_OFF | self.channel, note, 0] for note in range(128)]
+    
+    def _bind_port(self) -> None:
+        """Pick the fastest way to send raw bytes to the open port."""
+        self._raw_port = self.midi_out
+        rt = getattr(self.midi_out, "_rt", None)
+        send_message = getattr(rt, "send_message", None)
+        send_bytes = getattr(self.midi_out, "send_bytes", None)
+        if MIDO_RTMIDI_RAW_SEND and callable(send_message):
+            # mido's rtmidi backend: hand the bytes to python-rtmidi directly.
+            # This skips the port's own lock and closed check; send_messages
+            # holds _send_lock and checks ``closed`` instead, and every send
+            # to the port goes through it
+            self._send_bytes = send_message
+        elif callable(send_bytes):
+            # Ports taking raw bytes themselves, such as NullMidiPort
+            self._send_bytes = send_bytes
+        else:
+            port = self.midi_out
+            self._send_bytes = lambda data: port.send(mido.Message.from_bytes(data))
+    
+    def send_messages(self, messages: Sequence[Sequence[int]]) -> None:
+        """
+        Send several raw MIDI messages in one call.
+        
+        Args:
+            messages (Sequence[Sequence[int]]): Complete MIDI messages as byte
+                values, e.g. [[0x80, 60, 0], [0x90, 62, 64]]; not validated
+        """
+        with self._send_lock:
+            port = self.midi_out
+            if not port or getattr(port, "closed", False):
+                return
+            if self._raw_port is not port:
+                self._bind_port()
+            send_bytes = self._send_bytes
+            for message in messages:
+                send_bytes(message)
+        
     def open_port(self) -> bool:
         """
         Open a MIDI output port.
         
-        First tries to use the specified port, then looks for IAC Driver
+        Uses the port object given to the constructor if any. Otherwise
+        first tries to use the specified port, then looks for IAC Driver
         ports, and finally creates a virtual output port if neither is available.
         
         Returns:
             bool: True if successfully opened a port, False otherwise
         """
+        if self.port is not None:
+            self.midi_out = self.port
+            self.logger.info(f"Using MIDI port: {getattr(self.port, 'name', self.port)}")
+            return True
+        
         available_ports = mido.get_output_names()
         self.logger.info(f"Available MIDI output ports: {available_ports}")
         
@@ -80,8 +176,10 @@ def close_port(self) -> None:
         """Close the MIDI output port."""
         if self.midi_out:
             self.all_notes_off()
-            self.midi_out.close()
-            self.midi_out = None
+            # Not while another thread is sending to it
+            with self._send_lock:
+                self.midi_out.close()
+                self.midi_out = None
             self.logger.info("MIDI output port closed")
     
     def send_note_on(self, note: int, velocity: Optional[int] = None) -> None:
@@ -94,17 +192,20 @@ def send_note_on(self, note: int, velocity: Optional[int] = None) -> None:
         """
         if not self.midi_out or note <= 0 or note > 127:
             return
+        if velocity is not None and not 0 <= velocity <= 127:
+            return
             
-        vel = velocity if velocity is not None else self.velocity
-        
         # Store the current note
         self.current_note = note
         
-        # Create and send the note on message
-        msg = mido.Message('note_on', note=note, velocity=vel, channel=self.channel)
-        self.midi_out.send(msg)
+        # Send the prebuilt note on message
+        if velocity is None:
+            self.send_messages((self._note_on_messages[note],))
+        else:
+            self.send_messages(([NOTE_ON | self.channel, note, velocity],))
         
-        self.logger.debug(f"Note ON: {note}, Velocity: {vel}")
+        self.logger.debug("Note ON: %d, Velocity: %d", note,
+                          self.velocity if velocity is None else velocity)
     
     def send_note_off(self, note: Optional[int] = None) -> None:
         """
@@ -124,25 +225,48 @@ def send_note_off(self, note: Optional[int] = None) -> None:
         if note is None or note <= 0 or note > 127:
             return
             
-        # Create and send the note off message
-        msg = mido.Message('note_off', note=note, velocity=0, channel=self.channel)
-        self.midi_out.send(msg)
+        # Send the prebuilt note off message
+        self.send_messages((self._note_off_messages[note],))
         
-        self.logger.debug(f"Note OFF: {note}")
+        self.logger.debug("Note OFF: %d", note)
         
         # Clear the current note if it matches
         if self.current_note == note:
             self.current_note = None
     
+    def send_note_change(self, note_off: Optional[int], note_on: Optional[int]) -> None:
+        """
+        Send a note off followed by a note on in one batch.
+        
+        Either note may be None to skip that message, so this also covers a
+        plain note on or note off.
+        
+        Args:
+            note_off (int, optional): MIDI note number to turn off (1-127)
+            note_on (int, optional): MIDI note number to turn on (1-127)
+        """
+        if not self.midi_out:
+            return
+            
+        messages = []
+        if note_off is not None and 0 < note_off <= 127:
+            messages.append(self._note_off_messages[note_off])
+            if self.current_note == note_off:
+                self.current_note = None
+        if note_on is not None and 0 < note_on <= 127:
+            messages.append(self._note_on_messages[note_on])
+            self.current_note = note_on
+        self.send_messages(messages)
+        
+        self.logger.debug("Note change: %s -> %s", note_off, note_on)
+    
     def all_notes_off(self) -> None:
         """Send all notes off message on all channels."""
         if not self.midi_out:
             return
             
         # Send control change 123 (all notes off) on all channels
-        for channel in range(16):
-            msg = mido.Message('control_change', control=123, value=0, channel=channel)
-            self.midi_out.send(msg)
+        self.send_messages(self._all_notes_off_messages)
             
         self.logger.debug("All notes off")
         self.current_note = None
@@ -156,6 +280,7 @@ def set_velocity(self, velocity: int) -> None:
         """
         if 0 <= velocity <= 127:
             self.velocity = velocity
+            self._build_messages()
     
     def set_channel(self, channel: int) -> None:
         """
@@ -166,6 +291,7 @@ def set_channel(self, channel: int) -> None:
         """
         if 0 <= channel <= 15:
             self.channel = channel
+            self._build_messages()
     
     def send_pitch_bend(self, value: float) -> None:
         """
@@ -181,8 +307,7 @@ def send_pitch_bend(self, value: float) -> None:
         bend_value = int((value + 1) * 8192)
         bend_value = max(0, min(16383, bend_value))
         
-        msg = mido.Message('pitchwheel', pitch=bend_value - 8192, channel=self.channel)
-        self.midi_out.send(msg)
+        self.send_messages(([PITCH_BEND | self.channel, bend_value & 0x7F, bend_value >> 7],))
     
     def send_control_change(self, control: int, value: int) -> None:
         """
@@ -195,8 +320,7 @@ def send_control_change(self, control: int, value: int) -> None:
         if not self.midi_out or not (0 <= control <= 127) or not (0 <= value <= 127):
             return
             
-        msg = mido.Message('control_change', control=control, value=value, channel=self.channel)
-        self.midi_out.send(msg)
+        self.send_messages(([CONTROL_CHANGE | self.channel, control, value],))
     
     def list_output_ports(self) -> List[str]:
         """
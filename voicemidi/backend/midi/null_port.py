@@ -0,0 +1,55 @@
+"""
+MIDI sink that discards messages, for running without a MIDI device.
+"""
+from typing import List, Sequence, Tuple
+
+
+class NullMidiPort:
+    """
+    Output port that counts messages instead of sending them.
+
+    Passed to MidiOutput as its port, it stands in for a device or
+    virtual port on machines without a MIDI backend, such as CI hosts,
+    and measures the application's own MIDI path without any driver
+    cost. MidiOutput hands it raw bytes through ``send_bytes``, the same
+    fast path it takes with python-rtmidi.
+    """
+
+    def __init__(self, name: str = "Null", record: bool = False):
+        """
+        Initialize the port.
+
+        Args:
+            name (str): Port name reported in logs
+            record (bool): Keep every message in ``messages``, e.g. to check
+                the notes sent in a test
+        """
+        self.name = name
+        self.record = record
+        self.messages: List[Tuple[int, ...]] = []
+        self.message_count = 0
+        self.closed = False
+
+    def send_bytes(self, data: Sequence[int]) -> None:
+        """
+        Accept one raw MIDI message.
+
+        Args:
+            data (Sequence[int]): The message as byte values
+        """
+        self.message_count += 1
+        if self.record:
+            self.messages.append(tuple(data))
+
+    def send(self, message) -> None:
+        """
+        Accept one mido.Message.
+
+        Args:
+            message (mido.Message): The message
+        """
+        self.send_bytes(message.bytes())
+
+    def close(self) -> None:
+        """Close the port."""
+        self.closed = True
@@ -0,0 +1,88 @@
+"""
+aubio-backed onset detection for the Voice-to-MIDI application.
+"""
+import aubio
+import numpy as np
+
+# Onset detection functions implemented by aubio.onset
+AUBIO_ONSET_METHODS = ("hfc", "energy", "complex", "phase", "wphase", "specdiff",
+                       "kl", "mkl", "specflux", "default")
+
+
+class AubioOnsetEngine:
+    """
+    Onset detection running aubio's C implementation.
+
+    aubio computes the detection function, adaptive threshold and peak
+    picking with persistent C state. Each incoming block is fed in hops
+    of ``hop_length`` samples, so onsets are located with sub-block
+    resolution while the Python overhead stays at one call per hop.
+    """
+
+    def __init__(self, sample_rate=44100, block_size=1024, frame_length=None,
+                 hop_length=None, method="hfc", threshold=0.3):
+        """
+        Initialize the aubio onset engine.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            block_size (int): Number of samples per incoming block
+            frame_length (int, optional): aubio window size; defaults to block_size
+            hop_length (int, optional): aubio hop size; defaults to a quarter of
+                the block. Must divide block_size.
+            method (str): aubio onset method, one of AUBIO_ONSET_METHODS
+            threshold (float): aubio peak-picking threshold
+        """
+        if method not in AUBIO_ONSET_METHODS:
+            raise ValueError(
+                f"Unknown aubio onset method '{method}', expected one of {AUBIO_ONSET_METHODS}"
+            )
+
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.frame_length = frame_length or block_size
+        self.hop_length = hop_length or max(1, block_size // 4)
+        if block_size % self.hop_length != 0:
+            raise ValueError(f"hop_length {self.hop_length} must divide block_size {block_size}")
+        self.method = method
+        self.threshold = threshold
+        self.frames_per_block = block_size // self.hop_length
+        self._samples = np.zeros(block_size, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Start over with fresh aubio state."""
+        self._onset = aubio.onset(self.method, self.frame_length, self.hop_length, self.sample_rate)
+        self._onset.set_threshold(self.threshold)
+        # Level gating and the minimum inter-onset interval are done by OnsetDetector
+        self._onset.set_silence(-100)
+        self._onset.set_minioi(0)
+
+    def set_threshold(self, threshold):
+        """
+        Set aubio's peak-picking threshold.
+
+        Args:
+            threshold (float): New threshold
+        """
+        self.threshold = threshold
+        self._onset.set_threshold(threshold)
+
+    def process(self, samples, spectrum=None):
+        """
+        Feed a new block to aubio.
+
+        Args:
+            samples (ndarray): The new block of ``block_size`` samples
+            spectrum (ndarray, optional): Unused; accepted for compatibility
+                with SpectralOnsetEngine
+
+        Returns:
+            float: 1.0 if aubio detected an onset in the block, otherwise 0.0
+        """
+        self._samples[:] = samples[-self.block_size:]
+        detected = False
+        for start in range(0, self.block_size, self.hop_length):
+            if self._onset(self._samples[start:start + self.hop_length])[0]:
+                detected = True
+        return 1.0 if detected else 0.0
@@ -0,0 +1,216 @@
+"""
+Onset detection functions for the Voice-to-MIDI application.
+"""
+import numpy as np
+
+
+class OnsetFunction:
+    """
+    Base class for spectral onset detection functions.
+
+    A function turns the spectra of the analysis frames that end in one
+    block into one detection value per frame. Functions that compare a
+    frame with earlier ones keep those frames between calls, in buffers
+    sized once for the engine's frames per block and FFT bins.
+    """
+
+    def __init__(self, frames_per_block, n_bins):
+        """
+        Initialize the detection function.
+
+        Args:
+            frames_per_block (int): Number of frames per call
+            n_bins (int): Number of rFFT bins per frame
+        """
+        self.frames_per_block = frames_per_block
+        self.n_bins = n_bins
+
+    def reset(self):
+        """Forget the frames kept from previous calls."""
+
+    def compute(self, spectra, magnitude, out):
+        """
+        Compute the detection values of the new frames.
+
+        Args:
+            spectra (ndarray): Complex spectra of the new frames, one row per frame
+            magnitude (ndarray): Magnitudes of ``spectra``
+            out (ndarray): Receives one detection value per frame
+        """
+        raise NotImplementedError
+
+
+class HighFrequencyContent(OnsetFunction):
+    """
+    High-frequency content: magnitudes weighted by bin index.
+
+    Stresses the broadband energy of percussive attacks and consonants
+    over the low harmonics of a sustained note. The cheapest function,
+    one matrix-vector product per block.
+    """
+
+    def __init__(self, frames_per_block, n_bins):
+        super().__init__(frames_per_block, n_bins)
+        self._weights = np.arange(n_bins, dtype=np.float64)
+
+    def compute(self, spectra, magnitude, out):
+        np.dot(magnitude, self._weights, out=out)
+
+
+class EnergyIncrease(OnsetFunction):
+    """
+    Rise in log frame energy over the previous frame, half-wave rectified.
+
+    Responds to any increase in loudness, measured in relative terms so
+    that the slow level changes of a held note stay small next to an
+    attack; insensitive to pitch changes at a constant level.
+    """
+
+    def __init__(self, frames_per_block, n_bins):
+        super().__init__(frames_per_block, n_bins)
+        self._energy = np.zeros(frames_per_block + 1, dtype=np.float64)
+        self._power = np.zeros((frames_per_block, n_bins), dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self._energy.fill(0.0)
+        self._has_previous = False
+
+    def compute(self, spectra, magnitude, out):
+        energy = self._energy
+        np.square(magnitude, out=self._power)
+        np.sum(self._power, axis=1, out=energy[1:])
+        np.log1p(energy[1:], out=energy[1:])
+        if not self._has_previous:
+            energy[0] = energy[1]
+            self._has_previous = True
+        np.subtract(energy[1:], energy[:-1], out=out)
+        np.maximum(out, 0.0, out=out)
+        energy[0] = energy[-1]
+
+
+class ComplexDomain(OnsetFunction):
+    """
+    Rectified complex-domain deviation.
+
+    Predicts each bin from the two previous frames, assuming constant
+    magnitude and phase advance, and sums the distance of the actual
+    spectrum from the prediction over the bins whose magnitude grew.
+    Catches soft onsets that change phase or pitch but hardly energy,
+    at about three times the cost of the magnitude-only functions.
+    """
+
+    def __init__(self, frames_per_block, n_bins):
+        super().__init__(frames_per_block, n_bins)
+        shape = (frames_per_block, n_bins)
+        # Previous frames ahead of the new ones: two phases, one magnitude
+        self._phase = np.zeros((frames_per_block + 2, n_bins), dtype=np.float64)
+        self._magnitude = np.zeros((frames_per_block + 1, n_bins), dtype=np.float64)
+        self._target = np.zeros(shape, dtype=np.float64)
+        self._deviation = np.zeros(shape, dtype=np.float64)
+        self._scratch = np.zeros(shape, dtype=np.float64)
+        self._growing = np.zeros(shape, dtype=bool)
+        self.reset()
+
+    def reset(self):
+        self._phase.fill(0.0)
+        self._magnitude.fill(0.0)
+        self._has_previous = False
+
+    def compute(self, spectra, magnitude, out):
+        phase = self._phase
+        previous = self._magnitude
+        np.arctan2(spectra.imag, spectra.real, out=phase[2:])
+        np.copyto(previous[1:], magnitude)
+        if not self._has_previous:
+            phase[0] = phase[2]
+            phase[1] = phase[2]
+            previous[0] = previous[1]
+            self._has_previous = True
+
+        # Predicted phase 2*phi[n-1] - phi[n-2]; distance from |X[n-1]| at
+        # that phase by the law of cosines
+        target = self._target
+        np.multiply(phase[1:-1], 2.0, out=target)
+        target -= phase[:-2]
+        np.subtract(phase[2:], target, out=target)
+        np.cos(target, out=target)
+        deviation = self._deviation
+        np.multiply(magnitude, previous[:-1], out=deviation)
+        deviation *= target
+        deviation *= -2.0
+        np.square(magnitude, out=self._scratch)
+        deviation += self._scratch
+        np.square(previous[:-1], out=self._scratch)
+        deviation += self._scratch
+        np.maximum(deviation, 0.0, out=deviation)
+        np.sqrt(deviation, out=deviation)
+
+        # Rectify: only bins getting louder count towards an onset
+        np.greater_equal(magnitude, previous[:-1], out=self._growing)
+        np.multiply(deviation, self._growing, out=deviation)
+        np.sum(deviation, axis=1, out=out)
+
+        phase[:2] = phase[-2:]
+        previous[0] = previous[-1]
+
+
+class SpectralFlux(OnsetFunction):
+    """
+    Log-compressed spectral flux, half-wave rectified.
+
+    Sums the rise of each bin's log magnitude over the previous frame.
+    The most robust general-purpose function for sung and spoken input.
+    """
+
+    def __init__(self, frames_per_block, n_bins, compression=100.0, use_numba=None):
+        """
+        Initialize the spectral flux function.
+
+        Args:
+            frames_per_block (int): Number of frames per call
+            n_bins (int): Number of rFFT bins per frame
+            compression (float): Log compression factor applied to magnitudes
+            use_numba (bool, optional): Rectify and sum with the compiled
+                kernel; by default whenever Numba is installed
+        """
+        super().__init__(frames_per_block, n_bins)
+        self.compression = compression
+        # Imported here like the pitch estimators, as it may load Numba
+        from voicemidi.backend.analysis import kernels
+        self._kernels = kernels
+        self.use_numba = kernels.resolve_numba(use_numba)
+        if self.use_numba:
+            kernels.warm_up()
+        # Log-magnitude spectra: the kept previous frame followed by the new ones
+        self._log_spectra = np.zeros((frames_per_block + 1, n_bins), dtype=np.float64)
+        self._rise = np.zeros((frames_per_block, n_bins), dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self._has_previous = False
+
+    def compute(self, spectra, magnitude, out):
+        new = self._log_spectra[1:]
+        np.multiply(magnitude, self.compression, out=new)
+        np.log1p(new, out=new)
+        if not self._has_previous:
+            self._log_spectra[0] = self._log_spectra[1]
+            self._has_previous = True
+
+        if self.use_numba:
+            self._kernels.rectified_flux(self._log_spectra, out)
+            return
+        np.subtract(self._log_spectra[1:], self._log_spectra[:-1], out=self._rise)
+        np.maximum(self._rise, 0.0, out=self._rise)
+        np.sum(self._rise, axis=1, out=out)
+        self._log_spectra[0] = self._log_spectra[-1]
+
+
+# Detection functions selectable through the ``onset.algorithm`` config key
+ONSET_FUNCTIONS = {
+    "hfc": HighFrequencyContent,
+    "energy": EnergyIncrease,
+    "complex": ComplexDomain,
+    "flux": SpectralFlux,
+}
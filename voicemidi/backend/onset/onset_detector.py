@@ -1,26 +1,46 @@
 import numpy as np
-import librosa
 import logging
 
+from voicemidi.backend.onset.functions import ONSET_FUNCTIONS
+from voicemidi.backend.onset.spectral import SpectralOnsetEngine
+
+# Onset algorithms available to the detector: the native detection functions,
+# aubio and the per-buffer librosa path
+ONSET_ALGORITHMS = tuple(ONSET_FUNCTIONS) + ("aubio", "librosa")
+
 class OnsetDetector:
     """
     Detects note onsets in audio data.
     
-    This class uses the librosa library to detect the onset of notes
-    in an audio signal, which can be used to trigger MIDI notes.
+    By default this class runs an incremental spectral engine that only
+    analyzes the frames of each new block, with spectral flux ("flux"),
+    high-frequency content ("hfc"), energy increase ("energy") or
+    complex-domain deviation ("complex") as the detection function and a
+    streaming peak picker on top. The "aubio" algorithm runs one of
+    aubio's C onset methods, and the "librosa" algorithm recomputes
+    librosa's onset strength over the whole block buffer.
+    Detected onsets can be used to trigger MIDI notes.
     """
     
     def __init__(self, sample_rate=44100, block_size=1024, 
-                 threshold=0.3, silence=-60, minimum_inter_onset_interval_ms=80):
+                 threshold=0.3, silence=-60, minimum_inter_onset_interval_ms=80,
+                 algorithm="flux", aubio_method="hfc", frame_length=None, hop_length=None):
         """
         Initialize the onset detector.
         
         Args:
             sample_rate (int): Audio sample rate in Hz
             block_size (int): Number of frames per block
-            threshold (float): Detection threshold (0-1)
+            threshold (float): Detection threshold (0-1): how far a peak must rise
+                above the running mean, relative to recent peaks
             silence (float): Silence threshold in dB
             minimum_inter_onset_interval_ms (int): Minimum time between onsets in milliseconds
+            algorithm (str): Onset algorithm, one of ONSET_ALGORITHMS
+            aubio_method (str): aubio onset method for the "aubio" algorithm
+            frame_length (int, optional): Onset analysis frame length, which may
+                span several blocks; defaults to block_size
+            hop_length (int, optional): Hop between onset frames; defaults to a
+                quarter of the block. Must divide block_size.
         """
         self.sample_rate = sample_rate
         self.block_size = block_size
@@ -33,6 +53,39 @@ def __init__(self, sample_rate=44100, block_size=1024,
         # Buffer for onset detection
         self.buffer = None
         self.buffer_size = 4  # Store multiple frames for better onset detection
+        self.level_buffer = np.zeros(self.buffer_size, dtype=np.float64)  # Mean square per frame
+        self.level_index = 0
+        
+        # Keep at least ~0.1 s of detection values in the running mean, however
+        # short the blocks are
+        history_blocks = max(self.buffer_size, int(round(0.1 * sample_rate / block_size)))
+        
+        # Onset detection engine
+        if algorithm not in ONSET_ALGORITHMS:
+            raise ValueError(
+                f"Unknown onset algorithm '{algorithm}', expected one of {ONSET_ALGORITHMS}"
+            )
+        self.algorithm = algorithm
+        self.engine = None
+        if algorithm in ONSET_FUNCTIONS:
+            self.engine = SpectralOnsetEngine(
+                sample_rate=sample_rate,
+                block_size=block_size,
+                frame_length=frame_length,
+                hop_length=hop_length,
+                function=algorithm,
+                history_blocks=history_blocks
+            )
+        elif algorithm == "aubio":
+            from voicemidi.backend.onset.aubio_onset import AubioOnsetEngine
+            self.engine = AubioOnsetEngine(
+                sample_rate=sample_rate,
+                block_size=block_size,
+                frame_length=frame_length,
+                hop_length=hop_length,
+                method=aubio_method,
+                threshold=threshold
+            )
         
         # Onset state
         self.last_onset_time = 0
@@ -42,36 +95,53 @@ def __init__(self, sample_rate=44100, block_size=1024,
         # Setup logger
         self.logger = logging.getLogger("VoiceMIDI.OnsetDetector")
         
-    def detect_onset(self, audio_data, current_time=None):
+    def detect_onset(self, audio_data, current_time=None, analysis=None):
         """
         Detect if there's an onset in the audio data.
         
         Args:
             audio_data (ndarray): Audio data
             current_time (float, optional): Current time in seconds
+            analysis (AnalysisFrame, optional): Shared analysis of the same block;
+                when given, its samples, level and spectrum are reused
             
         Returns:
             bool: True if onset detected, False otherwise
         """
-        if audio_data is None or len(audio_data) < self.block_size:
-            return False
-            
-        # Ensure audio data is float32 and properly shaped
-        audio_float = audio_data.astype(np.float32)
-        
-        # Update buffer
-        if self.buffer is None:
-            self.buffer = np.zeros((self.buffer_size, self.block_size), dtype=np.float32)
-            
-        # Shift buffer and add new audio data
-        self.buffer = np.roll(self.buffer, -1, axis=0)
-        self.buffer[-1] = audio_float
+        if analysis is not None:
+            audio_float = analysis.samples
+            mean_square = analysis.mean_square
+            spectrum = analysis.spectrum
+        else:
+            if audio_data is None or len(audio_data) < self.block_size:
+                return False
+                
+            # Ensure audio data is float32 and properly shaped
+            audio_float = audio_data.astype(np.float32)
+            mean_square = float(np.mean(np.square(audio_float)))
+            spectrum = None
         
-        # Concatenate buffer for processing
-        audio_concat = self.buffer.flatten()
+        # Keep the engine's spectrum and statistics current even for blocks
+        # that end up gated below
+        strength = 0.0
+        if self.engine is not None:
+            try:
+                strength = self.engine.process(audio_float, spectrum)
+            except Exception as e:
+                self.logger.error(f"Error in onset detection: {e}")
+                return False
+        else:
+            # Shift buffer and add new audio data
+            if self.buffer is None:
+                self.buffer = np.zeros((self.buffer_size, self.block_size), dtype=np.float32)
+            self.buffer = np.roll(self.buffer, -1, axis=0)
+            self.buffer[-1] = audio_float[-self.block_size:]
         
-        # Check if audio is loud enough (above silence threshold)
-        rms = np.sqrt(np.mean(np.square(audio_concat)))
+        # Check if audio is loud enough (above silence threshold); the buffered
+        # per-block mean squares give the level of the whole buffer
+        self.level_buffer[self.level_index] = mean_square
+        self.level_index = (self.level_index + 1) % self.buffer_size
+        rms = np.sqrt(np.mean(self.level_buffer))
         db = 20 * np.log10(rms) if rms > 0 else -100
         
         self.logger.debug(f"Audio level: {db:.1f} dB, silence threshold: {self.silence} dB")
@@ -84,7 +154,47 @@ def detect_onset(self, audio_data, current_time=None):
         if self.last_onset_sample > 0 and current_sample - self.last_onset_sample < self.min_interval_samples:
             self.logger.debug(f"Too soon for new onset ({(current_sample - self.last_onset_sample) / self.sample_rate:.3f} sec)")
             return False
+        
+        if self.engine is None:
+            return self._detect_onset_librosa(current_time, current_sample)
+        
+        self.logger.debug(f"Onset strength: {strength:.3f}, threshold: {self.threshold}")
+        if strength > self.threshold:
+            self._register_onset(current_time, current_sample)
+            return True
+        return False
+    
+    def _register_onset(self, current_time, current_sample):
+        """
+        Record a detected onset.
+        
+        Args:
+            current_time (float, optional): Current time in seconds
+            current_sample (int): Current position in samples
+        """
+        self.onset_count += 1
+        if current_time is not None:
+            self.last_onset_time = current_time
+        self.last_onset_sample = current_sample
+        self.logger.debug(f"Onset detected! Count: {self.onset_count}")
+    
+    def _detect_onset_librosa(self, current_time, current_sample):
+        """
+        Detect an onset by running librosa over the whole block buffer.
+        
+        Args:
+            current_time (float, optional): Current time in seconds
+            current_sample (int): Current position in samples
             
+        Returns:
+            bool: True if onset detected, False otherwise
+        """
+        # librosa takes seconds to import, so only this path loads it
+        import librosa
+        
+        # Concatenate buffer for processing
+        audio_concat = self.buffer.flatten()
+        
         try:
             # Use librosa for onset detection
             # First calculate onset strength signal
@@ -116,25 +226,22 @@ def detect_onset(self, audio_data, current_time=None):
                 
                 self.logger.debug(f"Detected {len(onsets)} potential onsets with strengths: {onset_strengths}")
                 
-                # Normalize onset strengths to 0-1 range
-                if std_strength > 0:
-                    normalized_strengths = (onset_strengths - mean_strength) / std_strength
-                    normalized_strengths = (normalized_strengths + 2) / 4  # Map to approximate 0-1 range
+                # Height above the mean relative to the strongest frame, the
+                # same 0-1 scale as the streaming peak picker
+                peak_strength = np.max(onset_env)
+                if peak_strength > 0:
+                    normalized_strengths = (onset_strengths - mean_strength) / peak_strength
                     
                     self.logger.debug(f"Normalized strengths: {normalized_strengths}, threshold: {self.threshold}")
                     
                     # Check if any onset is above threshold
                     if np.any(normalized_strengths > self.threshold):
-                        self.onset_count += 1
-                        if current_time is not None:
-                            self.last_onset_time = current_time
-                        self.last_onset_sample = current_sample
-                        self.logger.debug(f"Onset detected! Count: {self.onset_count}")
+                        self._register_onset(current_time, current_sample)
                         return True
                     else:
                         self.logger.debug("Onset strength below threshold")
                 else:
-                    self.logger.debug("Standard deviation is zero, can't normalize strengths")
+                    self.logger.debug("Onset strength is zero, can't normalize strengths")
             else:
                 self.logger.debug("No potential onsets detected")
             
@@ -161,6 +268,8 @@ def set_threshold(self, threshold):
         """
         if 0 <= threshold <= 1:
             self.threshold = threshold
+            if hasattr(self.engine, "set_threshold"):
+                self.engine.set_threshold(threshold)
             self.logger.debug(f"Onset threshold set to {threshold}")
     
     def set_silence(self, silence_db):
@@ -0,0 +1,108 @@
+"""
+Streaming peak picking for onset detection functions.
+"""
+from collections import deque
+
+import numpy as np
+
+
+class StreamingPeakPicker:
+    """
+    Causal peak picker with an adaptive threshold.
+
+    Each new detection-function value is compared with a running mean over
+    a fixed ring of recent values and scaled by a decaying envelope of
+    recent peaks, which makes the strength independent of the detection
+    function's units. A value only counts as a peak when it also tops
+    every value of the last ``pre_max`` frames. Running sums, the envelope
+    and a monotonic deque for the recent maximum keep each update O(1)
+    (amortized for the deque), independent of the history length.
+    """
+
+    def __init__(self, history=16, pre_max=1, decay=0.999):
+        """
+        Initialize the peak picker.
+
+        Args:
+            history (int): Number of recent values in the running mean
+            pre_max (int): Number of preceding frames a peak must exceed
+            decay (float): Per-frame decay factor of the peak envelope
+        """
+        if history < 1 or pre_max < 1:
+            raise ValueError(f"history and pre_max must be positive, got {history} and {pre_max}")
+        if not 0 < decay < 1:
+            raise ValueError(f"decay must be in (0, 1), got {decay}")
+
+        self.pre_max = pre_max
+        self.decay = decay
+        self._history = np.zeros(history, dtype=np.float64)
+        self._recent = deque()
+        self.reset()
+
+    def reset(self):
+        """Forget all previous values."""
+        self._history.fill(0.0)
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self._frame = 0
+        self._recent.clear()
+        self.envelope = 0.0
+
+    @property
+    def mean(self):
+        """Running mean of the recent values."""
+        return self._sum / self._count if self._count else 0.0
+
+    @property
+    def std(self):
+        """Running standard deviation of the recent values."""
+        if not self._count:
+            return 0.0
+        mean = self.mean
+        return float(np.sqrt(max(0.0, self._sum_squares / self._count - mean * mean)))
+
+    def push(self, value):
+        """
+        Add one detection-function value.
+
+        Args:
+            value (float): Detection-function value of the newest frame
+
+        Returns:
+            float: Height of the value above the running mean relative to
+                the peak envelope, roughly in 0-1, if it is a peak; otherwise 0
+        """
+        value = float(value)
+
+        # Compare against the statistics of the preceding frames
+        recent = self._recent
+        while recent and recent[0][0] < self._frame - self.pre_max:
+            recent.popleft()
+        is_peak = not recent or value > recent[0][1]
+        mean = self.mean
+        self.envelope = max(value, self.envelope * self.decay)
+
+        strength = 0.0
+        if is_peak and value > mean and self.envelope > 0:
+            strength = (value - mean) / self.envelope
+
+        # Running sums over the ring of recent values
+        old = self._history[self._index]
+        if self._count == len(self._history):
+            self._sum -= old
+            self._sum_squares -= old * old
+        else:
+            self._count += 1
+        self._history[self._index] = value
+        self._index = (self._index + 1) % len(self._history)
+        self._sum += value
+        self._sum_squares += value * value
+
+        # Monotonic deque: front is the largest of the last pre_max values
+        while recent and recent[-1][1] <= value:
+            recent.pop()
+        recent.append((self._frame, value))
+        self._frame += 1
+        return strength
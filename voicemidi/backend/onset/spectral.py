@@ -0,0 +1,130 @@
+"""
+Incremental spectral onset detection for the Voice-to-MIDI application.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from voicemidi.backend.analysis.fft import FftContext
+from voicemidi.backend.onset.functions import ONSET_FUNCTIONS
+from voicemidi.backend.onset.peak_picker import StreamingPeakPicker
+
+
+class SpectralOnsetEngine:
+    """
+    Streaming onset strength from a spectral detection function.
+
+    Only the analysis frames that end inside the newest block are
+    transformed, and the detection function (one of ONSET_FUNCTIONS)
+    keeps whatever earlier frames it compares against from the previous
+    call. The newest frame ends with the block, so when the shared
+    front-end's spectrum of the same frame is passed in, only the frames
+    before it are transformed. Each detection value then goes through a
+    StreamingPeakPicker, so the cost per block is O(new frames)
+    regardless of how much history the adaptive threshold covers.
+    """
+
+    def __init__(self, sample_rate=44100, block_size=1024, frame_length=None,
+                 hop_length=None, function="flux", history_blocks=4,
+                 peak_half_life=5.0):
+        """
+        Initialize the spectral onset engine.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            block_size (int): Number of samples per incoming block
+            frame_length (int, optional): Analysis frame length; defaults to block_size
+            hop_length (int, optional): Hop between analysis frames; defaults to
+                a quarter of the block. Must divide block_size.
+            function (str): Detection function, one of ONSET_FUNCTIONS
+            history_blocks (int): Number of blocks of detection values in the
+                peak picker's running mean
+            peak_half_life (float): Seconds for the peak picker's envelope of
+                recent peaks to decay by half
+        """
+        if function not in ONSET_FUNCTIONS:
+            raise ValueError(
+                f"Unknown onset function '{function}', expected one of {tuple(ONSET_FUNCTIONS)}"
+            )
+
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.frame_length = frame_length or block_size
+        self.hop_length = hop_length or max(1, block_size // 4)
+        if block_size % self.hop_length != 0:
+            raise ValueError(f"hop_length {self.hop_length} must divide block_size {block_size}")
+        self.frames_per_block = block_size // self.hop_length
+
+        # Sample history: the tail needed by the first new frame, then the new block
+        self._carry = self.frame_length - self.hop_length
+        self._signal = np.zeros(self._carry + block_size, dtype=np.float64)
+        self._frames = sliding_window_view(self._signal, self.frame_length)[::self.hop_length]
+
+        # Spectra of the new frames, with a periodic Hann window matching the
+        # shared front-end
+        self._fft = FftContext(self.frame_length, window="hann", n_frames=self.frames_per_block)
+        self.window = self._fft.window
+        n_bins = self._fft.n_bins
+        self._spectra = self._fft.spectrum
+
+        # The frames before the newest, for when its spectrum is passed in
+        self._earlier_fft = None
+        if self.frames_per_block > 1:
+            self._earlier_fft = FftContext(self.frame_length, window="hann",
+                                           n_frames=self.frames_per_block - 1)
+        self._magnitude = np.zeros((self.frames_per_block, n_bins), dtype=np.float64)
+
+        self.function_name = function
+        self.function = ONSET_FUNCTIONS[function](self.frames_per_block, n_bins)
+
+        # A peak must dominate the last 30 ms, as in librosa's peak picking
+        hop_seconds = self.hop_length / sample_rate
+        self.peak_picker = StreamingPeakPicker(
+            history=history_blocks * self.frames_per_block,
+            pre_max=max(1, int(round(0.03 / hop_seconds))),
+            decay=0.5 ** (hop_seconds / peak_half_life)
+        )
+
+        # Detection values of the frames in the last block
+        self.values = np.zeros(self.frames_per_block, dtype=np.float64)
+
+    def reset(self):
+        """Forget the previous frames and the peak picker's statistics."""
+        self._signal.fill(0.0)
+        self.function.reset()
+        self.peak_picker.reset()
+
+    def _new_spectra(self, spectrum):
+        """Fill ``_spectra`` and ``_magnitude`` with the new frames."""
+        if spectrum is not None and len(spectrum) == self._spectra.shape[1]:
+            # The shared front-end already transformed the newest frame
+            if self._earlier_fft is not None:
+                self._spectra[:-1] = self._earlier_fft.rfft(self._frames[:-1])
+            self._spectra[-1] = spectrum
+        else:
+            self._fft.rfft(self._frames)
+        np.abs(self._spectra, out=self._magnitude)
+
+    def process(self, samples, spectrum=None):
+        """
+        Compute the onset strength of the frames ending in a new block.
+
+        Args:
+            samples (ndarray): The new block of ``block_size`` samples
+            spectrum (ndarray, optional): Precomputed complex spectrum of the
+                newest ``frame_length`` samples with the same window
+
+        Returns:
+            float: Largest peak strength among the new frames, roughly in
+                0-1 (0 if none of them is a peak)
+        """
+        # Slide the sample history by one block without reallocating
+        self._signal[:self._carry] = self._signal[-self._carry:] if self._carry else 0.0
+        self._signal[self._carry:] = samples[-self.block_size:]
+
+        self._new_spectra(spectrum)
+        self.function.compute(self._spectra, self._magnitude, self.values)
+
+        strength = 0.0
+        for value in self.values:
+            strength = max(strength, self.peak_picker.push(value))
+        return strength
@@ -1,5 +1,22 @@
 """Pitch detection for Voice-to-MIDI application."""
 
+from voicemidi.backend.pitch.base import PitchEstimator
 from voicemidi.backend.pitch.pitch_detector import PitchDetector
+from voicemidi.backend.pitch.registry import (
+    available_estimators,
+    create_estimator,
+    get_estimator_class,
+    register_estimator,
+)
+from voicemidi.backend.pitch.smoothing import SMOOTHING_STRATEGIES, NoteSmoother
 
-__all__ = ["PitchDetector"] 
\ No newline at end of file
+__all__ = [
+    "NoteSmoother",
+    "PitchDetector",
+    "PitchEstimator",
+    "SMOOTHING_STRATEGIES",
+    "available_estimators",
+    "create_estimator",
+    "get_estimator_class",
+    "register_estimator",
+]
@@ -0,0 +1,91 @@
+"""
+FFT autocorrelation pitch estimation for the Voice-to-MIDI application.
+"""
+import numpy as np
+
+from voicemidi.backend.analysis.fft import FftContext
+from voicemidi.backend.pitch.base import PitchEstimator, interpolate_peaks
+
+
+class AutocorrelationPitchEstimator(PitchEstimator):
+    """
+    Autocorrelation pitch estimator.
+
+    The cheapest of the estimators: the period is the highest peak of the
+    frame's linear autocorrelation after its first minimum, with peak
+    heights and positions refined by parabolic interpolation. The
+    confidence is the peak's height normalized by the frame energy and
+    corrected for the shrinking overlap at longer lags. The
+    autocorrelation is computed with one zero-padded FFT, or taken from
+    the shared front-end when given.
+    """
+
+    supports_tracking = True
+
+    def __init__(self, sample_rate=44100, frame_size=1024, min_frequency=50, max_frequency=1000):
+        """
+        Initialize the autocorrelation estimator.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Number of samples per analysis frame
+            min_frequency (float): Minimum detectable frequency in Hz
+            max_frequency (float): Maximum detectable frequency in Hz
+        """
+        super().__init__(sample_rate, frame_size, min_frequency, max_frequency)
+
+        # Lag search range; keeps at least half a frame of overlap
+        self.tau_min = max(2, int(np.floor(sample_rate / max_frequency)))
+        self.tau_max = max(self.tau_min + 1,
+                           min(int(np.ceil(sample_rate / min_frequency)), frame_size // 2))
+        n_lags = self.tau_max + 2
+
+        # FFT size for a linear (non-circular) autocorrelation
+        self.n_fft = 1 << int(np.ceil(np.log2(2 * frame_size)))
+        self._fft = FftContext(frame_size, self.n_fft)
+
+        # Work buffers reused on every call
+        self._frame = np.zeros(frame_size, dtype=np.float64)
+        self._acf = np.zeros(n_lags, dtype=np.float64)
+        self._slope = np.zeros(n_lags - 1, dtype=np.float64)
+        self._overlap = frame_size / (frame_size - np.arange(n_lags, dtype=np.float64))
+
+    def estimate(self, frame, autocorrelation=None):
+        """
+        Estimate the fundamental frequency of a frame.
+
+        Args:
+            frame (ndarray): Audio frame of at least ``frame_size`` samples
+            autocorrelation (ndarray, optional): Precomputed autocorrelation
+
+        Returns:
+            tuple: (frequency in Hz, confidence level in 0-1)
+        """
+        acf = self._acf
+        n_lags = len(acf)
+        if autocorrelation is None:
+            x = self._frame
+            np.copyto(x, frame[-self.frame_size:], casting="unsafe")
+            autocorrelation = self._fft.autocorrelation(x)
+        np.copyto(acf, autocorrelation[:n_lags])
+        energy = acf[0]
+        if energy <= 0:
+            return 0.0, 0.0
+
+        # Skip the lobe around lag 0: search from its first minimum
+        np.subtract(acf[1:], acf[:-1], out=self._slope)
+        rising = np.flatnonzero(self._slope[self.tau_min - 1:self.tau_max] > 0)
+        if len(rising) == 0:
+            return 0.0, 0.0
+        lo = self.tau_min + int(rising[0])
+
+        # Highest interpolated peak from there on
+        rises = self._slope[lo - 1:self.tau_max] > 0
+        candidates = np.flatnonzero(rises[:-1] & ~rises[1:]) + lo
+        if len(candidates) == 0:
+            return 0.0, 0.0
+        shifts, heights = interpolate_peaks(acf, candidates)
+        best = int(np.argmax(heights))
+        tau = int(candidates[best])
+        confidence = float(min(1.0, max(0.0, heights[best] * self._overlap[tau] / energy)))
+        return float(self.sample_rate / (tau + shifts[best])), confidence
@@ -0,0 +1,91 @@
+"""
+aubio-backed pitch estimation for the Voice-to-MIDI application.
+"""
+import aubio
+import numpy as np
+
+from voicemidi.backend.pitch.base import PitchEstimator
+
+# Pitch methods implemented by aubio.pitch
+AUBIO_PITCH_METHODS = ("yinfast", "yin", "yinfft", "mcomb", "fcomb", "schmitt", "specacf")
+
+# Methods for which aubio 0.4.9 always reports zero confidence
+NO_CONFIDENCE_METHODS = ("yinfft", "mcomb", "fcomb", "schmitt")
+
+
+class AubioPitchEstimator(PitchEstimator):
+    """
+    Pitch estimator running aubio's C implementation.
+
+    The aubio.pitch object keeps its analysis buffers and state between
+    calls, so each block costs a few microseconds of C with no Python-side
+    allocation beyond the float32 view aubio requires. Methods in
+    NO_CONFIDENCE_METHODS report a confidence of 1 for every pitch in
+    range, so they are not gated by ``min_confidence``.
+    """
+
+    # Some methods, e.g. mcomb and fcomb, carry state between blocks
+    stateful = True
+
+    def __init__(self, sample_rate=44100, frame_size=1024, min_frequency=50,
+                 max_frequency=1000, method="yinfast", tolerance=None):
+        """
+        Initialize the aubio pitch estimator.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Number of samples per block (aubio hop and window size)
+            min_frequency (float): Minimum accepted frequency in Hz
+            max_frequency (float): Maximum accepted frequency in Hz
+            method (str): aubio pitch method, one of AUBIO_PITCH_METHODS
+            tolerance (float, optional): aubio's periodicity tolerance; aubio's
+                per-method default when None
+        """
+        if method not in AUBIO_PITCH_METHODS:
+            raise ValueError(
+                f"Unknown aubio pitch method '{method}', expected one of {AUBIO_PITCH_METHODS}"
+            )
+
+        super().__init__(sample_rate, frame_size, min_frequency, max_frequency)
+        self.method = method
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        """
+        Start over with fresh aubio state, e.g. after a stretch of silence.
+
+        aubio.pitch cannot clear its state in place, so this builds a new
+        object; PitchDetector calls it once when the signal falls silent,
+        not on every silent block.
+        """
+        # aubio takes an integer rate; decimated rates such as 5512.5 Hz round
+        # to well under a cent of error
+        self._pitch = aubio.pitch(self.method, self.frame_size, self.frame_size,
+                                  int(round(self.sample_rate)))
+        self._pitch.set_unit("Hz")
+        # Level gating is done by PitchDetector
+        self._pitch.set_silence(-100)
+        if self.tolerance is not None:
+            self._pitch.set_tolerance(self.tolerance)
+
+    def estimate(self, frame, autocorrelation=None):
+        """
+        Estimate the pitch of one block.
+
+        Args:
+            frame (ndarray): Audio block; its last ``frame_size`` samples are used
+            autocorrelation (ndarray, optional): Unused; accepted for
+                compatibility with the other estimators
+
+        Returns:
+            tuple: (frequency in Hz, aubio's confidence), or (0, 0) when no
+                pitch in the configured range was found
+        """
+        samples = np.ascontiguousarray(frame[-self.frame_size:], dtype=np.float32)
+        frequency = float(self._pitch(samples)[0])
+        if not self.min_frequency <= frequency <= self.max_frequency:
+            return 0.0, 0.0
+        if self.method in NO_CONFIDENCE_METHODS:
+            return frequency, 1.0
+        return frequency, float(self._pitch.get_confidence())
@@ -0,0 +1,127 @@
+"""
+Common interface of the pitch estimators for the Voice-to-MIDI application.
+"""
+import numpy as np
+
+
+def interpolate_peaks(values, indices):
+    """
+    Refine local maxima by parabolic interpolation.
+
+    Comparing interpolated heights rather than the sampled ones keeps a
+    peak that falls between two lags from losing out to a multiple of
+    the period that happens to land on a whole lag, which matters at low
+    analysis rates.
+
+    Args:
+        values (ndarray): Sampled function, e.g. an autocorrelation
+        indices (ndarray): Indices of local maxima, excluding the first and
+            last element
+
+    Returns:
+        tuple: (offsets in -1..1 to add to ``indices``, interpolated heights)
+    """
+    a = values[indices - 1]
+    b = values[indices]
+    c = values[indices + 1]
+    denominator = a - 2.0 * b + c
+    curved = denominator < 0
+    shifts = np.zeros(len(indices), dtype=np.float64)
+    np.divide(0.5 * (a - c), denominator, out=shifts, where=curved)
+    shifts[np.abs(shifts) > 1.0] = 0.0
+    return shifts, b - 0.25 * (a - c) * shifts
+
+
+class PitchEstimator:
+    """
+    Base class for block-wise pitch estimators.
+
+    An estimator is built for one sample rate, frame size and frequency
+    range, sizes its work buffers once in ``__init__`` and is then called
+    with ``estimate`` once per block. Estimators that keep state across
+    blocks clear it in ``reset``, which PitchDetector calls when the
+    signal falls silent.
+    Subclasses are made selectable by name through the registry in
+    ``voicemidi.backend.pitch.registry``.
+
+    Estimators whose confidence measures the periodicity of the frame at
+    the chosen lag set ``supports_tracking``, letting PitchDetector
+    replace their full search by a narrowed one while a note is held
+    (see ``voicemidi.backend.pitch.tracking``).
+
+    Estimators whose result for a frame depends on the frames before it
+    set ``stateful``; they only run on a stream and cannot analyze a
+    batch of independent frames.
+    """
+
+    # Whether LagTracker confidences are comparable to this estimator's
+    supports_tracking = False
+
+    # Whether estimate's result depends on the frames analyzed before
+    stateful = False
+
+    def __init__(self, sample_rate=44100, frame_size=1024, min_frequency=50, max_frequency=1000):
+        """
+        Initialize the estimator.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Number of samples per analysis frame
+            min_frequency (float): Minimum detectable frequency in Hz
+            max_frequency (float): Maximum detectable frequency in Hz
+        """
+        if not 0 < min_frequency < max_frequency:
+            raise ValueError(f"Invalid frequency range {min_frequency}-{max_frequency} Hz")
+
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.min_frequency = min_frequency
+        self.max_frequency = max_frequency
+
+    def reset(self):
+        """Forget any state carried over from previous frames."""
+
+    def estimate(self, frame, autocorrelation=None):
+        """
+        Estimate the fundamental frequency of a frame.
+
+        Args:
+            frame (ndarray): Audio frame of at least ``frame_size`` samples
+            autocorrelation (ndarray, optional): Linear autocorrelation of the
+                same frame, as computed by SpectralFrontEnd; estimators that
+                do not use it ignore it
+
+        Returns:
+            tuple: (frequency in Hz, confidence level in 0-1), or (0, 0) when
+                no pitch was found
+        """
+        raise NotImplementedError
+
+    def estimate_batch(self, frames):
+        """
+        Estimate the fundamental frequency of every row of a frame matrix.
+
+        The rows are independent frames. This default calls ``estimate``
+        on each row in turn; estimators that can analyze all rows at once
+        override it. Stateful estimators cannot run on a batch.
+
+        Args:
+            frames (ndarray): Frames of at least ``frame_size`` samples, one per row
+
+        Returns:
+            tuple: (frequencies in Hz, confidence levels in 0-1) as float64
+                arrays with one value per row, 0 where no pitch was found
+
+        Raises:
+            ValueError: If the estimator is stateful
+        """
+        if self.stateful:
+            raise ValueError(
+                f"{type(self).__name__} carries state between frames and cannot "
+                f"analyze a batch of independent frames"
+            )
+        frequencies = np.zeros(len(frames), dtype=np.float64)
+        confidences = np.zeros(len(frames), dtype=np.float64)
+        for i, frame in enumerate(frames):
+            frequencies[i], confidences[i] = self.estimate(frame)
+        return frequencies, confidences
@@ -0,0 +1,179 @@
+"""
+Per-block cost and accuracy benchmark of the registered pitch estimators.
+
+Run with ``python -m voicemidi.backend.pitch.benchmark``.
+"""
+import argparse
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from voicemidi.backend.pitch.registry import available_estimators, create_estimator
+
+# Test tones as MIDI notes, E2 to C6 in major thirds
+BENCHMARK_NOTES = tuple(range(40, 85, 4))
+
+
+def make_voice_tone(frequency: float, n_samples: int, sample_rate: int,
+                    n_harmonics: int = 6, noise: float = 0.01, seed: int = 0) -> np.ndarray:
+    """
+    Generate a voice-like test tone with decaying harmonics and a little noise.
+
+    Args:
+        frequency (float): Fundamental frequency in Hz
+        n_samples (int): Number of samples
+        sample_rate (int): Audio sample rate in Hz
+        n_harmonics (int): Number of harmonics, with amplitudes falling as 1/h
+        noise (float): Standard deviation of the added white noise
+        seed (int): Noise seed
+
+    Returns:
+        ndarray: The tone as float32, peaking around 0.5
+    """
+    t = np.arange(n_samples) / sample_rate
+    harmonics = np.arange(1, n_harmonics + 1)
+    harmonics = harmonics[harmonics * frequency < sample_rate / 2]
+    wave = (np.sin(2 * np.pi * frequency * np.outer(harmonics, t)) / harmonics[:, None]).sum(axis=0)
+    wave *= 0.5 / np.abs(wave).max()
+    wave += noise * np.random.default_rng(seed).standard_normal(n_samples)
+    return wave.astype(np.float32)
+
+
+def benchmark_estimator(name: str, sample_rate: int = 44100, frame_size: int = 1024,
+                        min_frequency: float = 50, max_frequency: float = 1000,
+                        notes: Iterable[int] = BENCHMARK_NOTES, blocks: int = 50,
+                        **options) -> Dict[str, Any]:
+    """
+    Measure one estimator's cost per block and its accuracy on test tones.
+
+    Each note is fed as ``blocks`` consecutive blocks of a continuous tone,
+    so estimators that track pitch across blocks see a realistic stream.
+
+    Args:
+        name (str): Registered estimator name
+        sample_rate (int): Audio sample rate in Hz
+        frame_size (int): Number of samples per block
+        min_frequency (float): Minimum detectable frequency in Hz
+        max_frequency (float): Maximum detectable frequency in Hz
+        notes (Iterable[int]): MIDI notes to test; notes outside the
+            frequency range are skipped
+        blocks (int): Number of blocks per note
+        **options: Estimator-specific keyword arguments
+
+    Returns:
+        dict: name, mean microseconds per block, real-time factor (cost
+            over block duration), share of blocks with a pitch, median
+            absolute error in cents and share of octave errors
+    """
+    estimator = create_estimator(name, sample_rate=sample_rate, frame_size=frame_size,
+                                 min_frequency=min_frequency, max_frequency=max_frequency,
+                                 **options)
+
+    elapsed = 0.0
+    errors: List[float] = []
+    n_blocks = 0
+    for note in notes:
+        frequency = 440.0 * 2.0 ** ((note - 69) / 12)
+        if not min_frequency <= frequency <= max_frequency:
+            continue
+        tone = make_voice_tone(frequency, frame_size * blocks, sample_rate, seed=note)
+        estimator.reset()
+        for start in range(0, len(tone), frame_size):
+            block = tone[start:start + frame_size]
+            started = time.perf_counter()
+            pitch, _ = estimator.estimate(block)
+            elapsed += time.perf_counter() - started
+            n_blocks += 1
+            if pitch > 0:
+                errors.append(1200.0 * np.log2(pitch / frequency))
+
+    if n_blocks == 0:
+        raise ValueError("No benchmark notes fall inside the frequency range")
+
+    cents = np.abs(np.asarray(errors))
+    per_block = elapsed / n_blocks
+    return {
+        "name": name,
+        "us_per_block": per_block * 1e6,
+        "real_time_factor": per_block * sample_rate / frame_size,
+        "detection_rate": len(errors) / n_blocks,
+        "median_error_cents": float(np.median(cents)) if len(cents) else float("nan"),
+        "octave_error_rate": float(np.mean(np.abs(cents - 1200) < 100)) if len(cents) else 0.0,
+    }
+
+
+def benchmark_estimators(names: Optional[Sequence[str]] = None, **kwargs) -> List[Dict[str, Any]]:
+    """
+    Benchmark several estimators with the same settings.
+
+    Estimators that cannot be created, e.g. because an optional library is
+    missing, are reported with an ``error`` entry instead of results.
+
+    Args:
+        names (Sequence[str], optional): Estimator names; all registered
+            estimators when None
+        **kwargs: Settings passed to benchmark_estimator
+
+    Returns:
+        list: One result dict per estimator
+    """
+    results = []
+    for name in names or available_estimators():
+        try:
+            results.append(benchmark_estimator(name, **kwargs))
+        except ImportError as e:
+            results.append({"name": name, "error": str(e)})
+    return results
+
+
+def format_results(results: Sequence[Dict[str, Any]]) -> str:
+    """
+    Format benchmark results as a text table.
+
+    Args:
+        results (Sequence[Dict[str, Any]]): Results from benchmark_estimators
+
+    Returns:
+        str: The table
+    """
+    lines = [
+        f"{'estimator':<10} {'us/block':>9} {'RTF':>8} {'voiced':>7} {'cents':>7} {'octave':>7}"
+    ]
+    for result in results:
+        if "error" in result:
+            lines.append(f"{result['name']:<10} unavailable: {result['error']}")
+            continue
+        lines.append(
+            f"{result['name']:<10} {result['us_per_block']:>9.1f} "
+            f"{result['real_time_factor']:>8.4f} "
+            f"{result['detection_rate']:>7.1%} {result['median_error_cents']:>7.1f} "
+            f"{result['octave_error_rate']:>7.1%}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point of the pitch estimator benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the registered pitch estimators")
+    parser.add_argument("estimators", nargs="*", help="Estimators to run (default: all registered)")
+    parser.add_argument("--sample-rate", type=int, default=44100, help="Sample rate in Hz")
+    parser.add_argument("--block-size", type=int, default=1024, help="Samples per block")
+    parser.add_argument("--min-frequency", type=float, default=50, help="Minimum frequency in Hz")
+    parser.add_argument("--max-frequency", type=float, default=1000, help="Maximum frequency in Hz")
+    parser.add_argument("--blocks", type=int, default=50, help="Blocks per test note")
+    args = parser.parse_args(argv)
+
+    results = benchmark_estimators(
+        args.estimators or None,
+        sample_rate=args.sample_rate,
+        frame_size=args.block_size,
+        min_frequency=args.min_frequency,
+        max_frequency=args.max_frequency,
+        blocks=args.blocks,
+    )
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Harmonic product spectrum pitch estimation for the Voice-to-MIDI application.
+"""
+import numpy as np
+
+from voicemidi.backend.analysis.fft import FftContext
+from voicemidi.backend.pitch.base import PitchEstimator
+
+
+class HarmonicProductSpectrumEstimator(PitchEstimator):
+    """
+    Harmonic product spectrum (HPS) pitch estimator.
+
+    Sums the log magnitude spectrum with copies of itself decimated by
+    2..``n_harmonics``, so the bins where every harmonic lines up stand
+    out, and takes the highest one in the frequency range. The peak is
+    refined by parabolic interpolation of the log spectrum, and the
+    confidence is the share of the frame's power that falls on the
+    harmonics. Works in the frequency domain, so it ignores the shared
+    autocorrelation; the window, the zero-padded FFT input and the
+    product are sized once.
+    """
+
+    def __init__(self, sample_rate=44100, frame_size=1024, min_frequency=50,
+                 max_frequency=1000, n_harmonics=4, padding=4, fundamental_floor=1e-3):
+        """
+        Initialize the HPS estimator.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Number of samples per analysis frame
+            min_frequency (float): Minimum detectable frequency in Hz
+            max_frequency (float): Maximum detectable frequency in Hz
+            n_harmonics (int): Number of harmonics multiplied together
+            padding (int): Zero-padding factor of the FFT, for finer bins
+            fundamental_floor (float): Power, relative to the strongest bin,
+                below which a candidate fundamental is moved up an octave
+        """
+        super().__init__(sample_rate, frame_size, min_frequency, max_frequency)
+        if n_harmonics < 2:
+            raise ValueError(f"n_harmonics must be at least 2, got {n_harmonics}")
+        self.n_harmonics = n_harmonics
+        self.fundamental_floor = fundamental_floor
+
+        self.n_fft = 1 << int(np.ceil(np.log2(padding * frame_size)))
+        n_bins = self.n_fft // 2 + 1
+        self.bin_width = sample_rate / self.n_fft
+
+        # Fundamental bins whose harmonics all stay below Nyquist
+        self.n_product = n_bins // n_harmonics
+        self.bin_min = max(1, int(np.floor(min_frequency / self.bin_width)))
+        self.bin_max = min(self.n_product - 2, int(np.ceil(max_frequency / self.bin_width)))
+        if self.bin_max <= self.bin_min:
+            raise ValueError("Frequency range too narrow for the HPS resolution")
+
+        # Half-width of a harmonic's main lobe in bins (Hann: two unpadded bins)
+        self.lobe = max(1, 2 * self.n_fft // frame_size)
+
+        # Work buffers reused on every call
+        self._fft = FftContext(frame_size, self.n_fft, window=np.hanning(frame_size))
+        self.window = self._fft.window
+        self._power = np.zeros(n_bins, dtype=np.float64)
+        self._log_power = np.zeros(n_bins, dtype=np.float64)
+        self._product = np.zeros(self.n_product, dtype=np.float64)
+        self._cumulative = np.zeros(n_bins + 1, dtype=np.float64)
+        self._harmonics = np.arange(1, n_harmonics + 1, dtype=np.float64)
+        self._centers = np.zeros(n_harmonics, dtype=np.intp)
+        self._lo = np.zeros(n_harmonics, dtype=np.intp)
+        self._hi = np.zeros(n_harmonics, dtype=np.intp)
+
+    def estimate(self, frame, autocorrelation=None):
+        """
+        Estimate the fundamental frequency of a frame.
+
+        Args:
+            frame (ndarray): Audio frame of at least ``frame_size`` samples
+            autocorrelation (ndarray, optional): Unused; accepted for
+                compatibility with the other estimators
+
+        Returns:
+            tuple: (frequency in Hz, confidence level in 0-1)
+        """
+        spectrum = self._fft.rfft(frame)
+        power = self._power
+        np.multiply(spectrum.real, spectrum.real, out=power)
+        power += np.square(spectrum.imag, out=self._log_power)
+        total = power.sum()
+        if total <= 0:
+            return 0.0, 0.0
+
+        # Log power keeps the product of small magnitudes from underflowing
+        log_power = self._log_power
+        np.add(power, total * 1e-12, out=log_power)
+        np.log(log_power, out=log_power)
+        product = self._product
+        np.copyto(product, log_power[:self.n_product])
+        for harmonic in range(2, self.n_harmonics + 1):
+            product += log_power[:harmonic * self.n_product:harmonic]
+
+        peak = self.bin_min + int(np.argmax(product[self.bin_min:self.bin_max + 1]))
+
+        # HPS errs an octave low when the odd harmonics are weak; move up
+        # while the candidate has no energy of its own
+        floor = power.max() * self.fundamental_floor
+        while power[peak] < floor and 2 * peak + 2 <= self.bin_max:
+            peak *= 2
+
+        # The product's maximum can sit a bin or two off the fundamental's
+        # spectral peak; snap to it before interpolating
+        lo = max(self.bin_min, peak - 2)
+        peak = lo + int(np.argmax(power[lo:min(self.bin_max, peak + 2) + 1]))
+
+        # Parabolic interpolation of the log spectrum around the fundamental
+        a, b, c = log_power[peak - 1], log_power[peak], log_power[peak + 1]
+        denominator = a - 2.0 * b + c
+        shift = 0.5 * (a - c) / denominator if denominator < 0 else 0.0
+        if abs(shift) > 1.0:
+            shift = 0.0
+        frequency = (peak + shift) * self.bin_width
+        if not self.min_frequency <= frequency <= self.max_frequency:
+            return 0.0, 0.0
+
+        # Share of the power within one main lobe of each harmonic, narrowed
+        # so neighbouring harmonics are not counted twice
+        lobe = max(1, min(self.lobe, int(peak + shift) // 2))
+        np.cumsum(power, out=self._cumulative[1:])
+        np.rint(self._harmonics * (peak + shift), out=self._centers, casting="unsafe")
+        np.subtract(self._centers, lobe, out=self._lo)
+        np.add(self._centers, lobe + 1, out=self._hi)
+        np.clip(self._lo, 0, len(power), out=self._lo)
+        np.clip(self._hi, 0, len(power), out=self._hi)
+        harmonic_power = (self._cumulative[self._hi] - self._cumulative[self._lo]).sum()
+        confidence = float(min(1.0, harmonic_power / total))
+        return float(frequency), confidence
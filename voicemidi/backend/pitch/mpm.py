@@ -0,0 +1,129 @@
+"""
+McLeod Pitch Method (MPM) estimation for the Voice-to-MIDI application.
+"""
+import numpy as np
+
+from voicemidi.backend.analysis.fft import FftContext
+from voicemidi.backend.pitch.base import PitchEstimator, interpolate_peaks
+
+
+class McLeodPitchEstimator(PitchEstimator):
+    """
+    McLeod Pitch Method estimator.
+
+    Normalizes the frame's autocorrelation into the normalized square
+    difference function (NSDF), whose peaks lie in [-1, 1] regardless of
+    level. Key maxima are refined by parabolic interpolation, the period
+    is the first one reaching ``cutoff`` times the highest, and its
+    interpolated height (the "clarity") is the confidence. The
+    autocorrelation can be taken from the shared front-end, and all work
+    buffers are sized once for the configured frame length.
+    """
+
+    supports_tracking = True
+
+    def __init__(self, sample_rate=44100, frame_size=1024, min_frequency=50,
+                 max_frequency=1000, cutoff=0.93):
+        """
+        Initialize the MPM estimator.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Number of samples per analysis frame
+            min_frequency (float): Minimum detectable frequency in Hz
+            max_frequency (float): Maximum detectable frequency in Hz
+            cutoff (float): Fraction of the highest key maximum a peak must
+                reach to be chosen as the period
+        """
+        super().__init__(sample_rate, frame_size, min_frequency, max_frequency)
+        self.cutoff = cutoff
+
+        # Lag search range; keeps at least half a frame of overlap
+        self.tau_min = max(2, int(np.floor(sample_rate / max_frequency)))
+        self.tau_max = max(self.tau_min + 1,
+                           min(int(np.ceil(sample_rate / min_frequency)), frame_size // 2))
+        n_lags = self.tau_max + 2
+
+        # FFT size for a linear (non-circular) autocorrelation
+        self.n_fft = 1 << int(np.ceil(np.log2(2 * frame_size)))
+        self._fft = FftContext(frame_size, self.n_fft)
+
+        # Work buffers reused on every call
+        self._frame = np.zeros(frame_size, dtype=np.float64)
+        self._square = np.zeros(frame_size, dtype=np.float64)
+        self._energy = np.zeros(frame_size + 1, dtype=np.float64)
+        self._norm = np.zeros(n_lags, dtype=np.float64)
+        self._scratch = np.zeros(n_lags, dtype=np.float64)
+        self._nsdf = np.zeros(n_lags, dtype=np.float64)
+        self._head_index = frame_size - np.arange(n_lags)
+        self._rising = np.zeros(n_lags - 1, dtype=bool)
+        self._peaks = np.zeros(n_lags - 2, dtype=bool)
+
+    def nsdf(self, frame, autocorrelation=None):
+        """
+        Compute the normalized square difference function.
+
+        Args:
+            frame (ndarray): Audio frame of at least ``frame_size`` samples
+            autocorrelation (ndarray, optional): Precomputed autocorrelation
+                of the same frame for lags 0..tau_max+1
+
+        Returns:
+            ndarray: NSDF for lags 0..tau_max+1 (an internal buffer that is
+                overwritten by the next call)
+        """
+        x = self._frame
+        np.copyto(x, frame[-self.frame_size:], casting="unsafe")
+        n_lags = len(self._nsdf)
+        if autocorrelation is None:
+            autocorrelation = self._fft.autocorrelation(x)
+
+        # m(tau) = sum_{j<N-tau} x_j^2 + x_{j+tau}^2 from the running energy
+        np.square(x, out=self._square)
+        self._energy[0] = 0.0
+        np.cumsum(self._square, out=self._energy[1:])
+        norm = self._norm
+        np.take(self._energy, self._head_index, out=norm)
+        np.subtract(self._energy[-1], self._energy[:n_lags], out=self._scratch)
+        norm += self._scratch
+
+        # n(tau) = 2 r(tau) / m(tau)
+        nsdf = self._nsdf
+        np.multiply(autocorrelation[:n_lags], 2.0, out=nsdf)
+        np.divide(nsdf, norm, out=nsdf, where=norm > 0)
+        nsdf[norm <= 0] = 0.0
+        return nsdf
+
+    def estimate(self, frame, autocorrelation=None):
+        """
+        Estimate the fundamental frequency of a frame.
+
+        Args:
+            frame (ndarray): Audio frame of at least ``frame_size`` samples
+            autocorrelation (ndarray, optional): Precomputed autocorrelation
+
+        Returns:
+            tuple: (frequency in Hz, confidence level in 0-1)
+        """
+        nsdf = self.nsdf(frame, autocorrelation)
+
+        # Local maxima of the positive lobes inside the lag range
+        np.greater(nsdf[1:], nsdf[:-1], out=self._rising)
+        np.greater(self._rising[:-1], self._rising[1:], out=self._peaks)
+        candidates = np.flatnonzero(self._peaks[self.tau_min - 1:self.tau_max]) + self.tau_min
+        candidates = candidates[nsdf[candidates] > 0]
+        if len(candidates) == 0:
+            return 0.0, 0.0
+
+        # The lobe around lag 0 is not a period; skip peaks before the first
+        # negative-going zero crossing
+        crossing = np.flatnonzero(nsdf[1:self.tau_max + 1] <= 0)
+        if len(crossing) > 0:
+            candidates = candidates[candidates > crossing[0] + 1]
+            if len(candidates) == 0:
+                return 0.0, 0.0
+
+        shifts, heights = interpolate_peaks(nsdf, candidates)
+        best = int(np.argmax(heights >= self.cutoff * heights.max()))
+        confidence = float(min(1.0, max(0.0, heights[best])))
+        return float(self.sample_rate / (candidates[best] + shifts[best])), confidence
@@ -1,18 +1,39 @@
 import numpy as np
-import librosa
-from collections import Counter
 import logging
 
+from voicemidi.backend.pitch.registry import available_estimators, create_estimator
+from voicemidi.backend.pitch.smoothing import NoteSmoother
+
+# Pitch algorithms selectable through the ``pitch.algorithm`` config key: the
+# registered estimators plus the per-block librosa path
+PITCH_ALGORITHMS = available_estimators() + ("librosa",)
+
 class PitchDetector:
     """
     Detects pitch from audio data and converts it to MIDI notes.
     
-    This class uses librosa to detect the fundamental frequency
-    of an audio signal and convert it to MIDI notes.
+    By default this class uses a streaming YIN estimator to detect the
+    fundamental frequency of an audio signal. Any estimator in the pitch
+    registry can be selected by name instead: "pyin" decodes pitch online
+    with a fixed-lag Viterbi HMM, "aubio" runs one of aubio's C pitch
+    methods, "mpm", "acf" and "hps" trade accuracy for CPU, and the
+    per-block librosa pYIN path is still available as the "librosa"
+    algorithm.
+    
+    With tracking enabled, once the yin, mpm or acf estimator has found
+    the same note on ``TRACKING_LOCK_BLOCKS`` blocks in a row, the
+    following blocks only search within ``tracking_semitones`` of it. A
+    low confidence, silence or a call to ``unlock`` (on an onset) goes
+    back to the full search.
     """
     
+    # Consecutive full searches agreeing on a note before tracking starts
+    TRACKING_LOCK_BLOCKS = 2
+    
     def __init__(self, sample_rate=44100, block_size=1024, 
-                 min_confidence=0.7, min_frequency=50, max_frequency=1000):
+                 min_confidence=0.7, min_frequency=50, max_frequency=1000,
+                 algorithm="yin", pyin_lag=2, aubio_method="yinfast",
+                 tracking=True, tracking_semitones=2, buffer_size=3, smoothing="mode"):
         """
         Initialize the pitch detector.
         
@@ -22,6 +43,16 @@ def __init__(self, sample_rate=44100, block_size=1024,
             min_confidence (float): Minimum confidence threshold (0-1)
             min_frequency (float): Minimum detectable frequency in Hz
             max_frequency (float): Maximum detectable frequency in Hz
+            algorithm (str): Pitch algorithm: a registered estimator name
+                (see PITCH_ALGORITHMS) or "librosa"
+            pyin_lag (int): Decoding lag in blocks for the "pyin" algorithm
+            aubio_method (str): aubio pitch method for the "aubio" algorithm
+            tracking (bool): Narrow the search around a held note, for the
+                estimators that support it
+            tracking_semitones (float): Half-width of the narrowed search
+            buffer_size (int): Number of blocks to smooth notes over
+            smoothing (str): Note smoothing strategy: "mode", "median" or
+                "hysteresis" (see NoteSmoother)
         """
         self.sample_rate = sample_rate
         self.block_size = block_size
@@ -31,39 +62,231 @@ def __init__(self, sample_rate=44100, block_size=1024,
         self.min_frequency = min_frequency
         self.max_frequency = max_frequency
         
+        # Pitch estimation engine
+        if algorithm != "librosa" and algorithm not in available_estimators():
+            raise ValueError(
+                f"Unknown pitch algorithm '{algorithm}', expected one of "
+                f"{available_estimators() + ('librosa',)}"
+            )
+        self.algorithm = algorithm
+        self.estimator = None
+        if algorithm != "librosa":
+            # Settings that only apply to one estimator
+            options = {
+                "pyin": {"lag": pyin_lag},
+                "aubio": {"method": aubio_method},
+            }.get(algorithm, {})
+            self.estimator = create_estimator(
+                algorithm,
+                sample_rate=sample_rate,
+                frame_size=block_size,
+                min_frequency=min_frequency,
+                max_frequency=max_frequency,
+                **options
+            )
+        
+        # Narrowed search around a held note
+        self.tracker = None
+        if tracking and self.estimator is not None and self.estimator.supports_tracking:
+            # Imported here like the estimators, as it may load Numba
+            from voicemidi.backend.pitch.tracking import LagTracker
+            self.tracker = LagTracker(
+                sample_rate=sample_rate,
+                frame_size=block_size,
+                min_frequency=min_frequency,
+                max_frequency=max_frequency,
+                semitones=tracking_semitones
+            )
+        self.locked_frequency = 0.0
+        self._lock_note = 0
+        self._lock_count = 0
+
+        # Whether the last block fell under the silence gate
+        self._silent = False
+        
         # Pitch tracking state
         self.last_midi_note = 0
-        self.note_buffer = []
-        self.buffer_size = 3  # Number of frames to buffer for smoothing
+        self.buffer_size = buffer_size
+        self.smoother = NoteSmoother(buffer_size, smoothing)
         
         # Setup logger
         self.logger = logging.getLogger("VoiceMIDI.PitchDetector")
         
-    def detect_pitch(self, audio_data):
+    def detect_pitch(self, audio_data, analysis=None):
         """
-        Detect the pitch from audio data using librosa.
+        Detect the pitch from audio data using the configured algorithm.
         
         Args:
             audio_data (ndarray): Audio data
+            analysis (AnalysisFrame, optional): Shared analysis of the same block;
+                when given, its samples, level and autocorrelation are reused
             
         Returns:
             tuple: (frequency in Hz, confidence level)
         """
-        if audio_data is None or len(audio_data) < self.block_size:
-            return 0, 0
+        if analysis is not None:
+            audio_float = analysis.samples
+            autocorrelation = analysis.autocorrelation
+            db = analysis.db
+        else:
+            if audio_data is None or len(audio_data) < self.block_size:
+                return 0, 0
+                
+            # Ensure audio data is float32 and properly shaped
+            audio_float = audio_data.astype(np.float32)
+            autocorrelation = None
             
-        # Ensure audio data is float32 and properly shaped
-        audio_float = audio_data.astype(np.float32)
-        
-        # Calculate RMS to check if there's actual sound
-        rms = np.sqrt(np.mean(np.square(audio_float)))
-        db = 20 * np.log10(rms) if rms > 0 else -100
+            # Calculate RMS to check if there's actual sound
+            rms = np.sqrt(np.mean(np.square(audio_float)))
+            db = 20 * np.log10(rms) if rms > 0 else -100
         
         # Skip processing if signal is too weak
         if db < -70:  # Very quiet - probably silence
             self.logger.debug(f"Signal too weak: {db:.1f} dB, skipping pitch detection")
+            # Estimator state only needs clearing once per stretch of silence
+            if self.estimator is not None and not self._silent:
+                self.estimator.reset()
+            self._silent = True
+            self.unlock()
             return 0, 0
+        self._silent = False
+        
+        if self.estimator is not None:
+            return self._detect_pitch_estimator(audio_float, autocorrelation)
+        return self._detect_pitch_librosa(audio_float)
+
+    def detect_pitch_batch(self, frames):
+        """
+        Detect the pitch of many frames at once, for offline analysis.
+
+        Every row is analyzed with a full search and the same silence and
+        confidence gates as detect_pitch, but without tracking or note
+        smoothing, so the rows are independent frames. The YIN estimator
+        analyzes all voiced rows together with one batched FFT; the other
+        estimators go through them one by one. Stateful estimators ("pyin"
+        and "aubio"), whose result depends on the frames before, are not
+        supported.
+
+        Args:
+            frames (ndarray): Frames of at least ``block_size`` samples, one per row
+
+        Returns:
+            tuple: (frequencies in Hz, confidence levels, MIDI note numbers)
+                with one value per row, 0 where no pitch was found
+
+        Raises:
+            ValueError: If frames is not a matrix of long enough frames, or
+                the estimator is stateful
+        """
+        if self.estimator is not None and self.estimator.stateful:
+            raise ValueError(
+                f"The '{self.algorithm}' algorithm carries state between frames "
+                f"and cannot analyze a batch of independent frames"
+            )
+        frames = np.asarray(frames)
+        if frames.ndim != 2 or frames.shape[1] < self.block_size:
+            raise ValueError(
+                f"Expected a 2-D array of frames of at least {self.block_size} samples, "
+                f"got shape {frames.shape}"
+            )
+        frames = frames[:, -self.block_size:]
+        n_frames = len(frames)
+        frequencies = np.zeros(n_frames, dtype=np.float64)
+        confidences = np.zeros(n_frames, dtype=np.float64)
+        midi_notes = np.zeros(n_frames, dtype=np.int64)
+
+        # Same silence gate as detect_pitch, per row
+        power = np.mean(np.square(frames, dtype=np.float64), axis=1)
+        voiced = np.flatnonzero(power > 10.0 ** (-70 / 10))
+        if len(voiced) == 0:
+            return frequencies, confidences, midi_notes
+
+        if self.estimator is not None:
+            found, certainty = self.estimator.estimate_batch(frames[voiced])
+        else:
+            found, certainty = np.zeros(len(voiced)), np.zeros(len(voiced))
+            for i, row in enumerate(voiced):
+                found[i], certainty[i] = self._detect_pitch_librosa(frames[row].astype(np.float32))
+
+        keep = (found > 0) & (certainty >= self.min_confidence)
+        rows = voiced[keep]
+        frequencies[rows] = found[keep]
+        confidences[rows] = certainty[keep]
+        midi_notes[rows] = np.rint(69 + 12 * np.log2(found[keep] / 440.0))
+        return frequencies, confidences, midi_notes
+
+    def _detect_pitch_estimator(self, audio_float, autocorrelation=None):
+        """
+        Detect the pitch with the configured estimator.
+        
+        Args:
+            audio_float (ndarray): Audio data as float32
+            autocorrelation (ndarray, optional): Precomputed autocorrelation of the block
+            
+        Returns:
+            tuple: (frequency in Hz, confidence level)
+        """
+        if self.locked_frequency > 0:
+            pitch, confidence = self.tracker.search(audio_float, self.locked_frequency)
+            if pitch > 0 and confidence >= self.min_confidence:
+                self.locked_frequency = pitch
+                self.logger.debug(f"Pitch tracked: {pitch:.1f} Hz, confidence: {confidence:.2f}")
+                return pitch, confidence
+            self.logger.debug("Lost the tracked pitch, searching the full range")
+            self.unlock()
+        
+        try:
+            pitch, confidence = self.estimator.estimate(audio_float, autocorrelation)
+        except Exception as e:
+            self.logger.error(f"Error in pitch detection: {e}")
+            return 0, 0
+        
+        if pitch <= 0 or confidence < self.min_confidence:
+            self.logger.debug(f"Confidence too low: {confidence:.2f} < {self.min_confidence}")
+            self._lock_count = 0
+            return 0, 0
+        
+        self.logger.debug(f"Pitch detected: {pitch:.1f} Hz, confidence: {confidence:.2f}")
+        if self.tracker is not None:
+            self._update_lock(pitch)
+        return pitch, confidence
+    
+    def _update_lock(self, frequency):
+        """
+        Start tracking once full searches keep finding the same note.
+        
+        Args:
+            frequency (float): Pitch found by the full search in Hz
+        """
+        midi_note = self.frequency_to_midi_note(frequency)
+        if midi_note == self._lock_note:
+            self._lock_count += 1
+        else:
+            self._lock_note = midi_note
+            self._lock_count = 1
+        if self._lock_count >= self.TRACKING_LOCK_BLOCKS:
+            self.locked_frequency = frequency
+            self.logger.debug(f"Tracking pitch around {frequency:.1f} Hz")
+    
+    def unlock(self):
+        """Stop tracking, so the next block searches the full range again."""
+        self.locked_frequency = 0.0
+        self._lock_note = 0
+        self._lock_count = 0
+    
+    def _detect_pitch_librosa(self, audio_float):
+        """
+        Detect the pitch with librosa's pYIN over the whole block.
+        
+        Args:
+            audio_float (ndarray): Audio data as float32
             
+        Returns:
+            tuple: (frequency in Hz, confidence level)
+        """
+        # librosa takes seconds to import, so only this path loads it
+        import librosa
+        
         # Use librosa's pitch detection (returns pitch and voiced confidence)
         try:
             # Extract pitch using pyin algorithm from librosa
@@ -139,20 +362,23 @@ def midi_note_to_name(self, midi_note):
         note = note_names[midi_note % 12]
         return f"{note}{octave}"
     
-    def get_midi_note(self, audio_data, smooth=True):
+    def get_midi_note(self, audio_data, smooth=True, analysis=None):
         """
         Get MIDI note from audio data with optional smoothing.
         
         Args:
             audio_data (ndarray): Audio data
             smooth (bool): Whether to apply note smoothing
+            analysis (AnalysisFrame, optional): Shared analysis of the same block
             
         Returns:
             tuple: (MIDI note number, confidence, note name)
         """
-        frequency, confidence = self.detect_pitch(audio_data)
+        frequency, confidence = self.detect_pitch(audio_data, analysis)
         
         if frequency <= 0:
+            # The note ended; the next one starts without its history
+            self.smoother.reset()
             return 0, confidence, "None"
             
         midi_note = self.frequency_to_midi_note(frequency)
@@ -160,17 +386,10 @@ def get_midi_note(self, audio_data, smooth=True):
         
         # Apply smoothing if enabled
         if smooth:
-            self.note_buffer.append(midi_note)
-            if len(self.note_buffer) > self.buffer_size:
-                self.note_buffer.pop(0)
-                
-            # Get the most common note in the buffer
-            if self.note_buffer:
-                counter = Counter(self.note_buffer)
-                midi_note = counter.most_common(1)[0][0]
-                
-                if midi_note != self.note_buffer[-1]:
-                    self.logger.debug(f"Smoothed MIDI note: {self.note_buffer[-1]} → {midi_note}")
+            smoothed = self.smoother.update(69 + 12 * np.log2(frequency / 440.0))
+            if smoothed != midi_note:
+                self.logger.debug(f"Smoothed MIDI note: {midi_note} → {smoothed}")
+            midi_note = smoothed
         
         note_name = self.midi_note_to_name(midi_note)
         return midi_note, confidence, note_name 
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Online probabilistic YIN (pYIN) pitch estimation for the Voice-to-MIDI application.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.special import betainc
+
+from voicemidi.backend.pitch.base import PitchEstimator
+from voicemidi.backend.pitch.yin import YinPitchEstimator
+
+
+class PyinPitchEstimator(PitchEstimator):
+    """
+    Online pYIN pitch estimator with fixed-lag Viterbi decoding.
+
+    Each frame's CMNDF troughs are turned into pitch-bin observation
+    probabilities as in pYIN, and a voiced/unvoiced pitch HMM is decoded
+    incrementally: the forward Viterbi scores and a ring of backpointers
+    are kept across calls, and the state ``lag`` frames in the past is
+    emitted by tracing back from the current best state. The pitch bins
+    and the banded transition weights are computed once at construction,
+    so each call costs one CMNDF plus O(n_bins * transition_width).
+    """
+
+    # Each call returns the decoded pitch of the frame ``lag`` calls earlier
+    stateful = True
+
+    def __init__(self, sample_rate=44100, frame_size=1024, min_frequency=50,
+                 max_frequency=1000, lag=2, resolution=0.1, n_thresholds=100,
+                 beta_parameters=(2, 18), boltzmann_parameter=2,
+                 max_transition_rate=35.92, switch_prob=0.01, no_trough_prob=0.01):
+        """
+        Initialize the online pYIN estimator.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Number of samples per analysis frame (one frame per call)
+            min_frequency (float): Minimum detectable frequency in Hz
+            max_frequency (float): Maximum detectable frequency in Hz
+            lag (int): Number of frames the decoded pitch lags behind the input
+            resolution (float): Pitch bin resolution in semitones
+            n_thresholds (int): Number of YIN thresholds to marginalize over
+            beta_parameters (tuple): Shape parameters of the threshold prior
+            boltzmann_parameter (float): Prior weight of earlier troughs
+            max_transition_rate (float): Maximum pitch change in octaves per second
+            switch_prob (float): Probability of switching voiced/unvoiced per frame
+            no_trough_prob (float): Weight given to the global minimum when no
+                trough is below a threshold
+        """
+        if lag < 0:
+            raise ValueError(f"lag must be non-negative, got {lag}")
+
+        super().__init__(sample_rate, frame_size, min_frequency, max_frequency)
+        self.lag = int(lag)
+        self.boltzmann_parameter = boltzmann_parameter
+        self.no_trough_prob = no_trough_prob
+
+        self._yin = YinPitchEstimator(sample_rate, frame_size, min_frequency, max_frequency)
+
+        # Threshold prior: probability mass of each threshold under a beta distribution
+        thresholds = np.linspace(0, 1, n_thresholds + 1)
+        self._thresholds = thresholds[1:]
+        self._beta_probs = np.diff(betainc(beta_parameters[0], beta_parameters[1], thresholds))
+
+        # Pitch bins covering the YIN lag range
+        self._bins_per_semitone = int(np.ceil(1.0 / resolution))
+        self._bins_per_octave = 12 * self._bins_per_semitone
+        self._fmin = sample_rate / self._yin.tau_max
+        fmax = sample_rate / self._yin.tau_min
+        self.n_bins = int(np.floor(self._bins_per_octave * np.log2(fmax / self._fmin))) + 1
+        self.bin_frequencies = self._fmin * 2.0 ** (np.arange(self.n_bins) / self._bins_per_octave)
+
+        # Banded triangular pitch transition, normalized per source bin
+        hop_seconds = frame_size / sample_rate
+        max_semitones = int(round(max_transition_rate * 12 * hop_seconds))
+        self._half_width = max(1, max_semitones * self._bins_per_semitone // 2)
+        offsets = np.arange(-self._half_width, self._half_width + 1)
+        weights = (self._half_width + 1 - np.abs(offsets)).astype(np.float64)
+        self._log_weights = np.log(weights / weights.sum())
+        source = np.arange(self.n_bins)[:, None] + offsets[None, :]
+        in_range = (source >= 0) & (source < self.n_bins)
+        self._log_norm = np.log((weights[None, :] * in_range).sum(axis=1) / weights.sum())
+        self._log_stay = np.log(1.0 - switch_prob)
+        self._log_switch = np.log(switch_prob)
+
+        # Decoder state, preallocated
+        n_states = 2 * self.n_bins
+        width = 2 * self._half_width + 1
+        self._delta = np.zeros(n_states, dtype=np.float64)
+        self._observation = np.zeros(n_states, dtype=np.float64)
+        self._padded = np.full((2, self.n_bins + width - 1), -np.inf, dtype=np.float64)
+        self._windows = sliding_window_view(self._padded, width, axis=1)
+        self._scores = np.zeros((2, self.n_bins, width), dtype=np.float64)
+        self._argmax = np.zeros((2, self.n_bins), dtype=np.intp)
+        self._best = np.zeros((2, self.n_bins), dtype=np.float64)
+        self._source = np.zeros((2, self.n_bins), dtype=np.intp)
+        self._bins = np.arange(self.n_bins)
+        self._backpointers = np.zeros((max(self.lag, 1), n_states), dtype=np.intp)
+        self._voiced_probs = np.zeros(self.lag + 1, dtype=np.float64)
+        self._step = 0
+
+    def reset(self):
+        """Forget the decoding history, e.g. after a stretch of silence."""
+        self._delta.fill(0.0)
+        self._voiced_probs.fill(0.0)
+        self._step = 0
+
+    def observe(self, frame, autocorrelation=None):
+        """
+        Compute the HMM observation probabilities for one frame.
+
+        Args:
+            frame (ndarray): Audio frame of at least ``frame_size`` samples
+            autocorrelation (ndarray, optional): Precomputed autocorrelation
+
+        Returns:
+            tuple: (observation probabilities over voiced then unvoiced states,
+                total voiced probability of the frame)
+        """
+        yin = self._yin
+        cmndf = yin.difference(frame, autocorrelation)
+        observation = self._observation
+        observation.fill(0.0)
+
+        # Troughs of the CMNDF inside the lag search range
+        segment = cmndf[yin.tau_min - 1:yin.tau_max + 2]
+        middle = segment[1:-1]
+        troughs = np.flatnonzero((middle < segment[:-2]) & (middle <= segment[2:]))
+
+        voiced_prob = 0.0
+        if len(troughs) > 0:
+            heights = middle[troughs]
+
+            # For every threshold, a Boltzmann prior over the troughs below it
+            below = heights[:, None] < self._thresholds[None, :]
+            positions = np.cumsum(below, axis=0) - 1
+            n_below = below.sum(axis=0)
+            decay = np.exp(-self.boltzmann_parameter)
+            prior = ((1 - decay) * decay ** positions
+                     / np.maximum(1 - decay ** n_below, 1e-12)[None, :])
+            probs = (below * prior * self._beta_probs[None, :]).sum(axis=1)
+            probs[np.argmin(heights)] += self.no_trough_prob * self._beta_probs[n_below == 0].sum()
+
+            # Parabolic refinement of each trough, then map to pitch bins
+            taus = troughs + yin.tau_min
+            a, b, c = cmndf[taus - 1], cmndf[taus], cmndf[taus + 1]
+            denominator = a - 2.0 * b + c
+            convex = denominator > 0
+            shift = np.where(convex, 0.5 * (a - c) / np.where(convex, denominator, 1.0), 0.0)
+            np.clip(shift, -1.0, 1.0, out=shift)
+            frequencies = self.sample_rate / (taus + shift)
+            bins = np.round(self._bins_per_octave * np.log2(frequencies / self._fmin))
+            bins = bins.astype(np.intp)
+            np.clip(bins, 0, self.n_bins - 1, out=bins)
+            np.add.at(observation, bins, probs)
+            voiced_prob = float(min(1.0, probs.sum()))
+
+        observation[self.n_bins:] = (1.0 - voiced_prob) / self.n_bins
+        return observation, voiced_prob
+
+    def _band_max(self):
+        """
+        Maximize over the banded pitch transition for both voicing halves.
+
+        Leaves the best predecessor score of every target bin in ``_best`` and
+        its source bin in ``_source``.
+        """
+        n = self.n_bins
+        h = self._half_width
+        self._padded[0, h:h + n] = self._delta[:n]
+        self._padded[1, h:h + n] = self._delta[n:]
+        self._padded[:, h:h + n] -= self._log_norm
+        np.add(self._windows, self._log_weights, out=self._scores)
+        np.argmax(self._scores, axis=2, out=self._argmax)
+        self._best[:] = np.take_along_axis(self._scores, self._argmax[:, :, None], axis=2)[:, :, 0]
+        np.add(self._argmax, self._bins - h, out=self._source)
+
+    def estimate(self, frame, autocorrelation=None):
+        """
+        Feed one frame to the decoder and return the lagged pitch decision.
+
+        Args:
+            frame (ndarray): Audio frame of at least ``frame_size`` samples
+            autocorrelation (ndarray, optional): Precomputed autocorrelation
+
+        Returns:
+            tuple: (frequency in Hz of the frame ``lag`` frames ago, its voiced
+                probability), or (0, 0) while unvoiced or still filling the lag
+        """
+        observation, voiced_prob = self.observe(frame, autocorrelation)
+        log_observation = np.log(observation + 1e-300)
+        n = self.n_bins
+        step = self._step
+        self._voiced_probs[step % (self.lag + 1)] = voiced_prob
+
+        if step == 0:
+            self._delta[:] = log_observation
+        else:
+            self._band_max()
+            voiced_stay = self._best[0] + self._log_stay
+            voiced_enter = self._best[1] + self._log_switch
+            unvoiced_stay = self._best[1] + self._log_stay
+            unvoiced_leave = self._best[0] + self._log_switch
+
+            pointers = self._backpointers[step % len(self._backpointers)]
+            stay = voiced_stay >= voiced_enter
+            pointers[:n] = np.where(stay, self._source[0], self._source[1] + n)
+            self._delta[:n] = np.where(stay, voiced_stay, voiced_enter)
+            stay = unvoiced_stay >= unvoiced_leave
+            pointers[n:] = np.where(stay, self._source[1] + n, self._source[0])
+            self._delta[n:] = np.where(stay, unvoiced_stay, unvoiced_leave)
+            self._delta += log_observation
+
+        self._delta -= self._delta.max()
+        self._step = step + 1
+
+        if step < self.lag:
+            return 0.0, 0.0
+
+        # Trace back from the current best state to the frame `lag` steps ago
+        state = int(np.argmax(self._delta))
+        for k in range(self.lag):
+            state = int(self._backpointers[(step - k) % len(self._backpointers)][state])
+
+        if state >= n:
+            return 0.0, 0.0
+        voiced_prob = self._voiced_probs[(step - self.lag) % (self.lag + 1)]
+        return float(self.bin_frequencies[state]), float(voiced_prob)
@@ -0,0 +1,92 @@
+"""
+Registry of pitch estimators for the Voice-to-MIDI application.
+"""
+import importlib
+from typing import Dict, Tuple, Type, Union
+
+from voicemidi.backend.pitch.base import PitchEstimator
+
+# Built-in estimators as "module:Class" paths, imported on first use so an
+# unused estimator never loads its dependencies (scipy for pYIN, aubio)
+_ESTIMATORS: Dict[str, Union[str, Type[PitchEstimator]]] = {
+    "yin": "voicemidi.backend.pitch.yin:YinPitchEstimator",
+    "pyin": "voicemidi.backend.pitch.pyin:PyinPitchEstimator",
+    "aubio": "voicemidi.backend.pitch.aubio_pitch:AubioPitchEstimator",
+    "mpm": "voicemidi.backend.pitch.mpm:McLeodPitchEstimator",
+    "acf": "voicemidi.backend.pitch.acf:AutocorrelationPitchEstimator",
+    "hps": "voicemidi.backend.pitch.hps:HarmonicProductSpectrumEstimator",
+}
+
+
+def register_estimator(name: str, estimator: Union[str, Type[PitchEstimator]],
+                       replace: bool = False) -> None:
+    """
+    Make a pitch estimator selectable by name.
+
+    Args:
+        name (str): Name used in the ``pitch.algorithm`` config key
+        estimator (type or str): PitchEstimator subclass, or its
+            "module:Class" path to import it lazily
+        replace (bool): Allow replacing an estimator registered under the same name
+
+    Raises:
+        ValueError: If the name is taken and ``replace`` is False
+    """
+    if name in _ESTIMATORS and not replace:
+        raise ValueError(f"Pitch estimator '{name}' is already registered")
+    _ESTIMATORS[name] = estimator
+
+
+def available_estimators() -> Tuple[str, ...]:
+    """Return the names of all registered pitch estimators."""
+    return tuple(_ESTIMATORS)
+
+
+def get_estimator_class(name: str) -> Type[PitchEstimator]:
+    """
+    Look up a registered pitch estimator, importing it if needed.
+
+    Args:
+        name (str): Registered estimator name
+
+    Returns:
+        type: The estimator class
+
+    Raises:
+        ValueError: If no estimator is registered under the name
+    """
+    try:
+        estimator = _ESTIMATORS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown pitch estimator '{name}', expected one of {available_estimators()}"
+        ) from None
+
+    if isinstance(estimator, str):
+        module_name, class_name = estimator.split(":")
+        estimator = getattr(importlib.import_module(module_name), class_name)
+        _ESTIMATORS[name] = estimator
+    return estimator
+
+
+def create_estimator(name: str, sample_rate: int = 44100, frame_size: int = 1024,
+                     min_frequency: float = 50, max_frequency: float = 1000,
+                     **options) -> PitchEstimator:
+    """
+    Create a registered pitch estimator.
+
+    Args:
+        name (str): Registered estimator name
+        sample_rate (int): Audio sample rate in Hz
+        frame_size (int): Number of samples per analysis frame
+        min_frequency (float): Minimum detectable frequency in Hz
+        max_frequency (float): Maximum detectable frequency in Hz
+        **options: Estimator-specific keyword arguments
+
+    Returns:
+        PitchEstimator: The new estimator
+    """
+    estimator_class = get_estimator_class(name)
+    return estimator_class(sample_rate=sample_rate, frame_size=frame_size,
+                           min_frequency=min_frequency, max_frequency=max_frequency,
+                           **options)
@@ -0,0 +1,172 @@
+"""
+Note smoothing for the Voice-to-MIDI application.
+"""
+
+# Strategies selectable through the ``pitch.smoothing`` config key
+SMOOTHING_STRATEGIES = ("mode", "median", "hysteresis")
+
+# MIDI note numbers; 0 stands for no note
+_N_NOTES = 128
+
+
+class NoteSmoother:
+    """
+    Smooths the stream of detected MIDI notes over the last few blocks.
+
+    The last ``size`` notes are kept in a fixed ring next to a histogram
+    of their counts, both allocated once, and each block updates them
+    incrementally:
+
+    - "mode" outputs the most frequent note. It only changes when another
+      note overtakes it, or when the note leaving the ring was the mode
+      (then the ring is rescanned).
+    - "median" outputs the lower median. The histogram bin holding it
+      moves at most as far as the notes that entered or left the ring.
+    - "hysteresis" holds the current note while the pitch stays within
+      ``margin`` semitones outside its bounds. It moves to a new note once
+      ``size // 2 + 1`` blocks in a row agree on it, as fast as "mode".
+
+    With ``size`` 1, "mode" and "median" pass notes through unchanged.
+    """
+
+    def __init__(self, size=3, strategy="mode", margin=0.3):
+        """
+        Initialize the smoother.
+
+        Args:
+            size (int): Number of blocks to smooth over
+            strategy (str): One of SMOOTHING_STRATEGIES
+            margin (float): Semitones beyond the half-semitone note bounds a
+                pitch may stray before "hysteresis" considers a change
+        """
+        if size < 1:
+            raise ValueError(f"Smoothing size must be at least 1, got {size}")
+        if strategy not in SMOOTHING_STRATEGIES:
+            raise ValueError(
+                f"Unknown smoothing strategy '{strategy}', expected one of {SMOOTHING_STRATEGIES}"
+            )
+
+        self.size = size
+        self.strategy = strategy
+        self.margin = margin
+        self._confirm_blocks = size // 2 + 1
+
+        # Ring of recent notes and their histogram, reused on every block
+        self._ring = [0] * size
+        self._counts = [0] * _N_NOTES
+        self._head = 0
+        self._filled = 0
+
+        # Current output, and for "median" the number of buffered notes below it
+        self.note = 0
+        self._below = 0
+
+        # "hysteresis" candidate note and the blocks in a row it has been seen
+        self._candidate = 0
+        self._pending = 0
+
+    def reset(self):
+        """Forget the buffered notes, e.g. when the pitch is lost."""
+        for i in range(self._filled):
+            self._counts[self._ring[i]] = 0
+        self._head = 0
+        self._filled = 0
+        self.note = 0
+        self._below = 0
+        self._candidate = 0
+        self._pending = 0
+
+    def update(self, pitch):
+        """
+        Add one block's pitch and return the smoothed note.
+
+        Args:
+            pitch (float): Fractional MIDI note number of the block, e.g.
+                69 + 12 * log2(frequency / 440)
+
+        Returns:
+            int: Smoothed MIDI note number
+        """
+        note = min(_N_NOTES - 1, max(1, int(round(pitch))))
+        if self.strategy == "hysteresis":
+            return self._update_hysteresis(pitch, note)
+
+        # Replace the oldest note in the ring
+        old = 0
+        if self._filled == self.size:
+            old = self._ring[self._head]
+            self._counts[old] -= 1
+        else:
+            self._filled += 1
+        self._ring[self._head] = note
+        self._head = (self._head + 1) % self.size
+        self._counts[note] += 1
+
+        if self.strategy == "mode":
+            self._update_mode(note, old)
+        else:
+            self._update_median(note, old)
+        return self.note
+
+    def _update_mode(self, note, old):
+        """Update the mode after ``note`` entered and ``old`` (0 for none) left."""
+        counts = self._counts
+        mode = self.note
+        if mode == 0 or counts[note] > counts[mode]:
+            self.note = note
+        elif old == mode and old != note:
+            # The mode lost a vote; another note may now lead
+            for i in range(self._filled):
+                candidate = self._ring[i]
+                if counts[candidate] > counts[mode]:
+                    mode = candidate
+            self.note = mode
+
+    def _update_median(self, note, old):
+        """Update the lower median after ``note`` entered and ``old`` (0 for none) left."""
+        counts = self._counts
+        median = self.note
+        if median == 0:
+            self.note = note
+            self._below = 0
+            return
+
+        below = self._below
+        if note < median:
+            below += 1
+        if 0 < old < median:
+            below -= 1
+
+        # Walk the histogram until the median's bin holds sorted index k
+        k = (self._filled - 1) // 2
+        while below > k:
+            median -= 1
+            while counts[median] == 0:
+                median -= 1
+            below -= counts[median]
+        while below + counts[median] <= k:
+            below += counts[median]
+            median += 1
+            while counts[median] == 0:
+                median += 1
+        self.note = median
+        self._below = below
+
+    def _update_hysteresis(self, pitch, note):
+        """Move to a new note only once it is clearly and steadily away from the current one."""
+        if self.note == 0:
+            self.note = note
+            return note
+        if abs(pitch - self.note) <= 0.5 + self.margin:
+            self._pending = 0
+            return self.note
+
+        if note == self._candidate:
+            self._pending += 1
+        else:
+            self._candidate = note
+            self._pending = 1
+        if self._pending >= self._confirm_blocks:
+            self.note = note
+            self._pending = 0
+        return self.note
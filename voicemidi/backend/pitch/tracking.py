@@ -0,0 +1,176 @@
+"""
+Narrowed pitch tracking for the Voice-to-MIDI application.
+"""
+import numpy as np
+
+from voicemidi.backend.analysis import kernels
+
+# Largest window length * lags for which the compiled search beats NumPy's
+# sliding dot products plus the call overhead of the NumPy path
+DIRECT_TRACKING_MAX = 1 << 15
+
+
+class LagTracker:
+    """
+    Period search restricted to a few semitones around a held pitch.
+
+    While a note is held its period only drifts with vibrato and glides,
+    so searching every lag from ``min_frequency`` to ``max_frequency``
+    again on every block is wasted work. The tracker evaluates the
+    normalized difference ``d(tau) / (e_0 + e_tau)`` over a fixed
+    integration window, only for the lags within ``semitones`` of the
+    tracked pitch, and refines its minimum by parabolic interpolation.
+    Over exactly one period the difference function averages the frame
+    energy, so the result is on the scale of the YIN CMNDF dip (and of
+    one minus the MPM and autocorrelation peak heights), and the
+    confidence compares against the same ``min_confidence``.
+
+    A search returns (0, 0), so the caller falls back to a full search,
+    when the minimum lies on the edge of the window (the pitch moved
+    further than the window reaches) or when the frame is about as
+    periodic at half the lag (the pitch jumped an octave up, which the
+    window around the old period cannot see).
+
+    When Numba is installed, small searches such as those on a decimated
+    signal run as one compiled kernel (see
+    ``voicemidi.backend.analysis.kernels``).
+    """
+
+    def __init__(self, sample_rate=44100, frame_size=1024, min_frequency=50, max_frequency=1000,
+                 semitones=2.0, octave_threshold=0.2, use_numba=None):
+        """
+        Initialize the tracker.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Number of samples per analysis frame
+            min_frequency (float): Minimum detectable frequency in Hz
+            max_frequency (float): Maximum detectable frequency in Hz
+            semitones (float): Half-width of the search window around the
+                tracked pitch
+            octave_threshold (float): Normalized difference at half the
+                tracked lag below which the pitch counts as an octave higher
+            use_numba (bool, optional): Use the compiled kernel; by default
+                whenever Numba is installed
+        """
+        if semitones <= 0:
+            raise ValueError(f"Invalid tracking range of {semitones} semitones")
+
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.semitones = semitones
+        self.octave_threshold = octave_threshold
+        self.use_numba = kernels.resolve_numba(use_numba)
+        if self.use_numba:
+            kernels.warm_up()
+        self._ratio = 2.0 ** (semitones / 12.0)
+
+        # Same lag range as the estimators; the integration window fits the longest lag
+        self.tau_min = max(2, int(np.floor(sample_rate / max_frequency)))
+        self.tau_max = max(self.tau_min + 1,
+                           min(int(np.ceil(sample_rate / min_frequency)), frame_size // 2))
+        self.window_length = frame_size - self.tau_max - 1
+
+        # Work buffers reused on every call
+        self._frame = np.zeros(frame_size, dtype=np.float64)
+        self._square = np.zeros(frame_size, dtype=np.float64)
+        self._energy = np.zeros(frame_size + 1, dtype=np.float64)
+        self._difference = np.zeros(self.tau_max + 2, dtype=np.float64)
+        self._total = np.zeros(self.tau_max + 2, dtype=np.float64)
+
+    def lag_range(self, frequency):
+        """
+        Lags searched around a tracked pitch.
+
+        Args:
+            frequency (float): Tracked pitch in Hz
+
+        Returns:
+            tuple: (first lag, last lag), clamped to the detectable range
+        """
+        period = self.sample_rate / frequency
+        lo = max(self.tau_min, int(period / self._ratio))
+        hi = min(self.tau_max, int(np.ceil(period * self._ratio)))
+        return lo, hi
+
+    def search(self, frame, frequency):
+        """
+        Estimate the pitch of a frame near a tracked pitch.
+
+        Args:
+            frame (ndarray): Audio frame of at least ``frame_size`` samples
+            frequency (float): Tracked pitch in Hz
+
+        Returns:
+            tuple: (frequency in Hz, confidence level in 0-1), or (0, 0) when
+                a full search is needed
+        """
+        lo, hi = self.lag_range(frequency)
+        if hi - lo < 2:
+            return 0.0, 0.0
+
+        x = self._frame
+        np.copyto(x, frame[-self.frame_size:], casting="unsafe")
+        if self.use_numba and (hi - lo + 3) * self.window_length <= DIRECT_TRACKING_MAX:
+            period, dip = kernels.tracked_period(x, self.window_length, lo, hi, self.tau_min,
+                                                 self.octave_threshold, self._difference)
+        else:
+            period, dip = self._tracked_period(x, lo, hi)
+        if period <= 0:
+            return 0.0, 0.0
+        confidence = float(min(1.0, max(0.0, 1.0 - dip)))
+        return float(self.sample_rate / period), confidence
+
+    def _tracked_period(self, x, lo, hi):
+        """
+        Narrowed period search with NumPy.
+
+        Args:
+            x (ndarray): Frame samples as float64
+            lo (int): First lag of the search window
+            hi (int): Last lag of the search window
+
+        Returns:
+            tuple: (lag with sub-sample precision, normalized difference at
+                it), or (0, 1) when a full search is needed
+        """
+        n = self.window_length
+        head = float(np.dot(x[:n], x[:n]))
+        if head <= 0:
+            return 0.0, 1.0
+
+        # Normalized difference for lags lo-1..hi+1, one sliding dot product each
+        difference = self._difference[:hi - lo + 3]
+        segment = x[lo - 1:hi + 1 + n]
+        difference[:] = np.correlate(segment, x[:n], mode="valid")
+
+        # Energies of the shifted windows from a running sum
+        energy = self._energy[:len(segment) + 1]
+        energy[0] = 0.0
+        np.add.accumulate(np.square(segment, out=self._square[:len(segment)]), out=energy[1:])
+        total = self._total[:len(difference)]
+        np.subtract(energy[n:], energy[:len(difference)], out=total)
+        total += head
+        difference *= -2.0
+        difference /= total
+        difference += 1.0
+
+        best = 1 + int(np.argmin(difference[1:-1]))
+        if best == 1 or best == len(difference) - 2:
+            return 0.0, 1.0
+
+        # An octave jump up is as periodic at half the lag
+        half = (lo - 1 + best) // 2
+        if half >= self.tau_min:
+            shifted = x[half:half + n]
+            correlation = float(np.dot(shifted, x[:n]))
+            total_energy = head + float(np.dot(shifted, shifted))
+            if 1.0 - 2.0 * correlation / total_energy < self.octave_threshold:
+                return 0.0, 1.0
+
+        a, b, c = difference[best - 1], difference[best], difference[best + 1]
+        denominator = a - 2.0 * b + c
+        shift = 0.5 * (a - c) / denominator if denominator > 0 else 0.0
+        if abs(shift) > 1.0:
+            shift = 0.0
+        return lo - 1 + best + shift, float(b)
@@ -1,6 +1,7 @@
 """Utilities for Voice-to-MIDI application."""
 
 from voicemidi.backend.utils.config import Config
+from voicemidi.backend.utils.latency import LatencyHistogram, LatencyTracker
 from voicemidi.backend.utils.logger import Logger
 
-__all__ = ["Config", "Logger"] 
\ No newline at end of file
+__all__ = ["Config", "Logger", "LatencyHistogram", "LatencyTracker"] 
\ No newline at end of file
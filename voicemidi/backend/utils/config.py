@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 from typing import Dict, Any, Optional, Union
@@ -8,20 +9,33 @@
     "audio": {
         "sample_rate": 44100,
         "block_size": 1024,
+        "frame_length": None,
+        "hop_length": None,
         "channels": 1,
-        "device": None
+        "device": None,
+        "buffer_blocks": 4,
+        "processing_mode": "thread"
     },
     
     # Pitch detection settings
     "pitch": {
+        "algorithm": "yin",
         "min_confidence": 0.7,
         "min_frequency": 50,
         "max_frequency": 1000,
-        "buffer_size": 3
+        "buffer_size": 3,
+        "smoothing": "mode",
+        "pyin_lag": 2,
+        "aubio_method": "yinfast",
+        "decimation": "auto",
+        "tracking": True,
+        "tracking_semitones": 2
     },
     
     # Onset detection settings
     "onset": {
+        "algorithm": "flux",
+        "aubio_method": "hfc",
         "threshold": 0.3,
         "silence": -60,
         "minimum_inter_onset_interval_ms": 80
@@ -60,7 +74,7 @@ def __init__(self, config_file: str = "config.json"):
             config_file (str): Path to the configuration file
         """
         self.config_file = config_file
-        self.config: Dict[str, Dict[str, Any]] = DEFAULT_CONFIG.copy()
+        self.config: Dict[str, Dict[str, Any]] = copy.deepcopy(DEFAULT_CONFIG)
         self.load()
     
     def load(self) -> bool:
@@ -154,7 +168,7 @@ def reset_to_defaults(self) -> bool:
         Returns:
             bool: True if reset was successful
         """
-        self.config = DEFAULT_CONFIG.copy()
+        self.config = copy.deepcopy(DEFAULT_CONFIG)
         return True
     
     def _update_dict(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
@@ -0,0 +1,177 @@
+"""
+Latency histograms for the Voice-to-MIDI processing pipeline.
+"""
+import math
+from typing import Dict, Optional
+
+# Pipeline stages recorded by VoiceToMidi
+LATENCY_STAGES = (
+    "capture",
+    "queue_wait",
+    "pitch",
+    "onset",
+    "decision",
+    "midi_send",
+    "end_to_end",
+)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Buckets are logarithmically spaced between ``min_latency`` and
+    ``max_latency``, so recording is O(1) with no allocation and the
+    percentile error is bounded by the bucket width (about 12% with the
+    default 20 buckets per decade).
+    """
+
+    def __init__(self, min_latency: float = 1e-6, max_latency: float = 10.0,
+                 buckets_per_decade: int = 20):
+        """
+        Initialize the histogram.
+
+        Args:
+            min_latency (float): Upper edge of the lowest bucket in seconds
+            max_latency (float): Lower edge of the overflow bucket in seconds
+            buckets_per_decade (int): Number of buckets per factor of ten
+        """
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.buckets_per_decade = buckets_per_decade
+        decades = math.log10(max_latency / min_latency)
+        # One underflow bucket, the log-spaced buckets, one overflow bucket
+        self.n_buckets = int(math.ceil(decades * buckets_per_decade)) + 2
+        self.counts = [0] * self.n_buckets
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def reset(self) -> None:
+        """Clear all recorded values."""
+        self.counts = [0] * self.n_buckets
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Record one latency value.
+
+        Args:
+            seconds (float): Latency in seconds
+        """
+        if seconds <= self.min_latency:
+            index = 0
+        elif seconds >= self.max_latency:
+            index = self.n_buckets - 1
+        else:
+            index = 1 + int(math.log10(seconds / self.min_latency) * self.buckets_per_decade)
+            index = min(index, self.n_buckets - 2)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def bucket_upper_edge(self, index: int) -> float:
+        """
+        Get the upper edge of a bucket.
+
+        Args:
+            index (int): Bucket index
+
+        Returns:
+            float: Upper edge in seconds (the recorded maximum for the overflow bucket)
+        """
+        if index >= self.n_buckets - 1:
+            return self.maximum
+        return self.min_latency * 10 ** (index / self.buckets_per_decade)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimate a percentile from the buckets.
+
+        Args:
+            percent (float): Percentile in 0-100
+
+        Returns:
+            float: Upper edge of the bucket holding the percentile, in seconds,
+                capped at the recorded maximum (0 if nothing was recorded)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(percent / 100.0 * self.count)))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(self.bucket_upper_edge(index), self.maximum)
+        return self.maximum
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarize the histogram in milliseconds.
+
+        Returns:
+            Dict[str, float]: count, mean, p50, p95, p99 and max
+        """
+        return {
+            "count": self.count,
+            "mean_ms": 1000.0 * self.total / self.count if self.count else 0.0,
+            "p50_ms": 1000.0 * self.percentile(50),
+            "p95_ms": 1000.0 * self.percentile(95),
+            "p99_ms": 1000.0 * self.percentile(99),
+            "max_ms": 1000.0 * self.maximum,
+        }
+
+
+class LatencyTracker:
+    """
+    Per-stage latency histograms for the processing pipeline.
+    """
+
+    def __init__(self, stages=LATENCY_STAGES):
+        """
+        Initialize one histogram per stage.
+
+        Args:
+            stages (tuple): Names of the stages to track
+        """
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Record a latency for a stage.
+
+        Args:
+            stage (str): Stage name
+            seconds (float): Latency in seconds
+        """
+        self.histograms[stage].record(seconds)
+
+    def get(self, stage: str) -> Optional[LatencyHistogram]:
+        """
+        Get the histogram of a stage.
+
+        Args:
+            stage (str): Stage name
+
+        Returns:
+            LatencyHistogram: The stage histogram, or None if the stage is unknown
+        """
+        return self.histograms.get(stage)
+
+    def reset(self) -> None:
+        """Clear all histograms."""
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize all stages.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Per-stage summaries in milliseconds
+        """
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}